@@ -0,0 +1,28 @@
+import argparse
+import json
+from benchmarks.benchmark_core import DEFAULT_SIZES, run_benchmarks, compare_reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the expense tracker database hot paths")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, metavar="N", help="Database sizes to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per read operation")
+    parser.add_argument("--mutation-repeat", type=int, default=3, help="Runs per add, delete and end-to-end operation")
+    parser.add_argument("--output", metavar="FILE", help="Write the JSON report to FILE instead of stdout")
+    parser.add_argument("--compare", metavar="FILE", help="Print speedups against a previous JSON report")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.repeat, args.mutation_repeat)
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        for operation, size, before, after, speedup in compare_reports(baseline, report):
+            print(f"{operation:<28} {size:>9} {before:>12.6f}s {after:>12.6f}s {speedup:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import contextlib
+import copy
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from src.database.database_core import Database
+from src.database.database_maker import DATABASE_STRUCTURE, STORAGE_MODE
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+CATEGORIES = ["Food", "Travel", "Rent", "Utilities", "Health", "Fun", "Gifts", "Education"]
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def generate_database(file_path, size, seed=0):
+    """Write a db.json holding `size` synthetic expenses spread over two years."""
+    rng = random.Random(seed)
+    start = datetime.datetime(2023, 1, 1)
+    expenses = []
+    for id in range(1, size + 1):
+        created_at = start + datetime.timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        expenses.append({
+            "id": id,
+            "description": f"Expense {id}",
+            "amount": round(rng.uniform(1, 200), 2),
+            "category": rng.choice(CATEGORIES),
+            "created_at": created_at.isoformat(),
+            "month": created_at.month
+        })
+    database = copy.deepcopy(DATABASE_STRUCTURE)
+    database["expenses"] = expenses
+    with open(file_path, mode='w', encoding='utf-8') as db_file:
+        json.dump(database, db_file, indent=4)
+
+
+@contextlib.contextmanager
+def isolated_database(directory):
+    """Point the Database singleton at the files in `directory` for the duration of the block."""
+    saved = (Database.instance, Database.db_file_path, Database.journal_file_path, Database.sqlite_file_path,
+             Database.binary_file_path, Database.lock_file_path, Database.changes_file_path)
+    Database.db_file_path = directory / "db.json"
+    Database.journal_file_path = directory / "db.journal"
+    Database.sqlite_file_path = directory / "db.sqlite3"
+    Database.binary_file_path = directory / "db.bin"
+    Database.lock_file_path = directory / "db.lock"
+    Database.changes_file_path = directory / "db.changes"
+    try:
+        yield
+    finally:
+        if Database.instance is not None:
+            Database.instance.close()
+        (Database.instance, Database.db_file_path, Database.journal_file_path, Database.sqlite_file_path,
+         Database.binary_file_path, Database.lock_file_path, Database.changes_file_path) = saved
+
+
+def open_database():
+    """Close the current singleton and load the database from disk again."""
+    if Database.instance is not None:
+        Database.instance.close()
+    return Database()
+
+
+def measure(operation, size, action, repeat):
+    """
+    Time `action` `repeat` times, then run it once more under tracemalloc for its peak memory.
+
+    Returns:
+        dict: One result row.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "operation": operation,
+        "size": size,
+        "repeat": repeat,
+        "mean_seconds": sum(timings) / len(timings),
+        "min_seconds": min(timings),
+        "max_seconds": max(timings),
+        "peak_memory_bytes": peak
+    }
+
+
+def measure_main(size, directory, argv, repeat):
+    """Time end-to-end `python -m src` runs in fresh interpreters, with their peak RSS."""
+    env = dict(os.environ, EXPENSE_TRACKER_DB=str(directory / "db.json"), EXPENSE_TRACKER_SOCKET=str(directory / "none.sock"))
+    timings, peak = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-m", "src", *argv], cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL)
+        _, _, usage = os.wait4(process.pid, 0)
+        timings.append(time.perf_counter() - start)
+        peak = max(peak, usage.ru_maxrss * 1024)
+    return {
+        "operation": f"main {' '.join(argv)}",
+        "size": size,
+        "repeat": repeat,
+        "mean_seconds": sum(timings) / len(timings),
+        "min_seconds": min(timings),
+        "max_seconds": max(timings),
+        "peak_memory_bytes": peak
+    }
+
+
+def import_microseconds(importtime_output):
+    """Cumulative import time of src.__main__ from the stderr of `python -X importtime`."""
+    for line in importtime_output.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "src.__main__":
+            return int(fields[1])
+    return None
+
+
+def measure_import(repeat):
+    """Time importing the CLI entry point in fresh interpreters."""
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.__main__"],
+                                cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        timings.append(import_microseconds(result.stderr) / 1_000_000)
+    return {
+        "repeat": repeat,
+        "mean_seconds": sum(timings) / len(timings),
+        "min_seconds": min(timings),
+        "max_seconds": max(timings)
+    }
+
+
+def benchmark_size(size, directory, repeat, mutation_repeat):
+    generate_database(directory / "db.json", size)
+    results = []
+    rng = random.Random(size)
+
+    with isolated_database(directory), open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results.append(measure("init_database", size, open_database, repeat))
+        db = Database.instance
+
+        results.append(measure("find_expense_by_id", size, lambda: db.find_expense_by_id(rng.randint(1, size)), repeat))
+        results.append(measure("list_expenses", size, db.list_expenses, repeat))
+        results.append(measure("list_expenses category", size, lambda: db.list_expenses("category", "Food"), repeat))
+        results.append(measure("summary_expenses", size, db.summary_expenses, repeat))
+        results.append(measure("summary_expenses category", size, lambda: db.summary_expenses("Food", "category"), repeat))
+        results.append(measure("export_expenses", size, lambda: db.export_expenses("csv", output=str(directory / "export.csv")), repeat))
+        results.append(measure("add_an_expense", size, lambda: db.add_an_expense("Benchmark", 12.5, "Food"), mutation_repeat))
+        delete_ids = iter(rng.sample(range(1, size + 1), min(size, mutation_repeat + 1)))
+        results.append(measure("delete_an_expense", size, lambda: db.delete_an_expense(next(delete_ids)), mutation_repeat))
+
+    results.append(measure_main(size, directory, ["--summary-all"], mutation_repeat))
+    # Should not depend on the size: --help must not load the database.
+    results.append(measure_main(size, directory, ["--help"], mutation_repeat))
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=5, mutation_repeat=3):
+    """
+    Benchmark the Database hot paths against synthetic databases of the given sizes.
+
+    Returns:
+        dict: Machine-readable report with environment details and one row per operation and size.
+    """
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            results.extend(benchmark_size(size, Path(directory), repeat, mutation_repeat))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage_mode": STORAGE_MODE,
+        "git_revision": git_revision(),
+        "created_at": datetime.datetime.now().isoformat(),
+        "import": measure_import(repeat),
+        "results": results
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(baseline, current):
+    """
+    Pair up the results of two reports.
+
+    Returns:
+        list: (operation, size, baseline mean, current mean, speedup) for every row present in both.
+    """
+    baseline_rows = {(row["operation"], row["size"]): row for row in baseline["results"]}
+    comparison = []
+    for row in current["results"]:
+        previous = baseline_rows.get((row["operation"], row["size"]))
+        if previous:
+            speedup = previous["mean_seconds"] / row["mean_seconds"] if row["mean_seconds"] else float("inf")
+            comparison.append((row["operation"], row["size"], previous["mean_seconds"], row["mean_seconds"], speedup))
+    return comparison
@@ -8,10 +8,14 @@ setup(
     description='A command line expense tracker app',
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     install_requires=[
         'prettytable',  # Add other dependencies as needed
     ],
+    extras_require={
+        'analytics': ['numpy'],
+        'fast-json': ['orjson'],
+    },
     entry_points={
         'console_scripts': [
             'expense-tracker=src.__main__:main',
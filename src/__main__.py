@@ -1,5 +1,9 @@
+import os
+import signal
+import sys
 from enum import Enum
 from src.database.database_core import Database
+from src.database.database_maker import SOCKET_FILE_PATH
 from src.parser.parser_core import Parser
 
 class ListMode(Enum):
@@ -11,71 +15,206 @@ class SummaryMode(Enum):
     CATEGORY = "category"
     MONTH = "month"
 
+# The arguments execute() dispatches on. Anything else only modifies a command.
+COMMAND_ARGUMENTS = (
+    "add", "delete", "update_description", "update_amount", "update_category", "find",
+    "list_all", "list_by_category", "list_by_month", "list_categories", "summary_all",
+    "summary_by_category", "summary_by_month", "summary_group_by", "export_csv", "export_jsonl",
+    "import_file", "report_files", "serve"
+)
+
 def main():
+    status = forward_to_server(sys.argv[1:])
+    if status is not None:
+        sys.exit(status)
+
     try:
-        db = Database()
         parser = Parser()
         args = parser.parse_args()
-
-        if args.add:
-            description, amount, category = args.add
-            try:
-                amount = float(amount)
-            except ValueError:
-                raise ValueError(f"Invalid amount: {amount}. Must be a number.")
-            db.add_an_expense(description, amount, category)
-            
-        elif args.delete:
-            db.delete_an_expense(args.delete)  # Type conversion handled by argparse
-            
-        elif args.update_description:
-            expense_id, new_description = args.update_description
-            db.update_an_expense_description(int(expense_id), new_description)
-            
-        elif args.update_amount:
-            expense_id, new_amount = args.update_amount
-            db.update_an_expense_amount(int(expense_id), float(new_amount))
-            
-        elif args.update_category:
-            expense_id, new_category = args.update_category
-            db.update_an_expense_category(int(expense_id), new_category)
-            
-        elif args.find:
-            db.find_expense_by_id(args.find, "print")
-            
-        elif args.list_all:
-            db.list_expenses()
-            
-        elif args.list_by_category:
-            category_args = args.list_by_category
-            db.list_expenses("category", category_args)
-            
-        elif args.list_by_month:
-            month_args = args.list_by_month
-            db.list_expenses("month", month_args)
-            
-        elif args.summary_all:
-            db.summary_expenses()
-            
-        elif args.summary_by_category:
-            category = args.summary_by_category
-            db.summary_expenses(category, "category")
-            
-        elif args.summary_by_month:
-            month = args.summary_by_month
-            db.summary_expenses(month, "month")
-            
-        elif args.export_csv:
-            db.export_expenses("csv")
-            
-        else:
+        # --help and usage errors have exited by now; only load the database for a command.
+        if not has_command(args):
             parser.parser.print_help()
-            
+            return
+        db = Database() if needs_database(args) else None
+        execute(db, parser, args)
+
+    except BrokenPipeError:
+        # The reader (e.g. head) has gone, stop writing without a traceback on exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
     except ValueError as e:
         print(f"Error: {e}")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         raise
 
+def execute(db, parser, args):
+    if args.add:
+        description, amount, category = args.add
+        try:
+            amount = float(amount)
+        except ValueError:
+            raise ValueError(f"Invalid amount: {amount}. Must be a number.")
+        db.add_an_expense(description, amount, category)
+
+    elif args.delete:
+        db.delete_an_expense(args.delete)  # Type conversion handled by argparse
+
+    elif args.update_description:
+        expense_id, new_description = args.update_description
+        db.update_an_expense_description(int(expense_id), new_description)
+
+    elif args.update_amount:
+        expense_id, new_amount = args.update_amount
+        db.update_an_expense_amount(int(expense_id), float(new_amount))
+
+    elif args.update_category:
+        expense_id, new_category = args.update_category
+        db.update_an_expense_category(int(expense_id), new_category)
+
+    elif args.find:
+        db.find_expense_by_id(args.find, "print")
+
+    elif args.list_all:
+        db.list_expenses(**list_options(args))
+
+    elif args.list_by_category:
+        category_args = args.list_by_category
+        db.list_expenses("category", category_args, **list_options(args))
+
+    elif args.list_by_month:
+        month_args = args.list_by_month
+        db.list_expenses("month", month_args, **list_options(args))
+
+    elif args.summary_all:
+        db.summary_expenses(**date_options(args))
+
+    elif args.summary_by_category:
+        category = args.summary_by_category
+        db.summary_expenses(category, "category", **date_options(args))
+
+    elif args.summary_by_month:
+        month = args.summary_by_month
+        db.summary_expenses(month, "month", **date_options(args))
+
+    elif args.export_csv:
+        db.export_expenses("csv", *export_filter(args), output=args.export_output, compress=args.gzip, **export_options(args))
+
+    elif args.import_file:
+        db.import_expenses(args.import_file)
+
+    elif args.list_categories:
+        db.list_categories()
+
+    elif args.report_files:
+        from src.database.database_report import report
+        from src.database.database_summary import print_summary
+        try:
+            summary = report(args.report_files, args.summary_group_by or (), args.percentiles,
+                             args.date_from, args.date_to, args.workers)
+        except OSError as e:
+            print(f"An error occurred while reading the report files: {e}")
+        else:
+            print_summary(summary)
+
+    elif args.summary_group_by:
+        db.summary_by_groups(args.summary_group_by, args.percentiles, **date_options(args))
+
+    elif args.export_jsonl:
+        db.export_expenses("jsonl", *export_filter(args), output=args.export_output, compress=args.gzip, **export_options(args))
+
+    elif args.serve:
+        serve(db)
+
+    else:
+        parser.parser.print_help()
+
+def export_filter(args):
+    """Filter and filter value of an export command."""
+    if args.export_category:
+        return "category", args.export_category
+    if args.export_month:
+        return "month", args.export_month
+    return None, None
+
+def export_options(args):
+    """Change export option given for an export command."""
+    return given_options(args, ("since_revision",))
+
+def given_options(args, names):
+    options = {}
+    for option in names:
+        value = getattr(args, option, None)
+        if value is not None and value is not False:
+            options[option] = value
+    return options
+
+def list_options(args):
+    """Paging, sorting, format and date range options given for a list command."""
+    return given_options(args, ("limit", "offset", "after_id", "sort", "descending", "output_format", "date_from", "date_to"))
+
+def date_options(args):
+    """Date range options given for a summary command."""
+    return given_options(args, ("date_from", "date_to"))
+
+def has_command(args):
+    return any(getattr(args, argument, None) for argument in COMMAND_ARGUMENTS)
+
+def needs_database(args):
+    """--report reads its own files, and --summary-group-by then only chooses its grouping."""
+    standalone = ("report_files", "summary_group_by") if args.report_files else ("report_files",)
+    return any(getattr(args, argument, None) for argument in COMMAND_ARGUMENTS if argument not in standalone)
+
+def run_command(db, argv):
+    """
+    Run one command line against an already loaded database, as the server does for each client.
+
+    Returns:
+        int: The exit status the command would have had when run by main().
+    """
+    parser = Parser()
+    try:
+        args = parser.parse_args(argv)
+        if args.serve:
+            raise ValueError("The server is already running.")
+        execute(db, parser, args)
+    except SystemExit as e:
+        return e.code  # argparse has already printed the usage error or help text
+    except ValueError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return 1
+    return 0
+
+def serve(db):
+    from src.server.server_core import Server
+    server = Server(SOCKET_FILE_PATH, lambda argv: run_command(db, argv))
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Serving the expense database on {SOCKET_FILE_PATH}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def forward_to_server(argv):
+    """
+    Hand the command line to a running server instead of loading the database here.
+
+    Returns:
+        int: The exit status of the command once a server ran it and its
+            output has been printed, None if it has to run here.
+    """
+    if "--serve" in argv or not os.path.exists(SOCKET_FILE_PATH):
+        return None
+    from src.server.server_core import send_command
+    response = send_command(SOCKET_FILE_PATH, argv)
+    if response is None:
+        return None
+    output, status = response
+    sys.stdout.write(output)
+    return status
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import itertools
+from src.database.database_core import Database
+
+# Group commit interval the facade turns on when the database runs without one.
+ASYNC_GROUP_COMMIT_MS = 5
+BATCH_SIZE = 500
+UPDATABLE_FIELDS = ("description", "amount", "category")
+
+
+class AsyncDatabase:
+    """
+    Asyncio facade over the Database for event-loop based services.
+
+    Every call runs in an executor, so loading, locking and file I/O never
+    block the event loop. Mutations go through the group-commit writer, which
+    the facade turns on if needed: concurrent adds, updates and deletes from
+    many coroutines are coalesced into one write per interval, and each
+    awaits until its own change is on disk. Reads stream as async iterators
+    that fetch the expenses from the executor in batches.
+
+    Use AsyncDatabase.open() to construct the Database off the event loop:
+
+        async with await AsyncDatabase.open() as db:
+            expense = await db.add("Lunch", 12.5, "Food")
+            async for expense in db.list(filter="category", filter_value="Food"):
+                ...
+    """
+
+    def __init__(self, database, executor=None, group_commit_ms=ASYNC_GROUP_COMMIT_MS):
+        """
+        Args:
+            database (Database): The database to serve.
+            executor (concurrent.futures.Executor): Runs the blocking calls, the
+                event loop's default executor if None.
+            group_commit_ms (int): Interval of the group-commit writer, if the
+                database does not have one yet.
+        """
+        self.database = database
+        self.executor = executor
+        self.owns_writer = database.writer is None
+        if self.owns_writer:
+            database.enable_group_commit(group_commit_ms)
+
+    @classmethod
+    async def open(cls, path=None, executor=None, group_commit_ms=ASYNC_GROUP_COMMIT_MS):
+        """Load the default Database, or the one stored at path, in the executor and wrap it."""
+        database = await asyncio.get_running_loop().run_in_executor(executor, Database, path)
+        return cls(database, executor, group_commit_ms)
+
+    async def run(self, function, *args, **kwargs):
+        """Run a blocking call in the executor."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def add(self, description, amount, category):
+        """Add an expense and return it once it is on disk."""
+        expense, durable = await self.run(self.database.create_expense, description, amount, category)
+        await asyncio.wrap_future(durable)
+        return expense
+
+    async def add_many(self, records):
+        """Add many expenses in one write and return how many were added, once they are on disk."""
+        count, durable = await self.run(self.database.add_expenses, list(records))
+        await asyncio.wrap_future(durable)
+        return count
+
+    async def update(self, id, field, value):
+        """Set the description, amount or category of an expense, raising ValueError for unknown ids."""
+        if field not in UPDATABLE_FIELDS:
+            raise ValueError(f"The field {field} cannot be updated")
+        await asyncio.wrap_future(await self.run(self.database.modify_expense, id, field, value))
+
+    async def delete(self, id):
+        """Delete an expense, raising ValueError for unknown ids."""
+        await asyncio.wrap_future(await self.run(self.database.remove_expense, id))
+
+    async def find(self, id):
+        """Return the expense with the given id, raising ValueError for unknown ids."""
+        return await self.run(self.database.find_expense_by_id, id)
+
+    async def list(self, filter=None, filter_value=None, after_id=None, date_from=None, date_to=None, batch_size=BATCH_SIZE):
+        """
+        Iterate over the expenses matching a filter, as Database.select_expenses() returns them.
+
+        The expenses are read batch_size at a time in the executor. Expenses
+        added or deleted while the iteration is suspended may or may not show
+        up, but no other expense is skipped: lists in id order start every
+        batch after the last id read, and date ranges skip deleted ids.
+        """
+        if date_from is None and date_to is None:
+            while True:
+                batch = await self.run(self.batch_after, filter, filter_value, after_id, batch_size)
+                if not batch:
+                    return
+                for expense in batch:
+                    yield expense
+                after_id = batch[-1]["id"]
+
+        expenses = await self.run(self.database.select_expenses, filter, filter_value, after_id, date_from, date_to)
+        while True:
+            batch = await self.run(self.next_batch, expenses, batch_size)
+            if not batch:
+                return
+            for expense in batch:
+                yield expense
+
+    def batch_after(self, filter, filter_value, after_id, batch_size):
+        with self.database._lock:
+            return list(itertools.islice(self.database.select_expenses(filter, filter_value, after_id), batch_size))
+
+    def next_batch(self, expenses, batch_size):
+        with self.database._lock:
+            return list(itertools.islice(expenses, batch_size))
+
+    async def summary(self, data=None, filter="all", date_from=None, date_to=None):
+        """Return (sum, count) of the matching expenses, see Database.total_expenses()."""
+        return await self.run(self.database.total_expenses, data, filter, date_from, date_to)
+
+    async def group_summary(self, group_by, percentiles=None, date_from=None, date_to=None):
+        """Return the GroupSummary of the expenses, see Database.group_expenses()."""
+        return await self.run(self.database.group_expenses, group_by, percentiles, date_from, date_to)
+
+    async def export(self, filter=None, filter_value=None, output=None, compress=False, type="csv", since_revision=None):
+        """Export the expenses to a CSV or JSON lines file, see Database.export_expenses()."""
+        return await self.run(self.database.export_expenses, type, filter, filter_value, output=output, compress=compress, since_revision=since_revision)
+
+    async def close(self):
+        """Write every pending mutation, and stop the group-commit writer if the facade started it."""
+        if self.owns_writer:
+            await self.run(self.database.close_writer)
+        else:
+            await self.run(self.database.flush_pending)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,74 @@
+EXPENSE_FIELDS = ["id", "description", "amount", "category", "created_at", "month"]
+
+
+class StorageBackend:
+    """
+    Interface the Database uses to query and modify expenses.
+
+    Expenses are exchanged as Expense records, or dicts with the keys in
+    EXPENSE_FIELDS, and only accessed by subscript. The in-memory ExpenseIndex
+    and the SqliteBackend implement it.
+    """
+
+    def get(self, id):
+        """Return the expense with the given id, or None."""
+        raise NotImplementedError
+
+    def insert(self, expense):
+        raise NotImplementedError
+
+    def insert_many(self, expenses):
+        for expense in expenses:
+            self.insert(expense)
+
+    def remove(self, id):
+        """Remove an expense and return it, or None if the id is unknown."""
+        raise NotImplementedError
+
+    def update(self, expense, field, value):
+        """Set a field of an expense previously returned by get()."""
+        raise NotImplementedError
+
+    def total(self, filter="all", value=None):
+        """
+        Return (sum, count) of the expenses matching the filter.
+
+        Args:
+            filter (str): "all", "month" (value is the month number), "category"
+                (case-insensitive) or "month_category" (value is a (month, category) tuple).
+        """
+        raise NotImplementedError
+
+    def category_summary(self):
+        """
+        Return (name, count, sum) for every category in use, ordered by name ignoring case.
+
+        A category whose expenses spell it differently is named after the
+        spelling of its expense with the lowest id.
+        """
+        raise NotImplementedError
+
+    def scan(self, filter=None, value=None, after_id=None):
+        """
+        Return the expenses matching the filter in id order.
+
+        Args:
+            filter (str): None for every expense, "category" (case-insensitive)
+                or "month" (value is the month number).
+            after_id (int): Only return expenses with a greater id, to page through
+                results with the last id of the previous page as cursor.
+        """
+        raise NotImplementedError
+
+    def scan_range(self, start=None, end=None):
+        """
+        Return the expenses created in [start, end) in created_at order.
+
+        Args:
+            start (str): Inclusive ISO lower bound, None for no lower bound.
+            end (str): Exclusive ISO upper bound, None for no upper bound.
+        """
+        raise NotImplementedError
+
+    def last_id(self):
+        raise NotImplementedError
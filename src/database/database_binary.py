@@ -0,0 +1,381 @@
+import mmap
+import os
+import struct
+from src.database.database_backend import StorageBackend
+from src.database.database_categories import fold_category
+from src.database.database_dates import CreatedAtIndex
+from src.database.database_serializer import dumps, loads
+from src.expense.expense_core import Expense
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, struct unpacking covers the fallback
+    numpy = None
+
+MAGIC = b"EXPBIN01"
+STRINGS_MAGIC = b"EXPSTR01"
+# magic, record count, metadata string reference, generation
+HEADER = struct.Struct("<8sqqq")
+HEADER_SIZE = 64
+# id, amount, description, category and created_at string references, month, flags
+RECORD = struct.Struct("<qdqqqbB6x")
+ID = struct.Struct("<q")
+AMOUNT = struct.Struct("<d")
+REFERENCE = struct.Struct("<q")
+STRING_LENGTH = struct.Struct("<I")
+AMOUNT_OFFSET = 8
+FIELD_OFFSETS = {"description": 16, "category": 24}
+FLAGS_OFFSET = 41
+DELETED = 1
+UPDATABLE_FIELDS = ("description", "amount", "category")
+
+if numpy is not None:
+    RECORD_DTYPE = numpy.dtype([
+        ("id", "<i8"), ("amount", "<f8"), ("description", "<i8"), ("category", "<i8"),
+        ("created_at", "<i8"), ("month", "i1"), ("flags", "u1"), ("padding", "V6")
+    ])
+
+
+def open_store_file(file_path, initial):
+    """Open a storage file for reading and writing, creating it with the initial bytes."""
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        with open(file_path, mode='wb') as store_file:
+            store_file.write(initial)
+    return os.open(file_path, os.O_RDWR)
+
+
+class BinaryBackend(StorageBackend):
+    """
+    Storage backend keeping expenses as fixed-width records in a memory-mapped file.
+
+    db.bin starts with a header (record count, metadata reference, generation)
+    followed by one RECORD per expense in id order, so get() is a binary
+    search that only touches the pages it reads. Descriptions, categories,
+    created_at values and the JSON metadata (name and monthly budgets) live in
+    the db.strings string table and records refer to them by offset. Deleted
+    records are only flagged. Both files are read through read-only maps and
+    written with pwrite(); with NumPy installed, totals run over a zero-copy
+    structured view of the records.
+
+    Date-range scans use a CreatedAtIndex built on the first scan_range() and
+    rebuilt once another process has committed.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.strings_file_path = file_path.with_suffix(".strings")
+        self.fd = open_store_file(file_path, HEADER.pack(MAGIC, 0, 0, 0).ljust(HEADER_SIZE, b"\0"))
+        self.strings_fd = open_store_file(self.strings_file_path, STRINGS_MAGIC)
+        self.records_map = None
+        self.strings_map = None
+        self.category_names = {}
+        self.category_references = {}
+        self.pending_strings = bytearray()
+        self.strings_end = 0
+        self.dates = None
+        self.dates_generation = None
+        self.remap()
+        if HEADER.unpack_from(self.records_map, 0)[0] != MAGIC:
+            raise ValueError(f"{file_path} is not an expense record file")
+
+    def remap(self):
+        """Map both files again after they have grown. Maps still in use are closed once released."""
+        self.records_map = mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ)
+        self.strings_map = mmap.mmap(self.strings_fd, 0, access=mmap.ACCESS_READ)
+
+    def header(self):
+        """Return (record count, metadata reference, generation), remapping if records were appended."""
+        _, count, metadata, generation = HEADER.unpack_from(self.records_map, 0)
+        if HEADER_SIZE + count * RECORD.size > len(self.records_map):
+            self.remap()
+        return count, metadata, generation
+
+    def write_header(self, count=None, metadata=None, generation=None):
+        current_count, current_metadata, current_generation = self.header()
+        os.pwrite(self.fd, HEADER.pack(
+            MAGIC,
+            current_count if count is None else count,
+            current_metadata if metadata is None else metadata,
+            current_generation if generation is None else generation
+        ), 0)
+
+    def add_string(self, text):
+        """Queue a string for the string table and return its future reference."""
+        if not self.pending_strings:
+            self.strings_end = os.fstat(self.strings_fd).st_size
+        data = text.encode("utf-8")
+        reference = self.strings_end + len(self.pending_strings)
+        self.pending_strings += STRING_LENGTH.pack(len(data)) + data
+        return reference
+
+    def write_strings(self):
+        """Append the queued strings, before any record referring to them is written."""
+        if self.pending_strings:
+            os.pwrite(self.strings_fd, self.pending_strings, self.strings_end)
+            self.pending_strings = bytearray()
+
+    def read_string(self, reference):
+        if reference + STRING_LENGTH.size > len(self.strings_map):
+            self.remap()
+        length, = STRING_LENGTH.unpack_from(self.strings_map, reference)
+        start = reference + STRING_LENGTH.size
+        if start + length > len(self.strings_map):
+            self.remap()
+        return self.strings_map[start:start + length].decode("utf-8")
+
+    def category_name(self, reference):
+        name = self.category_names.get(reference)
+        if name is None:
+            name = self.read_string(reference)
+            self.category_names[reference] = name
+            self.category_references.setdefault(name, reference)
+        return name
+
+    def category_reference(self, name):
+        """Return the string table entry of a category, adding it the first time it is used."""
+        reference = self.category_references.get(name)
+        if reference is None:
+            reference = self.add_string(name)
+            self.category_references[name] = reference
+            self.category_names[reference] = name
+        return reference
+
+    def is_empty(self):
+        return self.header()[1] == 0
+
+    def initialize(self, database):
+        """Seed a fresh record file from a JSON database document."""
+        self.write_metadata({"name": database["name"], "monthly_budgets": database["monthly_budgets"]})
+        self.insert_many(sorted(database.get("expenses", []), key=lambda expense: expense["id"]))
+        self.commit({"op": "initialize"})
+
+    def load_metadata(self):
+        """Load the database document without its expenses."""
+        metadata = self.header()[1]
+        if not metadata:
+            return {"name": "", "monthly_budgets": []}
+        return loads(self.read_string(metadata))
+
+    def write_metadata(self, metadata):
+        reference = self.add_string(dumps(metadata).decode("utf-8"))
+        self.write_strings()
+        self.write_header(metadata=reference)
+
+    def record_offset(self, position):
+        return HEADER_SIZE + position * RECORD.size
+
+    def build_expense(self, fields):
+        id, amount, description, category, created_at, month, _ = fields
+        return Expense.from_trusted(id, self.read_string(description), amount, self.category_name(category), self.read_string(created_at), month)
+
+    def find_position(self, id):
+        """Return the position of the record with the given id, or None."""
+        position = self.position_after(id - 1)
+        if position < self.header()[0] and ID.unpack_from(self.records_map, self.record_offset(position))[0] == id:
+            return position
+        return None
+
+    def position_after(self, id):
+        """Binary search the position of the first record with a greater id."""
+        low, high = 0, self.header()[0]
+        while low < high:
+            middle = (low + high) // 2
+            if ID.unpack_from(self.records_map, self.record_offset(middle))[0] <= id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def read_record(self, position):
+        return RECORD.unpack_from(self.records_map, self.record_offset(position))
+
+    def get(self, id):
+        position = self.find_position(id)
+        if position is None:
+            return None
+        fields = self.read_record(position)
+        if fields[6] & DELETED:
+            return None
+        return self.build_expense(fields)
+
+    def insert(self, expense):
+        self.insert_many([expense])
+
+    def insert_many(self, expenses):
+        expenses = list(expenses)
+        last_id = self.last_id()
+        for expense in expenses:
+            if expense["id"] <= last_id:
+                raise ValueError(f"Expense ids must be increasing, got {expense['id']} after {last_id}")
+            last_id = expense["id"]
+        count = self.header()[0]
+        records = []
+        for expense in expenses:
+            records.append(RECORD.pack(
+                expense["id"],
+                expense["amount"],
+                self.add_string(expense["description"]),
+                self.category_reference(expense["category"]),
+                self.add_string(expense["created_at"]),
+                expense["month"],
+                0
+            ))
+        self.write_strings()
+        if records:
+            os.pwrite(self.fd, b"".join(records), self.record_offset(count))
+            self.write_header(count=count + len(records))
+            if self.dates is not None:
+                for expense in expenses:
+                    self.dates.insert(expense)
+
+    def remove(self, id):
+        expense = self.get(id)
+        if expense is not None:
+            os.pwrite(self.fd, bytes([DELETED]), self.record_offset(self.find_position(id)) + FLAGS_OFFSET)
+            if self.dates is not None:
+                self.dates.remove(expense)
+        return expense
+
+    def update(self, expense, field, value):
+        if field not in UPDATABLE_FIELDS:
+            raise ValueError(f"The field {field} cannot be updated")
+        offset = self.record_offset(self.find_position(expense["id"]))
+        if field == "amount":
+            os.pwrite(self.fd, AMOUNT.pack(value), offset + AMOUNT_OFFSET)
+        else:
+            reference = self.category_reference(value) if field == "category" else self.add_string(value)
+            self.write_strings()
+            os.pwrite(self.fd, REFERENCE.pack(reference), offset + FIELD_OFFSETS[field])
+        expense[field] = value
+
+    def records(self):
+        """Structured NumPy view over the records, sharing memory with the map."""
+        count = self.header()[0]  # Remaps the file first if another process extended it
+        return numpy.frombuffer(self.records_map, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE)
+
+    def iter_records(self, start=0):
+        count = self.header()[0]
+        return RECORD.iter_unpack(memoryview(self.records_map)[self.record_offset(start):self.record_offset(count)])
+
+    def category_matches(self, category):
+        category = fold_category(category)
+        return lambda reference: fold_category(self.category_name(reference)) == category
+
+    def mask(self, records, filter, value):
+        """NumPy mask of the live records matching a filter."""
+        mask = (records["flags"] & DELETED) == 0
+        if filter in ("month", "month_category"):
+            month = value[0] if filter == "month_category" else value
+            mask &= records["month"] == month
+        if filter in ("category", "month_category"):
+            matches = self.category_matches(value[1] if filter == "month_category" else value)
+            references = [reference for reference in numpy.unique(records["category"]).tolist() if matches(reference)]
+            mask &= numpy.isin(records["category"], references)
+        return mask
+
+    def predicate(self, filter, value):
+        """Pure-Python test for live records matching a filter, on unpacked record fields."""
+        month = value[0] if filter == "month_category" else value
+        if filter in ("category", "month_category"):
+            matches = self.category_matches(value[1] if filter == "month_category" else value)
+        return lambda fields: not fields[6] & DELETED \
+            and (filter not in ("month", "month_category") or fields[5] == month) \
+            and (filter not in ("category", "month_category") or matches(fields[3]))
+
+    def total(self, filter="all", value=None):
+        if filter not in ("all", "month", "category", "month_category"):
+            raise ValueError(f"Unknown total filter: {filter}")
+        if numpy is not None:
+            records = self.records()
+            amounts = records["amount"][self.mask(records, filter, value)]
+            return float(amounts.sum()), len(amounts)
+        matches = self.predicate(filter, value)
+        sum_of_expenses, count = 0.0, 0
+        for fields in self.iter_records():
+            if matches(fields):
+                sum_of_expenses += fields[1]
+                count += 1
+        return sum_of_expenses, count
+
+    def category_summary(self):
+        if numpy is not None:
+            records = self.records()
+            live = records[(records["flags"] & DELETED) == 0]
+            # Records are in id order, so the first record of each reference has its lowest id.
+            references, first, inverse = numpy.unique(live["category"], return_index=True, return_inverse=True)
+            counts = numpy.bincount(inverse, minlength=len(references))
+            sums = numpy.bincount(inverse, weights=live["amount"], minlength=len(references))
+            per_reference = zip(references.tolist(), live["id"][first].tolist(), counts.tolist(), sums.tolist())
+            del records, live
+        else:
+            totals = {}
+            for fields in self.iter_records():
+                if not fields[6] & DELETED:
+                    reference_totals = totals.setdefault(fields[3], [fields[0], 0, 0.0])
+                    reference_totals[1] += 1
+                    reference_totals[2] += fields[1]
+            per_reference = ((reference, *reference_totals) for reference, reference_totals in totals.items())
+        # Spellings differing in case have their own string table entries; the one of the lowest id names the category.
+        summary = {}
+        for reference, first_id, count, sum_of_expenses in per_reference:
+            name = self.category_name(reference)
+            category = summary.setdefault(fold_category(name), [first_id, name, 0, 0.0])
+            if first_id < category[0]:
+                category[:2] = first_id, name
+            category[2] += count
+            category[3] += sum_of_expenses
+        return [tuple(summary[key][1:]) for key in sorted(summary)]
+
+    def scan(self, filter=None, value=None, after_id=None):
+        if filter not in (None, "category", "month"):
+            raise ValueError(f"Unknown scan filter: {filter}")
+        start = 0 if after_id is None else self.position_after(after_id)
+        if numpy is not None and filter is not None:
+            records = self.records()[start:]
+            positions = (numpy.flatnonzero(self.mask(records, filter, value)) + start).tolist()
+            del records
+            return (self.build_expense(self.read_record(position)) for position in positions)
+        matches = self.predicate(filter or "all", value)
+        return (self.build_expense(fields) for fields in self.iter_records(start) if matches(fields))
+
+    def scan_range(self, start=None, end=None):
+        if self.dates is None or self.dates_generation != self.version():
+            live = [fields for fields in self.iter_records() if not fields[6] & DELETED]
+            self.dates = CreatedAtIndex([self.read_string(fields[4]) for fields in live], [fields[0] for fields in live])
+            self.dates_generation = self.version()
+        return (self.get(id) for id in self.dates.between(start, end))
+
+    def last_id(self):
+        count = self.header()[0]
+        if not count:
+            return 0
+        return ID.unpack_from(self.records_map, self.record_offset(count - 1))[0]
+
+    def version(self):
+        """Generation counter, bumped by every commit of any process."""
+        return self.header()[2]
+
+    def commit(self, record):
+        """End a Database operation described by the mutation record."""
+        self.commit_many([record])
+
+    def commit_many(self, records):
+        """Make the Database operations described by the mutation records durable."""
+        for record in records:
+            if record["op"] == "budget":
+                metadata = self.load_metadata()
+                for month in metadata["monthly_budgets"]:
+                    if month["name"] == record["month"]:
+                        month["budget"] = record["budget"]
+                self.write_metadata(metadata)
+        os.fsync(self.strings_fd)
+        generation = self.header()[2]
+        self.write_header(generation=generation + 1)
+        if self.dates_generation == generation:
+            self.dates_generation = generation + 1  # The index already holds this process' changes
+        os.fsync(self.fd)
+
+    def close(self):
+        self.records_map = self.strings_map = None
+        os.close(self.fd)
+        os.close(self.strings_fd)
@@ -0,0 +1,86 @@
+from bisect import bisect_left, insort
+
+
+def fold_category(name):
+    """Key under which category names are compared, ignoring case."""
+    return name.lower()
+
+
+class CategoryRegistry:
+    """
+    Category names interned to small integer codes, with a posting list each.
+
+    Names are folded with fold_category() before interning, so "Food" and
+    "FOOD" share a code; the first spelling seen is kept for display. Every
+    code has the ids of its expenses in sorted order, so listing a category
+    only touches its own expenses. The posting lists are only built by the
+    first build_postings() and maintained by add() and discard() from then on.
+    """
+
+    def __init__(self):
+        self.codes = {}
+        self.spellings = {}
+        self.names = []
+        self.postings = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def code(self, name):
+        """Return the code of a category name, interning it the first time it is seen."""
+        code = self.spellings.get(name)
+        if code is None:
+            key = fold_category(name)
+            code = self.codes.get(key)
+            if code is None:
+                code = len(self.names)
+                self.codes[key] = code
+                self.names.append(name)
+                if self.postings is not None:
+                    self.postings.append([])
+            self.spellings[name] = code
+        return code
+
+    def lookup(self, name):
+        """Return the code of a category name, or None if no expense ever used it."""
+        code = self.spellings.get(name)
+        if code is None:
+            code = self.codes.get(fold_category(name))
+        return code
+
+    def build_postings(self, expenses):
+        self.postings = [[] for _ in self.names]
+        for expense in expenses:
+            self.postings[self.code(expense["category"])].append(expense["id"])
+        for ids in self.postings:
+            ids.sort()
+
+    def add(self, expense):
+        """Intern the category of an expense and add it to its posting list, returning the code."""
+        code = self.code(expense["category"])
+        if self.postings is not None:
+            ids = self.postings[code]
+            if ids and ids[-1] > expense["id"]:
+                insort(ids, expense["id"])
+            else:
+                ids.append(expense["id"])
+        return code
+
+    def discard(self, expense):
+        code = self.lookup(expense["category"])
+        if code is None or self.postings is None:
+            return
+        ids = self.postings[code]
+        position = bisect_left(ids, expense["id"])
+        if position < len(ids) and ids[position] == expense["id"]:
+            del ids[position]
+
+    def ids(self, name, after_id=None):
+        """Sorted ids of the expenses in a category, optionally only those after a cursor id."""
+        code = self.lookup(name)
+        if code is None:
+            return []
+        ids = self.postings[code]
+        if after_id is not None:
+            return ids[bisect_left(ids, after_id + 1):]
+        return ids[:]
@@ -0,0 +1,141 @@
+import os
+from src.database.database_serializer import dumps, loads
+
+# Enough of the end of the file to hold its last complete line.
+TAIL_SIZE = 4096
+
+
+def changed_ids(record):
+    """Return the first and last id of the expenses a mutation record touches, or None for budget changes."""
+    op = record["op"]
+    if op == "add":
+        return record["expense"]["id"], record["expense"]["id"]
+    if op == "add_many":
+        # The expenses of one batch get consecutive ids.
+        return record["expenses"][0]["id"], record["expenses"][-1]["id"]
+    if op in ("delete", "update"):
+        return record["id"], record["id"]
+    return None
+
+
+class ChangeLog:
+    """
+    Append-only log giving every expense mutation a revision, for incremental exports.
+
+    Each mutation that touches expenses gets the next revision and one JSON
+    line {"revision": r, "ids": [first, last]} with the range of ids it
+    touched. The lines only say which expenses changed: an export reads the
+    current values of those ids, and an id that no longer exists is a
+    deletion. That is why a line is written before the mutation itself is
+    persisted: a crash in between makes the next export send an unchanged
+    expense once more, never miss a change.
+
+    Revisions grow along the file, so the changes after a revision are found
+    by bisecting the file and reading them costs the number of changes since,
+    not the length of the history. Callers serialize appends with the
+    database lock file.
+    """
+
+    def __init__(self, file_path, sync=True):
+        self.file_path = file_path
+        self.sync = sync
+
+    def create(self):
+        """Create the log if it does not exist yet, so every process sees that changes are tracked."""
+        open(self.file_path, mode='ab').close()
+
+    def tail(self):
+        """Return the last revision in the log, 0 if it is empty, and whether the file ends with a complete line."""
+        try:
+            with open(self.file_path, mode='rb') as log_file:
+                size = log_file.seek(0, os.SEEK_END)
+                log_file.seek(max(0, size - TAIL_SIZE))
+                data = log_file.read()
+        except FileNotFoundError:
+            return 0, True
+        for line in reversed(data.splitlines()):
+            try:
+                return loads(line)["revision"], data.endswith(b"\n")
+            except ValueError:
+                continue  # A torn last line, or the part of a line cut off by the tail
+        return 0, data.endswith(b"\n") or not data
+
+    def last_revision(self):
+        return self.tail()[0]
+
+    def append(self, records):
+        """
+        Give the mutation records touching expenses the next revisions.
+
+        Returns:
+            int: The last revision of the log.
+        """
+        revision, complete = self.tail()
+        lines = [] if complete else [b""]  # Terminate a line torn by a crash
+        for record in records:
+            ids = changed_ids(record)
+            if ids is not None:
+                revision += 1
+                lines.append(dumps({"revision": revision, "ids": list(ids)}))
+        if len(lines) > (0 if complete else 1):
+            with open(self.file_path, mode='ab') as log_file:
+                log_file.write(b"\n".join(lines) + b"\n")
+                log_file.flush()
+                if self.sync:
+                    os.fsync(log_file.fileno())
+        return revision
+
+    def since(self, revision):
+        """
+        Return the ids of the expenses changed after a revision.
+
+        Returns:
+            dict: The last revision that changed each id, in revision order.
+        """
+        changes = {}
+        try:
+            with open(self.file_path, mode='rb') as log_file:
+                log_file.seek(self.find(log_file, revision))
+                for line in log_file:
+                    try:
+                        change = loads(line)
+                    except ValueError:
+                        continue
+                    first, last = change["ids"]
+                    for id in range(first, last + 1):
+                        changes.pop(id, None)
+                        changes[id] = change["revision"]
+        except FileNotFoundError:
+            pass
+        return changes
+
+    def find(self, log_file, revision):
+        """Offset of the first line with a greater revision, found by bisecting the file."""
+        low, high = 0, log_file.seek(0, os.SEEK_END)
+        while low < high:
+            middle = (low + high) // 2
+            line_revision = self.revision_at(log_file, middle)
+            if line_revision is None or line_revision > revision:
+                high = middle
+            else:
+                low = middle + 1
+        return self.line_start(log_file, low)
+
+    @staticmethod
+    def line_start(log_file, offset):
+        """Offset of the first line starting at or after offset."""
+        if offset == 0:
+            return 0
+        log_file.seek(offset - 1)
+        log_file.readline()
+        return log_file.tell()
+
+    def revision_at(self, log_file, offset):
+        """Revision of the first complete line starting at or after offset, None past the last one."""
+        log_file.seek(self.line_start(log_file, offset))
+        for line in log_file:
+            try:
+                return loads(line)["revision"]
+            except ValueError:
+                continue
+        return None
@@ -0,0 +1,108 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, the array module covers the fallback
+    numpy = None
+
+
+class ColumnarStore:
+    """
+    Column-per-field copy of the numeric expense data for analytics.
+
+    Row i always describes the expense at position i of the expenses list the
+    ExpenseIndex manages, so rows are inserted and removed at the same positions.
+    Categories are dictionary-encoded: each distinct name gets a small integer
+    code stored in the categories column. When NumPy is installed, filters and
+    sums run as vectorized operations over zero-copy views of the arrays.
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.amounts = array('d')
+        self.months = array('b')
+        self.categories = array('l')
+        self.category_names = []
+        self.category_codes = {}
+
+    @classmethod
+    def from_expenses(cls, expenses):
+        store = cls()
+        for expense in expenses:
+            store.append(expense)
+        return store
+
+    def __len__(self):
+        return len(self.ids)
+
+    def encode_category(self, name):
+        code = self.category_codes.get(name)
+        if code is None:
+            code = len(self.category_names)
+            self.category_codes[name] = code
+            self.category_names.append(name)
+        return code
+
+    def append(self, expense):
+        self.ids.append(expense["id"])
+        self.amounts.append(expense["amount"])
+        self.months.append(expense["month"])
+        self.categories.append(self.encode_category(expense["category"]))
+
+    def insert(self, position, expense):
+        if position == len(self.ids):
+            self.append(expense)
+            return
+        self.ids.insert(position, expense["id"])
+        self.amounts.insert(position, expense["amount"])
+        self.months.insert(position, expense["month"])
+        self.categories.insert(position, self.encode_category(expense["category"]))
+
+    def remove(self, position):
+        for column in (self.ids, self.amounts, self.months, self.categories):
+            del column[position]
+
+    def set(self, position, field, value):
+        if field == "amount":
+            self.amounts[position] = value
+        elif field == "category":
+            self.categories[position] = self.encode_category(value)
+
+    def matching_codes(self, category):
+        """Codes of every category name equal to the given one, ignoring case."""
+        category = category.lower()
+        return [code for code, name in enumerate(self.category_names) if name.lower() == category]
+
+    def positions(self, filter, value):
+        """
+        Find the rows matching a filter.
+
+        Args:
+            filter (str): "month" (value is the month number) or "category" (case-insensitive).
+
+        Returns:
+            list: Row positions in storage order.
+        """
+        if filter == "month":
+            if numpy is not None:
+                return numpy.flatnonzero(numpy.frombuffer(self.months, dtype=numpy.int8) == value).tolist()
+            return [position for position, month in enumerate(self.months) if month == value]
+        if filter == "category":
+            codes = self.matching_codes(value)
+            if numpy is not None:
+                column = numpy.frombuffer(self.categories, dtype=self.categories.typecode)
+                return numpy.flatnonzero(numpy.isin(column, codes)).tolist()
+            codes = set(codes)
+            return [position for position, code in enumerate(self.categories) if code in codes]
+        raise ValueError(f"Unknown columnar filter: {filter}")
+
+    def total(self, filter="all", value=None):
+        """Return (sum, count) of the amounts matching a filter computed from the columns."""
+        if filter == "all":
+            if numpy is not None:
+                return float(numpy.frombuffer(self.amounts, dtype=numpy.float64).sum()), len(self.amounts)
+            return sum(self.amounts), len(self.amounts)
+        positions = self.positions(filter, value)
+        if numpy is not None:
+            return float(numpy.frombuffer(self.amounts, dtype=numpy.float64)[positions].sum()), len(positions)
+        return sum(self.amounts[position] for position in positions), len(positions)
@@ -1,12 +1,35 @@
 from src.expense.expense_core import Expense
-from src.database.database_maker import DatabaseMaker, DB_FILE_PATH, CSV_FILE_PATH
+from src.database.database_maker import DatabaseMaker, DATABASE_STRUCTURE, DB_FILE_PATH, CSV_FILE_PATH, JOURNAL_FILE_PATH, SQLITE_FILE_PATH, BINARY_FILE_PATH, LOCK_FILE_PATH, CHANGES_FILE_PATH, STORAGE_MODE, COLUMNAR_STORE, GROUP_COMMIT_INTERVAL_MS, OPEN_DATABASES_LIMIT, CHANGE_TRACKING, read_journal, apply_journal_record, apply_journal_budget, raise_last_id
+from src.database.database_backend import EXPENSE_FIELDS
+from src.database.database_categories import fold_category
+from src.database.database_dates import date_bounds, normalize_created_at
+from src.database.database_index import ExpenseIndex
+from src.database.database_lock import FileLock, file_signature
 from enum import Enum
+from pathlib import Path
+from collections import OrderedDict
+import atexit
+import contextlib
+import copy
 import datetime
-import json
-import csv
-from prettytable import PrettyTable
+import heapq
+import itertools
+import sys
 import threading
 
+EXPORT_TYPES = {"csv": "CSV", "jsonl": "JSON lines"}
+
+def write_rows(data_file, rows, type):
+    """Write export rows, the first being the header, as CSV or as one JSON object per row."""
+    if type == "csv":
+        import csv
+        csv.writer(data_file).writerows(rows)
+        return
+    from src.database.database_serializer import dumps
+    header = next(rows)
+    for row in rows:
+        data_file.write(dumps(dict(zip(header, row))).decode("utf-8") + "\n")
+
 class States(Enum):
     INACTIVE = 0
     ACTIVE = 1
@@ -17,42 +40,418 @@ class Database:
     database = None
     id = 0
     database_maker = None
+    index = None
+    backend = None
     instance = None
+    db_file_path = DB_FILE_PATH
+    journal_file_path = JOURNAL_FILE_PATH
+    sqlite_file_path = SQLITE_FILE_PATH
+    binary_file_path = BINARY_FILE_PATH
+    lock_file_path = LOCK_FILE_PATH
+    changes_file_path = CHANGES_FILE_PATH
+    file_lock = None
+    change_log = None
+    disk_version = None
+    writer = None
+    # Databases opened with Database(path=...), least recently used first.
+    open_databases = OrderedDict()
+    open_databases_lock = threading.RLock()
 
-    def __new__(cls):
+    def __new__(cls, path=None):
+        """
+        Return the default database, or with a path the database stored in that JSON file.
+
+        The default database is a single instance shared by the whole process.
+        Databases opened by path are kept in an LRU cache of
+        OPEN_DATABASES_LIMIT entries, so one process can serve many of them
+        without loading a file again on every call. A cached database is
+        reloaded first if another process has changed its files since. Opening
+        one more database closes the least recently used one: its methods then
+        raise ValueError, and Database(path=...) opens it again.
+        """
+        if path is not None:
+            return cls.open_path(Path(path).resolve())
         if cls.instance is None:
             with cls._lock:
                 if cls.instance is None:  # Double-checked locking
                     cls.instance = super(Database, cls).__new__(cls)
                     cls.instance.init_database()
         return cls.instance
+
+    @classmethod
+    def open_path(cls, path):
+        with cls.open_databases_lock:
+            database = cls.open_databases.get(path)
+            if database is not None:
+                cls.open_databases.move_to_end(path)
+            else:
+                database = super(Database, cls).__new__(cls)
+                database.use_path(path)
+                database.init_database()
+                cls.open_databases[path] = database
+                while len(cls.open_databases) > OPEN_DATABASES_LIMIT:
+                    _, evicted = cls.open_databases.popitem(last=False)
+                    evicted.close()
+                return database
+        database.ensure_current()
+        return database
+
+    def use_path(self, path):
+        """Keep the database in the JSON file at path, with its other files next to it."""
+        self._lock = threading.Lock()
+        self.db_file_path = path
+        self.journal_file_path = path.with_suffix(".journal")
+        self.sqlite_file_path = path.with_suffix(".sqlite3")
+        self.binary_file_path = path.with_suffix(".bin")
+        self.lock_file_path = path.with_suffix(".lock")
+        self.changes_file_path = path.with_suffix(".changes")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Write every pending mutation and close the files of the database.
+
+        The next Database() or Database(path=...) call loads the database again.
+        """
+        with Database.open_databases_lock:
+            if Database.open_databases.get(self.db_file_path) is self:
+                del Database.open_databases[self.db_file_path]
+        if Database.instance is self:
+            Database.instance = None
+        self.close_writer()
+        with self._lock:
+            if self.backend is not None:
+                self.backend.close()
+            elif self.database_maker is not None:
+                self.database_maker.close()
+            if self.file_lock is not None:
+                self.file_lock.close()
+            self.state = States.INACTIVE
     
     def init_database(self):
         self.state = States.ACTIVE
-        self.database_maker = DatabaseMaker()
-        if not self.database_maker.is_db_file_exists():
-            self.database_maker.make_a_new_db()
-        self.load_db_from_file(DB_FILE_PATH)
-        self.id = self.get_last_id()
+        self.database_maker = DatabaseMaker(self.db_file_path, self.journal_file_path)
+        self.file_lock = FileLock(self.lock_file_path)
+        if CHANGE_TRACKING or self.changes_file_path.exists():
+            self.enable_change_tracking()
+        with self.file_lock:
+            # Backends are imported on demand so that sqlite3 and NumPy are only loaded when used.
+            if STORAGE_MODE == "sqlite":
+                from src.database.database_sqlite import SqliteBackend
+                self.init_backend(SqliteBackend(self.sqlite_file_path))
+            elif STORAGE_MODE == "binary":
+                from src.database.database_binary import BinaryBackend
+                self.init_backend(BinaryBackend(self.binary_file_path))
+            else:
+                if not self.database_maker.is_db_file_exists():
+                    self.database_maker.make_a_new_db()
+                self.load_db_from_file(self.db_file_path)
+                self.database_maker.journal_entries = self.replay_journal(self.journal_file_path)
+                self.build_index()
+            self.id = self.get_last_id()
+            self.disk_version = self.get_disk_version()
+        if GROUP_COMMIT_INTERVAL_MS > 0:
+            self.enable_group_commit(GROUP_COMMIT_INTERVAL_MS)
+
+    def enable_group_commit(self, interval_ms):
+        """Hand mutations to a background writer committing them together once per interval."""
+        if self.writer is None:
+            from src.database.database_writer import GroupCommitWriter
+            self.writer = GroupCommitWriter(self.flush_pending, interval_ms / 1000)
+            atexit.register(self.close_writer)
+
+    def close_writer(self):
+        """
+        Stop the group-commit writer once it has written everything queued.
+
+        Also runs at exit, possibly after the journal has been closed there: it
+        is synced and closed again after the last batch has been appended.
+        """
+        if self.writer is None:
+            return
+        atexit.unregister(self.close_writer)
+        self.writer.close()
+        self.writer = None
+        if self.backend is None:
+            self.database_maker.close()
+
+    def enable_change_tracking(self):
+        """
+        Log a revision for every expense mutation from now on, see export_expenses(since_revision=...).
+
+        Tracking belongs to the database, not to the process: once db.changes
+        exists, every process writing the database logs its mutations too.
+        """
+        from src.database.database_changes import ChangeLog
+        self.change_log = ChangeLog(self.changes_file_path, sync=self.database_maker.durability == "always")
+        self.change_log.create()
+
+    def record_changes(self, records):
+        """Give the mutation records their revisions, before they are persisted."""
+        if self.change_log is None and self.changes_file_path.exists():
+            self.enable_change_tracking()  # Turned on by another process since this one started
+        if self.change_log is not None:
+            self.change_log.append(records)
+
+    def init_backend(self, backend):
+        """Use a file-based storage backend, importing the JSON database into it on first use."""
+        self.backend = backend
+        if self.backend.is_empty():
+            if self.database_maker.is_db_file_exists():
+                self.load_db_from_file(self.db_file_path)
+                self.replay_journal(self.journal_file_path)
+            else:
+                self.database = copy.deepcopy(DATABASE_STRUCTURE)
+            self.backend.initialize(self.database)
+        self.database = self.backend.load_metadata()
     
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Serialize a mutation against other threads and other processes.
+
+        Holds the thread lock and the lock file for the whole block, and first
+        reloads the database if another process has written it since this one
+        last read or wrote it, so ids and records are never based on stale data.
+        While mutations wait for the group-commit writer the lock file stays
+        locked, so no other process can read the database without them.
+        """
+        self.check_open()
+        with self._lock:
+            acquired = not self.file_lock.locked
+            if acquired:
+                self.file_lock.acquire()
+            try:
+                if acquired:
+                    self.refresh()  # Inside the try, so a failed reload does not leave the lock file locked
+                yield
+            finally:
+                if self.writer is None or not self.writer.has_pending():
+                    self.file_lock.release()
+
+    def check_open(self):
+        """Refuse to work on a closed database, e.g. one evicted from the cache of open databases."""
+        if self.state is States.INACTIVE:
+            raise ValueError(f"The database {self.db_file_path} has been closed, open it again with Database(path=...)")
+
+    def get_disk_version(self):
+        """Signatures of the files another process changes when it writes the database."""
+        if self.backend is not None:
+            return self.backend.version()
+        return file_signature(self.db_file_path), file_signature(self.journal_file_path)
+
+    def ensure_current(self):
+        """
+        Reload the database if another process has written it since this one last read or wrote it.
+
+        The check only compares the file signatures (or the backend's version)
+        with the ones seen last, so reads can afford it every time; the locks
+        are only taken when there is something to reload. While this process
+        holds the lock file no other process can have written anything.
+        """
+        self.check_open()
+        if self.file_lock is None or self.file_lock.locked:
+            return
+        if self.get_disk_version() == self.disk_version:
+            return
+        with self._lock:
+            if self.file_lock.locked:
+                return
+            with self.file_lock:
+                self.refresh()
+
+    def refresh(self):
+        """Reload the database if the files on disk no longer match what this process last saw."""
+        disk_version = self.get_disk_version()
+        if disk_version == self.disk_version:
+            return
+        if self.backend is not None:
+            self.database = self.backend.load_metadata()
+        elif not self.replay_journal_tail(disk_version):
+            # The journal may have been compacted away under the open append handle.
+            self.database_maker.close_journal()
+            self.load_db_from_file(self.db_file_path)
+            self.database_maker.journal_entries = self.replay_journal(self.journal_file_path)
+            self.build_index()
+        self.id = self.get_last_id()
+        self.disk_version = disk_version
+
     def get_last_id(self):
-        """Get the last used ID from the database."""
-        if self.database["expenses"]:
-            return max(expense["id"] for expense in self.database["expenses"])
-        return 0
+        """
+        Get the highest ID ever used, even by an expense deleted since.
+
+        Backends keep it themselves; db.json and the journal record it in the
+        document's last_id field, absent from files written before it existed.
+        """
+        return max(self.get_store().last_id(), self.database.get("last_id", 0))
+
+    def build_index(self):
+        self.index = ExpenseIndex(self.database["expenses"], columnar=COLUMNAR_STORE)
+
+    def get_index(self):
+        """Return the id index, rebuilding it if the expenses list has been replaced."""
+        if self.index is None or not self.index.is_built_for(self.database["expenses"]):
+            self.build_index()
+        return self.index
+
+    def get_store(self):
+        """
+        Return the storage backend holding the expenses: SQLite if configured, else the in-memory index.
+
+        Reloads the database first if another process has changed it since.
+        """
+        self.ensure_current()
+        if self.backend is not None:
+            return self.backend
+        return self.get_index()
+
+    def persist(self, record):
+        """
+        Make the mutation described by the record durable.
+
+        Returns:
+            Future: Resolved once the mutation is on disk, or failed with the
+                error of the write. Without group commit it is written before
+                persist() returns, which raises the error instead.
+        """
+        if self.writer is not None:
+            return self.writer.submit(record)
+        try:
+            self.record_changes([record])
+            if self.backend is not None:
+                self.backend.commit(record)
+            else:
+                self.database_maker.commit(self.database, record)
+        except Exception:
+            self.disk_version = None  # Reload what is on disk instead of the unsaved mutation
+            raise
+        self.disk_version = self.get_disk_version()
+        from src.database.database_writer import resolved
+        return resolved()
+
+    def flush_pending(self):
+        """Persist every mutation queued for the group-commit writer in a single write."""
+        from src.database.database_writer import resolve
+        with self._lock:
+            if self.writer is None:
+                return  # The writer has been closed and detached
+            batch = self.writer.take()
+            if not batch:
+                return
+            records = [record for record, _ in batch]
+            error = None
+            try:
+                self.record_changes(records)
+                if self.backend is not None:
+                    self.backend.commit_many(records)
+                else:
+                    self.database_maker.commit_many(self.database, records)
+                self.disk_version = self.get_disk_version()
+            except Exception as e:
+                error = e
+                self.disk_version = None  # Reload what is on disk instead of the unsaved mutations
+            finally:
+                self.file_lock.release()
+        resolve(batch, error)
 
     def get_state(self):
         return self.state
     
     def load_db_from_file(self, file_path):
+        from src.database.database_serializer import loads_database  # Loads orjson, only once there is a file to read
         try:
-            with open(file_path, mode='r', encoding="utf-8") as read_file:
-                self.database = json.load(read_file)
+            with open(file_path, mode='rb') as read_file:
+                self.database = loads_database(read_file.read())
         except Exception as e:
             print(f"An error occurred while loading the database: {e}")
 
-    def add_an_expense(self, description: str, amount: float, category: str):
-        with self._lock:
+    def replay_journal(self, file_path):
+        """
+        Apply the mutations recorded in the journal on top of the loaded snapshot.
+
+        Every record is idempotent (adds are upserts, updates set absolute values),
+        so replaying entries that already made it into the snapshot is harmless.
+        A torn last line left by an interrupted append ends the replay.
+
+        Returns:
+            int: Number of journal records applied.
+        """
+        replayed = 0
+        try:
+            with open(file_path, mode='rb') as journal_file:
+                expenses = {expense["id"]: expense for expense in self.database["expenses"]}
+                for record in read_journal(journal_file):
+                    apply_journal_record(record, expenses, self.database, Expense.from_dict)
+                    replayed += 1
+                self.database["expenses"] = list(expenses.values())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"An error occurred while replaying the journal: {e}")
+        return replayed
+
+    def replay_journal_tail(self, disk_version):
+        """
+        Apply only the journal records appended since this process last saw the journal.
+
+        That is possible as long as db.json is unchanged and the journal has
+        only grown: the size seen last is where the new records start.
+
+        Returns:
+            bool: False if the database has to be loaded from scratch instead.
+        """
+        if self.disk_version is None or disk_version[0] != self.disk_version[0] or disk_version[1] is None:
+            return False
+        seen_journal, journal = self.disk_version[1], disk_version[1]
+        offset = 0
+        if seen_journal is not None:
+            if seen_journal[2] != journal[2] or seen_journal[1] > journal[1]:
+                return False
+            offset = seen_journal[1]
+        store = self.get_index()
+        replayed = 0
+        try:
+            with open(self.journal_file_path, mode='rb') as journal_file:
+                journal_file.seek(offset)
+                for record in read_journal(journal_file):
+                    self.apply_record_to_index(record, store)
+                    replayed += 1
+        except OSError as e:
+            print(f"An error occurred while replaying the journal: {e}")
+            return False
+        self.database_maker.journal_entries += replayed
+        return True
+
+    def apply_record_to_index(self, record, index):
+        """Apply a journal record to the loaded expenses through the index, keeping its totals up to date."""
+        op = record["op"]
+        if op in ("add", "add_many"):
+            for expense in record["expenses"] if op == "add_many" else [record["expense"]]:
+                index.remove(expense["id"])  # Adds are upserts
+                index.insert(Expense.from_dict(expense))
+                raise_last_id(self.database, expense["id"])
+        elif op == "delete":
+            index.remove(record["id"])
+        elif op == "update":
+            expense = index.get(record["id"])
+            if expense is not None:
+                index.update(expense, record["field"], record["value"])
+        elif op == "budget":
+            apply_journal_budget(record, self.database["monthly_budgets"])
+
+    def create_expense(self, description: str, amount: float, category: str):
+        """
+        Add an expense without printing anything.
+
+        Returns:
+            tuple: The new Expense and the Future resolved once it is on disk.
+        """
+        with self.transaction():
             self.id += 1
             expense = Expense(
                 id=self.id, 
@@ -61,62 +460,154 @@ class Database:
                 category=category, 
                 created_at=datetime.datetime.now().isoformat()
             )
-            expense_dict = expense.as_dict()
-            self.database["expenses"].append(expense_dict)
-            self.database_maker.update_an_existing_db(self.database)
-            print(f"A new expense has been added with ID:{self.id}")
+            self.get_store().insert(expense)
+            raise_last_id(self.database, self.id)
+            return expense, self.persist({"op": "add", "expense": expense})
+
+    def add_an_expense(self, description: str, amount: float, category: str):
+        try:
+            expense, durable = self.create_expense(description, amount, category)
+        except OSError as e:
+            print(f"An error occurred while updating the database: {e}")
+            return
+        print(f"A new expense has been added with ID:{expense['id']}")
 
         current_month = datetime.datetime.now().month
         monthly_budget = next((budget["budget"] for budget in self.database["monthly_budgets"] if budget["id"] == current_month), 0)
-        current_budget = sum(expense["amount"] for expense in self.database["expenses"] if expense["month"] == current_month)
+        current_budget, _ = self.get_store().total("month", current_month)
 
         if current_budget > monthly_budget:
             print(f"The current budget: {current_budget} exceeds the monthly budget: {monthly_budget} for this month: {self.get_month_name_by_id(current_month)}")
+        return durable
+
+    def add_expenses(self, records):
+        """
+        Add many expenses with a single write.
+
+        Every record is validated through Expense before anything is stored,
+        so an invalid record leaves the database untouched.
+
+        Args:
+            records (iterable): Dicts with description, amount, category and
+                optionally created_at.
+
+        Returns:
+            tuple: The number of expenses added and the Future resolved once
+                they are on disk.
+        """
+        with self.transaction():
+            expenses = []
+            for number, record in enumerate(records, 1):
+                try:
+                    for field in ("description", "category"):
+                        if not isinstance(record[field], str):
+                            raise TypeError(f"the {field} must be a string")
+                    expense = Expense(
+                        id=self.id + number,
+                        description=record["description"],
+                        amount=float(record["amount"]),
+                        category=record["category"],
+                        created_at=normalize_created_at(record["created_at"]) if record.get("created_at") else datetime.datetime.now().isoformat()
+                    )
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid expense record {number}: {e}")
+                expenses.append(expense)
+
+            if not expenses:
+                from src.database.database_writer import resolved
+                return 0, resolved()
+            self.get_store().insert_many(expenses)
+            self.id += len(expenses)
+            raise_last_id(self.database, self.id)
+            durable = self.persist({"op": "add_many", "expenses": expenses})
+            return len(expenses), durable
+
+    def import_expenses(self, file_path):
+        from src.database.database_import import read_expense_records
+        try:
+            count, _ = self.add_expenses(read_expense_records(file_path))
+            print(f"{count} expenses have been imported from {file_path}")
+        except (OSError, ValueError) as e:
+            print(f"An error occurred while importing expenses: {e}")
 
     def get_month_name_by_id(self, month_id):
         return next((month["name"] for month in self.database["monthly_budgets"] if month["id"] == month_id), "Unknown")
 
+    def get_month_id_by_name(self, month_name):
+        return next((month["id"] for month in self.database["monthly_budgets"] if month["name"] == month_name), None)
+
+    def remove_expense(self, id: int):
+        """
+        Delete an expense without printing anything.
+
+        Returns:
+            Future: Resolved once the deletion is on disk.
+
+        Raises:
+            ValueError: No expense has the id.
+        """
+        with self.transaction():
+            if self.get_store().remove(id) is None:
+                raise ValueError(f"Expense with ID:{id} not found")
+            return self.persist({"op": "delete", "id": id})
+
     def delete_an_expense(self, id: int):
         try:
-            with self._lock:
-                self.database["expenses"] = [expense for expense in self.database["expenses"] if expense["id"] != id]
-                self.database_maker.update_an_existing_db(self.database)
-                print(f"The expense with ID:{id} has been deleted")
+            durable = self.remove_expense(id)
+            print(f"The expense with ID:{id} has been deleted")
+            return durable
         except Exception as e:
             print(f"An error occurred: {e} while deleting the expense with id: {id}")
 
+    def modify_expense(self, id: int, field: str, value):
+        """
+        Set the description, amount or category of an expense without printing anything.
+
+        Returns:
+            Future: Resolved once the change is on disk.
+
+        Raises:
+            ValueError: No expense has the id, or the amount is invalid.
+        """
+        if field == "amount":
+            Expense.validate_amount(value)
+        with self.transaction():
+            expense = self.find_expense_by_id(id)
+            self.get_store().update(expense, field, value)
+            return self.persist({"op": "update", "id": id, "field": field, "value": value})
+
     def update_an_expense_amount(self, id: int, amount: float):
         try: 
-            with self._lock:
-                expense = self.find_expense_by_id(id)
-                expense["amount"] = amount
-                print(f"The expense's amount with ID:{id} has been updated to {amount}")
-                self.database_maker.update_an_existing_db(self.database)
+            durable = self.modify_expense(id, "amount", amount)
+            print(f"The expense's amount with ID:{id} has been updated to {amount}")
+            return durable
         except ValueError as e: 
             print(e)
+        except OSError as e:
+            print(f"An error occurred while updating the database: {e}")
 
     def update_an_expense_description(self, id: int, description: str):
         try: 
-            with self._lock:
-                expense = self.find_expense_by_id(id)
-                expense["description"] = description
-                print(f"The expense's description with ID:{id} has been updated to {description}")
-                self.database_maker.update_an_existing_db(self.database)
+            durable = self.modify_expense(id, "description", description)
+            print(f"The expense's description with ID:{id} has been updated to {description}")
+            return durable
         except ValueError as e: 
             print(e)
+        except OSError as e:
+            print(f"An error occurred while updating the database: {e}")
 
     def update_an_expense_category(self, id: int, category: str):
         try: 
-            with self._lock:
-                expense = self.find_expense_by_id(id)
-                expense["category"] = category
-                print(f"The expense's category with ID:{id} has been updated to {category}")
-                self.database_maker.update_an_existing_db(self.database)
+            durable = self.modify_expense(id, "category", category)
+            print(f"The expense's category with ID:{id} has been updated to {category}")
+            return durable
         except ValueError as e: 
             print(e)
+        except OSError as e:
+            print(f"An error occurred while updating the database: {e}")
 
     def find_expense_by_id(self, id: int, type="no_print"):
-        expense = next((expense for expense in self.database["expenses"] if expense["id"] == id), None)
+        expense = self.get_store().get(id)
         if expense:
             if type == "print":
                 self.tablify([expense])
@@ -125,70 +616,266 @@ class Database:
 
     def set_budget_for_a_month(self, month: str, budget: int):
         try:
-            with self._lock:
+            with self.transaction():
                 month_data = next((m for m in self.database["monthly_budgets"] if m["name"] == month), None)
                 if month_data and month_data["budget"] != budget:
                     month_data["budget"] = budget
+                    durable = self.persist({"op": "budget", "month": month, "budget": budget})
                     print(f"The monthly budget of {month} has been updated to {budget}$")
-                    self.database_maker.update_an_existing_db(self.database)
+                    return durable
         except ValueError as e: 
             print(e)
+        except OSError as e:
+            print(f"An error occurred while updating the database: {e}")
         
-    def summary_expenses(self, data, filter="all"):
-        expenses = self.database.get("expenses", [])
+    def total_expenses(self, data=None, filter="all", date_from=None, date_to=None):
+        """
+        Sum the expenses matching a filter, optionally within a date range.
 
-        if not expenses:
+        Returns:
+            tuple: (sum, count) of the matching expenses.
+        """
+        store = self.get_store()
+        if date_from is not None or date_to is not None:
+            sum_of_expenses, count = 0.0, 0
+            for expense in self.scan_date_range(date_from, date_to, None if filter == "all" else filter, data):
+                sum_of_expenses += expense["amount"]
+                count += 1
+            return sum_of_expenses, count
+        if filter in ("all", "category", "month"):
+            if filter == "month" and isinstance(data, str):
+                data = self.get_month_id_by_name(data)
+            return store.total(filter, data)
+        filtered_expenses = [expense for expense in store.scan() if expense.get(filter) == data]
+        return sum(expense["amount"] for expense in filtered_expenses), len(filtered_expenses)
+
+    def summary_expenses(self, data=None, filter="all", date_from=None, date_to=None):
+        if not self.get_store().total()[1]:
             print("No expenses available.")
             return
 
-        filtered_expenses = expenses if filter == "all" else [expense for expense in expenses if expense.get(filter) == data]
-        
-        if not filtered_expenses:
+        sum_of_expenses, count = self.total_expenses(data, filter, date_from, date_to)
+        if not count:
             print(f"The expenses cannot be summarized by {filter}" if filter else "No expenses available.")
             return
 
-        sum_of_expenses = sum(expense["amount"] for expense in filtered_expenses)
-        
+        if date_from is not None or date_to is not None:
+            print(f"The sum of expenses for the given filter: {filter} from {date_from or 'the first expense'} to {date_to or 'the last expense'} is {sum_of_expenses}$")
+            return
         print(f"The sum of expenses for the given filter: {filter} is {sum_of_expenses}$")
 
-    def export_expenses(self, type: str):
-        if type == "csv":
-            try:
-                with open(DB_FILE_PATH) as json_file:
-                    json_data = json.load(json_file)
-                with open(CSV_FILE_PATH, 'w', newline='') as data_file:
-                    csv_writer = csv.writer(data_file)
-                    count = 0
-                    for data in json_data["expenses"]:
-                        if count == 0:
-                            header = data.keys()
-                            csv_writer.writerow(header)
-                            count += 1
-                        csv_writer.writerow(data.values())
-
-                print(f"The expense database has been exported to a CSV to {CSV_FILE_PATH}")
-            except Exception as e:
-                print(f"An error occurred while exporting to CSV: {e}")
+    def group_expenses(self, group_by, percentiles=None, date_from=None, date_to=None):
+        """
+        Compute count, sum, mean, min, max and percentiles of the amounts per group, from one scan.
+
+        Args:
+            group_by (list): Fields to group by, any of "category", "year", "month", "weekday" and "day".
+            percentiles (list): Percentiles to report, 50 and 90 by default.
+            date_from (str), date_to (str): Only summarize expenses created in this inclusive ISO date range.
+
+        Returns:
+            GroupSummary: The statistics of every group.
+        """
+        from src.database.database_summary import GroupSummary, DEFAULT_PERCENTILES
+        summary = GroupSummary(group_by, DEFAULT_PERCENTILES if percentiles is None else percentiles)
+        if date_from is not None or date_to is not None:
+            return summary.add_all(self.scan_date_range(date_from, date_to))
+        return summary.add_all(self.get_store().scan())
+
+    def summary_by_groups(self, group_by, percentiles=None, date_from=None, date_to=None):
+        """Print the statistics of group_expenses() as a table."""
+        from src.database.database_summary import print_summary
+        print_summary(self.group_expenses(group_by, percentiles, date_from, date_to))
+
+    def export_expenses(self, type: str, filter=None, filter_value=None, output=None, compress=False, since_revision=None):
+        """
+        Export expenses to a CSV or JSON lines file, streaming rows straight from the storage backend.
+
+        Args:
+            type (str): Export format, "csv" or "jsonl".
+            filter (str): None, "category" or "month" (filter_value is the month name).
+            output (str): Target file path, "-" for stdout; defaults to CSV_FILE_PATH
+                (with a .jsonl suffix for JSON lines).
+            compress (bool): Gzip the output. Paths ending in .gz are always compressed.
+            since_revision (int): Only export the expenses changed after this
+                revision of the change log, 0 for all of them, with the
+                revision of their last change and a deleted flag; deleted
+                expenses only have their id. Requires change tracking.
+
+        Returns:
+            int: With since_revision, the revision the export is current up to.
+        """
+        if type not in EXPORT_TYPES:
+            print("Invalid file type. Only CSV and JSON lines are supported.")
+            return
+
+        try:
+            if since_revision is None:
+                self.write_export(self.iter_export_rows(filter, filter_value), type, output, compress)
+                return
+            if self.change_log is None:
+                raise ValueError("Change tracking is off, set EXPENSE_TRACKER_CHANGE_TRACKING=1")
+            if since_revision < 0 or filter is not None:
+                raise ValueError("A change export needs a revision of 0 or more and cannot be filtered")
+            # The lock file keeps other processes from logging changes the export would miss.
+            with self.transaction():
+                revision = self.change_log.last_revision()
+                file_path = self.write_export(self.iter_change_rows(since_revision), type, output, compress, quiet=True)
+            if file_path is not None:
+                print(f"The changes since revision {since_revision} up to revision {revision} have been exported to {file_path}")
+            return revision
+        except Exception as e:
+            print(f"An error occurred while exporting to {EXPORT_TYPES[type]}: {e}")
+
+    def write_export(self, rows, type, output=None, compress=False, quiet=False):
+        """
+        Write the header and rows of an export.
+
+        Returns:
+            Path: The file written, None for stdout.
+        """
+        import gzip
+        if output == "-":
+            if compress:
+                with gzip.open(sys.stdout.buffer, 'wt', newline='') as data_file:
+                    write_rows(data_file, rows, type)
+            else:
+                write_rows(sys.stdout, rows, type)
+            return None
+
+        file_path = Path(output) if output else CSV_FILE_PATH.with_suffix(f".{type}")
+        if compress and file_path.suffix != ".gz":
+            file_path = file_path.with_name(file_path.name + ".gz")
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if file_path.suffix == ".gz":
+            with gzip.open(file_path, 'wt', newline='') as data_file:
+                write_rows(data_file, rows, type)
         else:
-            print("Invalid file type. Only CSV is supported for now.")
+            with open(file_path, 'w', newline='') as data_file:
+                write_rows(data_file, rows, type)
+
+        if not quiet:
+            print(f"The expense database has been exported to {'a CSV' if type == 'csv' else 'JSON lines'} to {file_path}")
+        return file_path
+
+    def iter_export_rows(self, filter=None, filter_value=None):
+        """Yield the CSV header followed by one row per matching expense."""
+        if filter == "month" and isinstance(filter_value, str):
+            filter_value = self.get_month_id_by_name(filter_value)
+        yield EXPENSE_FIELDS
+        for expense in self.get_store().scan(filter, filter_value):
+            yield [expense[field] for field in EXPENSE_FIELDS]
+
+    def iter_change_rows(self, since_revision):
+        """
+        Yield the header followed by one row per expense changed after the revision, in revision order.
+
+        A changed expense is exported with its current values; one that no
+        longer exists is a tombstone with only its id. Revision 0 exports
+        every expense, those unchanged since change tracking was enabled with
+        revision 0.
+        """
+        changes = self.change_log.since(since_revision)
+        store = self.get_store()
+        yield [*EXPENSE_FIELDS, "revision", "deleted"]
+        if since_revision == 0:
+            for expense in store.scan():
+                yield [expense[field] for field in EXPENSE_FIELDS] + [changes.pop(expense["id"], 0), False]
+        for id, revision in changes.items():
+            expense = store.get(id)
+            if expense is None:
+                yield [id] + [None] * (len(EXPENSE_FIELDS) - 1) + [revision, True]
+            else:
+                yield [expense[field] for field in EXPENSE_FIELDS] + [revision, False]
+
+    def scan_date_range(self, date_from=None, date_to=None, filter=None, filter_value=None):
+        """
+        Return the expenses created between two dates in created_at order.
+
+        Args:
+            date_from (str): First ISO date or datetime of the range, None for no lower bound.
+            date_to (str): Last ISO date or datetime of the range, inclusive.
+            filter (str): None, "category" or "month" (filter_value is the month name or number).
+        """
+        start, end = date_bounds(date_from, date_to)
+        expenses = self.get_store().scan_range(start, end)
+        if filter == "category":
+            category = fold_category(filter_value)
+            expenses = (expense for expense in expenses if fold_category(expense["category"]) == category)
+        elif filter == "month":
+            month_id = self.get_month_id_by_name(filter_value) if isinstance(filter_value, str) else filter_value
+            expenses = (expense for expense in expenses if expense["month"] == month_id)
+        elif filter is not None:
+            raise ValueError(f"Unknown date range filter: {filter}")
+        return expenses
+
+    def select_expenses(self, filter=None, filter_value=None, after_id=None, date_from=None, date_to=None):
+        """
+        Return an iterator over the expenses matching a filter: in id order, or
+        in created_at order when a date range is given.
 
-    def list_expenses(self, filter=None, filter_value=None):
-        expenses = self.database.get("expenses", [])
-        if not expenses:
+        Args:
+            filter (str): None, "category" or "month" (filter_value is the month name).
+            after_id (int): Only return expenses with a greater id.
+            date_from (str), date_to (str): Inclusive ISO date range.
+        """
+        store = self.get_store()
+        if date_from is not None or date_to is not None:
+            expenses = self.scan_date_range(date_from, date_to, filter, filter_value)
+            if after_id is not None:
+                expenses = (expense for expense in expenses if expense["id"] > after_id)
+            return expenses
+        if filter is None:
+            return store.scan(after_id=after_id)
+        if filter == "category":
+            return store.scan("category", filter_value, after_id=after_id)
+        if filter == "month":
+            month_id = self.get_month_id_by_name(filter_value)
+            return store.scan("month", month_id, after_id=after_id) if month_id is not None else iter(())
+        return iter(())
+
+    def list_expenses(self, filter=None, filter_value=None, limit=None, offset=0, after_id=None, sort=None, descending=False, output_format="table", date_from=None, date_to=None):
+        """
+        Print the expenses matching a filter, a page at a time if asked.
+
+        Args:
+            filter (str): None, "category" or "month" (filter_value is the month name).
+            limit (int): Print at most this many expenses.
+            offset (int): Skip this many expenses first.
+            after_id (int): Only list expenses with a greater id, for cursor paging.
+            sort (str): Field to sort by; id order is the default.
+            descending (bool): Sort from the largest value down.
+            output_format (str): "table", or "plain", "tsv" or "jsonl" which are
+                written row by row as the expenses are read.
+            date_from (str), date_to (str): Only list expenses created in this
+                inclusive ISO date range, in created_at order.
+        """
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("The limit and offset must not be negative")
+        if not self.get_store().total()[1]:
             print("No expenses available.")
             return
 
-        # Filtering logic
-        if filter is None:
-            filtered_expenses = expenses
-        elif filter == "category":
-            filtered_expenses = [expense for expense in expenses if expense["category"].lower() == filter_value.lower()]
-        elif filter == "month":
-            month_id = [budget["id"] for budget in self.database.get("monthly_budgets", []) if budget["name"] == filter_value]
-            filtered_expenses = [expense for expense in expenses if expense["month"] == month_id[0]]
-        else:
-            filtered_expenses = []
+        filtered_expenses = self.select_expenses(filter, filter_value, after_id, date_from, date_to)
+        in_id_order = date_from is None and date_to is None
+        if sort is not None and (sort != "id" or descending or not in_id_order):
+            key = lambda expense: expense[sort]
+            if limit is None:
+                filtered_expenses = sorted(filtered_expenses, key=key, reverse=descending)
+            else:
+                # Only the requested page has to be kept in memory.
+                select = heapq.nlargest if descending else heapq.nsmallest
+                filtered_expenses = select(offset + limit, filtered_expenses, key=key)
+        filtered_expenses = itertools.islice(filtered_expenses, offset, None if limit is None else offset + limit)
+
+        if output_format != "table":
+            from src.database.database_render import render_expenses
+            count = render_expenses(filtered_expenses, output_format)
+            if not count and output_format == "plain":
+                print(f"No expenses found for the given filter: {filter} with value: {filter_value}")
+            return
 
+        filtered_expenses = list(filtered_expenses)
         if not filtered_expenses:
             print(f"No expenses found for the given filter: {filter} with value: {filter_value}")
             return
@@ -196,7 +883,22 @@ class Database:
         self.tablify(filtered_expenses)
 
     
+    def list_categories(self):
+        """Print every category in use with its number of expenses and their total."""
+        categories = self.get_store().category_summary()
+        if not categories:
+            print("No expenses available.")
+            return
+
+        from prettytable import PrettyTable
+        table = PrettyTable()
+        table.field_names = ["category", "count", "total"]
+        for name, count, sum_of_expenses in categories:
+            table.add_row([name, count, round(sum_of_expenses, 2)])
+        print(table)
+
     def tablify(self, data):
+        from prettytable import PrettyTable  # Only the commands printing a table pay for the import
         table = PrettyTable()
         table.field_names = ["id", "description", "amount", "category", "created_at"]
 
@@ -0,0 +1,101 @@
+from bisect import bisect_left, bisect_right
+import datetime
+
+
+def date_bounds(date_from=None, date_to=None):
+    """
+    Turn the dates of a --from/--to range into created_at bounds.
+
+    Args:
+        date_from (str): ISO date or datetime the range starts at, inclusive.
+        date_to (str): ISO date or datetime the range ends at, inclusive. A
+            date without a time covers that whole day.
+
+    Returns:
+        tuple: (start, end) ISO strings, start inclusive and end exclusive,
+            either None when that side is open.
+    """
+    start = end = None
+    if date_from is not None:
+        start = parse_date(date_from).isoformat()
+    if date_to is not None:
+        parsed = parse_date(date_to)
+        if isinstance(parsed, datetime.datetime):
+            end = (parsed + datetime.timedelta(microseconds=1)).isoformat()
+        else:
+            end = (parsed + datetime.timedelta(days=1)).isoformat()
+    if start is not None and end is not None and start >= end:
+        raise ValueError(f"The date range from {date_from} to {date_to} is empty")
+    return start, end
+
+
+def parse_date(value):
+    try:
+        if "T" in value or " " in value:
+            return datetime.datetime.fromisoformat(value)
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date: {value}. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS.")
+
+
+def normalize_created_at(value):
+    """
+    Return an imported created_at in the form the tracker writes itself.
+
+    Expenses are stamped with datetime.now().isoformat(), naive local time,
+    and date ranges rely on those strings sorting in time order. Other ISO
+    spellings such as "2024-01-08 10:00" would not, so they are rewritten.
+
+    Raises:
+        ValueError: The value is not an ISO date or datetime, or has a UTC offset.
+    """
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        raise ValueError(f"created_at {value} has a UTC offset, use local time without one")
+    return parsed.isoformat()
+
+
+class CreatedAtIndex:
+    """
+    Expense ids sorted by created_at, for date-range lookups.
+
+    created_at values are ISO strings, so their string order is their time
+    order across years. The values and ids are kept in two parallel lists; a
+    range is found by bisecting the values and read as one slice of the ids,
+    O(log n + k) for k matches. Inserts and removes keep both lists sorted.
+    Expenses are usually added in time order, which the initial sort handles
+    in linear time.
+    """
+
+    def __init__(self, created_at=(), ids=()):
+        created_at, ids = list(created_at), list(ids)
+        order = sorted(range(len(ids)), key=created_at.__getitem__)
+        self.created_at = [created_at[position] for position in order]
+        self.ids = [ids[position] for position in order]
+
+    @classmethod
+    def from_expenses(cls, expenses):
+        return cls([expense["created_at"] for expense in expenses], [expense["id"] for expense in expenses])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def insert(self, expense):
+        position = bisect_right(self.created_at, expense["created_at"])
+        self.created_at.insert(position, expense["created_at"])
+        self.ids.insert(position, expense["id"])
+
+    def remove(self, expense):
+        low = bisect_left(self.created_at, expense["created_at"])
+        high = bisect_right(self.created_at, expense["created_at"], low)
+        for position in range(low, high):
+            if self.ids[position] == expense["id"]:
+                del self.created_at[position]
+                del self.ids[position]
+                return
+
+    def between(self, start=None, end=None):
+        """Ids of the expenses created in [start, end), in created_at order."""
+        low = 0 if start is None else bisect_left(self.created_at, start)
+        high = len(self.ids) if end is None else bisect_left(self.created_at, end)
+        return self.ids[low:high]
@@ -0,0 +1,29 @@
+import csv
+from pathlib import Path
+from src.database.database_serializer import loads
+
+IMPORT_FIELDS = ("description", "amount", "category", "created_at")
+
+
+def read_expense_records(file_path):
+    """
+    Stream expense records from a CSV or JSON-lines file.
+
+    CSV files need a header row naming at least the description, amount and
+    category columns; created_at is optional and other columns (such as the
+    id and month columns of an export) are ignored. Any other file is read as
+    JSON lines, one expense object per line.
+
+    Yields:
+        dict: The importable fields of one record.
+    """
+    file_path = Path(file_path)
+    with open(file_path, mode='r', encoding="utf-8", newline='') as import_file:
+        if file_path.suffix.lower() == ".csv":
+            rows = csv.DictReader(import_file)
+        else:
+            rows = (loads(line) for line in import_file if line.strip())
+        for number, row in enumerate(rows, 1):
+            if not isinstance(row, dict):
+                raise ValueError(f"Record {number} is not an object")
+            yield {field: row[field] for field in IMPORT_FIELDS if row.get(field) not in (None, "")}
@@ -0,0 +1,200 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from src.database.database_backend import StorageBackend
+from src.database.database_categories import CategoryRegistry, fold_category
+from src.database.database_dates import CreatedAtIndex
+
+
+class ExpenseIndex(StorageBackend):
+    """
+    In-memory indexes over the expenses list of a database document.
+
+    The index shares the expense dicts with the list it was built from, so
+    in-place updates through get() are visible in both. The list is kept in id
+    order, with a parallel list of the ids to bisect: scans stream it as it is
+    and snapshots written from it load in order again. A list that is loaded
+    out of order, e.g. written by an older version, is sorted once by build().
+
+    Alongside the id maps it keeps running [sum, count] totals overall, per
+    month, per category and per (month, category), adjusted on every insert,
+    remove and update so budget checks and summaries never rescan the list.
+    Categories go through a CategoryRegistry: totals are kept per category
+    code, so they ignore case like category scans, which read the registry's
+    posting lists.
+
+    With columnar=True it also maintains a ColumnarStore aligned with the list,
+    which filtered scans use instead of walking the expense dicts.
+
+    The CreatedAtIndex behind date-range scans is only sorted on the first
+    scan_range(), and maintained from then on.
+    """
+
+    def __init__(self, expenses, columnar=False):
+        self.expenses = expenses
+        self.columnar = None
+        if columnar:
+            from src.database.database_columnar import ColumnarStore  # Loads NumPy, only when asked for
+            self.columnar = ColumnarStore()
+        self.by_id = {}
+        self.ids = []
+        self.overall_totals = [0.0, 0]
+        self.month_totals = {}
+        self.category_totals = {}
+        self.month_category_totals = {}
+        self.categories = CategoryRegistry()
+        self.dates = None
+        self.build()
+
+    def build(self):
+        self.by_id = {expense["id"]: expense for expense in self.expenses}
+        self.ids = [expense["id"] for expense in self.expenses]
+        if any(previous >= id for previous, id in zip(self.ids, islice(self.ids, 1, None))):
+            self.expenses.sort(key=lambda expense: expense["id"])
+            self.ids.sort()
+        self.overall_totals = [0.0, 0]
+        self.month_totals = {}
+        self.category_totals = {}
+        self.month_category_totals = {}
+        self.categories = CategoryRegistry()
+        for expense in self.expenses:
+            self.account(expense, 1)
+        self.dates = None
+        if self.columnar is not None:
+            self.columnar = self.columnar.from_expenses(self.expenses)
+
+    def is_built_for(self, expenses):
+        return self.expenses is expenses
+
+    def get(self, id):
+        return self.by_id.get(id)
+
+    def position(self, id):
+        """Position of an id in the list, or of the first greater id if it is not there."""
+        return bisect_left(self.ids, id)
+
+    def insert(self, expense):
+        # New expenses get the highest id so far, and are appended.
+        position = len(self.ids) if not self.ids or self.ids[-1] <= expense["id"] else bisect_right(self.ids, expense["id"])
+        self.ids.insert(position, expense["id"])
+        self.expenses.insert(position, expense)
+        self.by_id[expense["id"]] = expense
+        self.account(expense, 1, self.categories.add(expense))
+        if self.dates is not None:
+            self.dates.insert(expense)
+        if self.columnar is not None:
+            self.columnar.insert(position, expense)
+
+    def remove(self, id):
+        """
+        Remove an expense by id.
+
+        Returns:
+            dict: The removed expense, or None if the id is unknown.
+        """
+        expense = self.by_id.pop(id, None)
+        if expense is None:
+            return None
+        position = self.position(id)
+        del self.ids[position]
+        del self.expenses[position]
+        if self.columnar is not None:
+            self.columnar.remove(position)
+        if self.dates is not None:
+            self.dates.remove(expense)
+        self.categories.discard(expense)
+        self.account(expense, -1)
+        return expense
+
+    def update(self, expense, field, value):
+        """Set a field of an indexed expense and move its amount between the affected totals."""
+        self.account(expense, -1)
+        if field == "category":
+            self.categories.discard(expense)
+        expense[field] = value
+        self.account(expense, 1, self.categories.add(expense) if field == "category" else None)
+        if self.columnar is not None:
+            self.columnar.set(self.position(expense["id"]), field, value)
+
+    def total(self, filter="all", value=None):
+        """
+        Look up the running total for a filter.
+
+        Args:
+            filter (str): "all", "month" (value is the month number), "category"
+                or "month_category" (value is a (month, category) tuple).
+
+        Returns:
+            tuple: (sum, count) of the matching expenses.
+        """
+        if filter == "all":
+            totals = self.overall_totals
+        elif filter == "month":
+            totals = self.month_totals.get(value, (0.0, 0))
+        elif filter == "category":
+            totals = self.category_totals.get(self.categories.lookup(value), (0.0, 0))
+        elif filter == "month_category":
+            month, category = value
+            totals = self.month_category_totals.get((month, self.categories.lookup(category)), (0.0, 0))
+        else:
+            raise ValueError(f"Unknown total filter: {filter}")
+        return totals[0], totals[1]
+
+    def scan(self, filter=None, value=None, after_id=None):
+        start = 0 if after_id is None else bisect_right(self.ids, after_id)
+        if filter is None:
+            return islice(self.expenses, start, None)
+        elif filter == "category":
+            if self.categories.postings is None:
+                self.categories.build_postings(self.expenses)
+            # Posting lists are in id order whatever the order of the list.
+            return self.existing(self.categories.ids(value, after_id))
+        elif self.columnar is not None and filter == "month":
+            positions = self.columnar.positions(filter, value)
+            return (self.expenses[position] for position in islice(positions, bisect_left(positions, start), None))
+        elif filter == "month":
+            return (expense for expense in islice(self.expenses, start, None) if expense["month"] == value)
+        else:
+            raise ValueError(f"Unknown scan filter: {filter}")
+
+    def scan_range(self, start=None, end=None):
+        if self.dates is None:
+            self.dates = CreatedAtIndex.from_expenses(self.expenses)
+        return self.existing(self.dates.between(start, end))
+
+    def existing(self, ids):
+        """The expenses of a list of ids read lazily, skipping those removed in the meantime."""
+        by_id = self.by_id
+        return (by_id[id] for id in ids if id in by_id)
+
+    def category_summary(self):
+        # The posting lists give the lowest id of each category, whose spelling names it.
+        if self.categories.postings is None:
+            self.categories.build_postings(self.expenses)
+        summary = []
+        for code, ids in enumerate(self.categories.postings):
+            if ids:
+                sum_of_expenses, count = self.category_totals[code]
+                summary.append((self.by_id[ids[0]]["category"], count, sum_of_expenses))
+        return sorted(summary, key=lambda category: fold_category(category[0]))
+
+    def last_id(self):
+        return max(self.by_id, default=0)
+
+    def account(self, expense, sign, category=None):
+        amount = expense["amount"] * sign
+        month = expense["month"]
+        if category is None:
+            # Interned spellings are looked up directly, build() calls this for every expense.
+            category = self.categories.spellings.get(expense["category"])
+            if category is None:
+                category = self.categories.code(expense["category"])
+        self.adjust(self.overall_totals, amount, sign)
+        self.adjust(self.month_totals.setdefault(month, [0.0, 0]), amount, sign)
+        self.adjust(self.category_totals.setdefault(category, [0.0, 0]), amount, sign)
+        self.adjust(self.month_category_totals.setdefault((month, category), [0.0, 0]), amount, sign)
+
+    @staticmethod
+    def adjust(totals, amount, sign):
+        totals[1] += sign
+        # Reset emptied buckets so float rounding from subtractions does not linger.
+        totals[0] = totals[0] + amount if totals[1] else 0.0
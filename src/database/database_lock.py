@@ -0,0 +1,56 @@
+import os
+
+try:
+    import fcntl
+except ImportError:  # Advisory locks are POSIX only, elsewhere only threads are serialized
+    fcntl = None
+
+
+def file_signature(file_path):
+    """Return (mtime, size, inode) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a lock file shared by every process using the database.
+
+    The lock file is opened once and locked with flock() between acquire()
+    and release(), or for the duration of a `with` block. flock() locks belong
+    to the open file, so threads of one process must still be serialized by
+    the caller.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.fd = None
+        self.locked = False
+
+    def acquire(self):
+        if self.fd is None:
+            self.fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        self.locked = True
+
+    def release(self):
+        if self.locked and fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.locked = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self.locked = False
@@ -1,12 +1,48 @@
-import json
+import atexit
 import os
+import threading
+import time
 from pathlib import Path
 
 BASE_PATH = Path(__file__).parent
 DB_FILE_NAME = "db.json"
 CSV_FILE_NAME = "expenses.csv"
-DB_FILE_PATH = (BASE_PATH / f"../database/{DB_FILE_NAME}").resolve()
+DB_FILE_PATH = Path(os.environ.get("EXPENSE_TRACKER_DB", BASE_PATH / f"../database/{DB_FILE_NAME}")).resolve()
 CSV_FILE_PATH = (BASE_PATH / f"../export/{CSV_FILE_NAME}").resolve()
+# The journal, the SQLite and binary files and the lock file sit next to the JSON database and share its name.
+JOURNAL_FILE_PATH = DB_FILE_PATH.with_suffix(".journal")
+SQLITE_FILE_PATH = DB_FILE_PATH.with_suffix(".sqlite3")
+BINARY_FILE_PATH = DB_FILE_PATH.with_suffix(".bin")
+LOCK_FILE_PATH = DB_FILE_PATH.with_suffix(".lock")
+CHANGES_FILE_PATH = DB_FILE_PATH.with_suffix(".changes")
+# Named after the database like its other files, so every database gets its own server.
+SOCKET_FILE_PATH = Path(os.environ.get("EXPENSE_TRACKER_SOCKET", DB_FILE_PATH.with_suffix(".sock")))
+
+# "json" rewrites db.json on every mutation, "journal" appends mutations to
+# db.journal and only rewrites db.json when the journal gets compacted,
+# "sqlite" keeps everything in db.sqlite3 and "binary" in the memory-mapped
+# db.bin and db.strings (both imported from db.json on first use).
+STORAGE_MODE = os.environ.get("EXPENSE_TRACKER_STORAGE", "json")
+JOURNAL_COMPACT_THRESHOLD = 1000
+# Keep a columnar copy of ids, amounts, months and categories for analytics.
+COLUMNAR_STORE = os.environ.get("EXPENSE_TRACKER_COLUMNAR", "0") == "1"
+# When journal appends reach the disk: "always" fsyncs after every append,
+# "interval" at most every DURABILITY_INTERVAL_MS milliseconds and "exit" only
+# when the process exits. Snapshots are written to a temporary file that is
+# fsynced before it replaces db.json, so db.json is never left half written.
+DURABILITY = os.environ.get("EXPENSE_TRACKER_DURABILITY", "always")
+DURABILITY_INTERVAL_MS = int(os.environ.get("EXPENSE_TRACKER_DURABILITY_INTERVAL_MS", "1000"))
+# With a positive interval, mutations from all threads are collected by a
+# background writer and persisted together once per interval (group commit).
+GROUP_COMMIT_INTERVAL_MS = int(os.environ.get("EXPENSE_TRACKER_GROUP_COMMIT_MS", "0"))
+# db.json is written without whitespace unless pretty-printing is requested.
+PRETTY_JSON = os.environ.get("EXPENSE_TRACKER_PRETTY_JSON", "0") == "1"
+# How many databases opened with Database(path=...) are kept open at once;
+# the least recently used one is closed when another has to be opened.
+OPEN_DATABASES_LIMIT = int(os.environ.get("EXPENSE_TRACKER_OPEN_DATABASES", "16"))
+# Give every expense mutation a revision in db.changes, so exports can be
+# limited to the expenses changed since an earlier export.
+CHANGE_TRACKING = os.environ.get("EXPENSE_TRACKER_CHANGE_TRACKING", "0") == "1"
 
 DATABASE_STRUCTURE = {
     "name": "Expense Tracker Database",
@@ -27,24 +63,217 @@ DATABASE_STRUCTURE = {
     "expenses": []
 }
 
+def fsync_directory(directory):
+    """Make a rename inside the directory durable. Not every platform can open a directory."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def read_journal(journal_file):
+    """Yield the records of an open journal from its current position, up to a torn last line left by an interrupted append."""
+    from src.database.database_serializer import loads
+    for line in journal_file:
+        try:
+            yield loads(line)
+        except ValueError:
+            return
+
+def apply_journal_record(record, expenses, database, to_expense):
+    """
+    Apply a journal record to expenses keyed by id and to the rest of the database document.
+
+    Every record is idempotent (adds are upserts, updates set absolute values),
+    so replaying records that already made it into the snapshot is harmless.
+
+    Args:
+        to_expense (callable): Turns the expense dicts of add records into stored expenses.
+    """
+    op = record["op"]
+    if op == "add":
+        expenses[record["expense"]["id"]] = to_expense(record["expense"])
+        raise_last_id(database, record["expense"]["id"])
+    elif op == "add_many":
+        for expense in record["expenses"]:
+            expenses[expense["id"]] = to_expense(expense)
+        raise_last_id(database, record["expenses"][-1]["id"])
+    elif op == "delete":
+        expenses.pop(record["id"], None)
+    elif op == "update":
+        if record["id"] in expenses:
+            expenses[record["id"]][record["field"]] = record["value"]
+    elif op == "budget":
+        apply_journal_budget(record, database["monthly_budgets"])
+
+def raise_last_id(database, id):
+    """Keep the highest id ever given out in the document, so deleting the last expense never frees its id."""
+    if id > database.get("last_id", 0):
+        database["last_id"] = id
+
+def apply_journal_budget(record, monthly_budgets):
+    month_data = next((month for month in monthly_budgets if month["name"] == record["month"]), None)
+    if month_data:
+        month_data["budget"] = record["budget"]
+
 class DatabaseMaker:
-    def __init__(self):
-        self.db_file_path = DB_FILE_PATH
+    def __init__(self, db_file_path=DB_FILE_PATH, journal_file_path=JOURNAL_FILE_PATH, journaled=None, durability=None, pretty=None):
+        self.db_file_path = db_file_path
+        self.journal_file_path = journal_file_path
+        self.journaled = STORAGE_MODE == "journal" if journaled is None else journaled
+        self.journal_entries = 0
         self.database_dict = DATABASE_STRUCTURE
+        self.durability = DURABILITY if durability is None else durability
+        self.pretty = PRETTY_JSON if pretty is None else pretty
+        if self.durability not in ("always", "interval", "exit"):
+            raise ValueError(f"Unknown durability policy: {self.durability}")
+        self.journal_file = None
+        self.sync_lock = threading.Lock()
+        self.sync_timer = None
+        self.last_sync = time.monotonic()
+        self.closes_at_exit = False
+
+    def write_atomically(self, content):
+        """
+        Replace db.json with the serialized content.
+
+        The document is written and fsynced to a temporary file next to db.json,
+        which then atomically replaces it: a crash at any point leaves either
+        the old or the new database on disk, never a truncated one.
+        """
+        from src.database.database_serializer import dumps  # Loads orjson, only once something is written
+        temp_file_path = self.db_file_path.with_name(self.db_file_path.name + ".tmp")
+        with open(temp_file_path, mode='wb') as temp_file:
+            temp_file.write(dumps(content, pretty=self.pretty))
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_file_path, self.db_file_path)
+        if self.durability == "always":
+            fsync_directory(self.db_file_path.parent)
 
     def make_a_new_db(self):
         try:
-            with open(self.db_file_path, mode='w', encoding='utf-8') as db_file:
-                json.dump(self.database_dict, db_file, indent=4)
+            self.write_atomically(self.database_dict)
         except Exception as e:
             print(f"An error occurred while creating the database: {e}")
 
     def update_an_existing_db(self, new_dict):
         try:
-            with open(self.db_file_path, mode='w', encoding='utf-8') as db_file:
-                json.dump(new_dict, db_file, indent=4)
+            self.write_atomically(new_dict)
+            return True
         except Exception as e:
             print(f"An error occurred while updating the database: {e}")
+            return False
+
+    def commit(self, database, record):
+        """Persist a single mutation."""
+        self.commit_many(database, [record])
+
+    def commit_many(self, database, records):
+        """
+        Persist a batch of mutations already applied to the database.
+
+        In journaled mode only the mutation records are appended to the journal,
+        and the full snapshot is rewritten once the journal reaches
+        JOURNAL_COMPACT_THRESHOLD entries. Otherwise the whole database is
+        rewritten once, which also folds in any journal left over from a previous run.
+
+        Raises:
+            Exception: The error of a failed write, so the mutations are not
+                reported as persisted. A failed compaction is only printed, the
+                journal still holds the mutations.
+        """
+        if not self.journaled:
+            self.write_atomically(database)
+            self.clear_journal()
+            return
+        self.write_to_journal(*records)
+        if self.journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+            self.compact(database)
+
+    def append_to_journal(self, *records):
+        """Append mutation records to the journal, printing any error."""
+        try:
+            self.write_to_journal(*records)
+        except Exception as e:
+            print(f"An error occurred while appending to the journal: {e}")
+
+    def write_to_journal(self, *records):
+        """Append mutation records to the journal, then sync them according to the durability policy."""
+        from src.database.database_serializer import dumps
+        with self.sync_lock:
+            if self.journal_file is None:
+                self.journal_file = open(self.journal_file_path, mode='ab')
+                if self.durability != "always" and not self.closes_at_exit:
+                    atexit.register(self.close)
+                    self.closes_at_exit = True
+            self.journal_file.write(b"".join(dumps(record) + b"\n" for record in records))
+            self.journal_file.flush()
+        self.journal_entries += len(records)
+        self.sync_journal_if_due()
+
+    def sync_journal_if_due(self):
+        """Apply the durability policy after a journal append."""
+        if self.durability == "always":
+            self.sync()
+        elif self.durability == "interval":
+            elapsed = time.monotonic() - self.last_sync
+            interval = DURABILITY_INTERVAL_MS / 1000
+            if elapsed >= interval:
+                self.sync()
+            elif self.sync_timer is None:
+                # Appends within the interval share one fsync once it has passed.
+                self.sync_timer = threading.Timer(interval - elapsed, self.sync)
+                self.sync_timer.daemon = True
+                self.sync_timer.start()
+
+    def sync(self):
+        """Flush the journal appends made so far to the disk."""
+        with self.sync_lock:
+            if self.sync_timer is not None:
+                self.sync_timer.cancel()
+                self.sync_timer = None
+            if self.journal_file is not None:
+                os.fsync(self.journal_file.fileno())
+            self.last_sync = time.monotonic()
+
+    def close_journal(self):
+        with self.sync_lock:
+            if self.sync_timer is not None:
+                self.sync_timer.cancel()
+                self.sync_timer = None
+            if self.journal_file is not None:
+                self.journal_file.close()
+                self.journal_file = None
+
+    def close(self):
+        """Sync and close the journal, as done at exit for the non-"always" policies."""
+        try:
+            self.sync()
+        finally:
+            self.close_journal()
+
+    def compact(self, database):
+        """Write a fresh snapshot and drop the journal entries it now contains."""
+        if self.update_an_existing_db(database):
+            self.clear_journal()
+
+    def clear_journal(self):
+        try:
+            self.close_journal()
+            if self.is_journal_file_exists():
+                os.remove(self.journal_file_path)
+            self.journal_entries = 0
+        except Exception as e:
+            print(f"An error occurred while clearing the journal: {e}")
 
     def is_db_file_exists(self):
         return self.db_file_path.is_file()
+
+    def is_journal_file_exists(self):
+        return self.journal_file_path.is_file()
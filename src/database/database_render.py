@@ -0,0 +1,56 @@
+import sys
+
+LIST_FIELDS = ["id", "description", "amount", "category", "created_at"]
+OUTPUT_FORMATS = ("table", "plain", "tsv", "jsonl")
+
+
+def render_plain(expenses, stream):
+    for expense in expenses:
+        stream.write(f"{expense['id']:>6}  {expense['created_at'][:19]:<19}  {expense['amount']:>10.2f}  "
+                     f"{expense['category']:<12}  {expense['description']}\n")
+        yield expense
+
+
+def tsv_field(value):
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def render_tsv(expenses, stream):
+    stream.write("\t".join(LIST_FIELDS) + "\n")
+    for expense in expenses:
+        stream.write("\t".join(tsv_field(expense[field]) for field in LIST_FIELDS) + "\n")
+        yield expense
+
+
+def render_jsonl(expenses, stream):
+    from src.database.database_serializer import dumps
+    for expense in expenses:
+        stream.write(dumps(expense).decode("utf-8") + "\n")
+        yield expense
+
+
+RENDERERS = {
+    "plain": render_plain,
+    "tsv": render_tsv,
+    "jsonl": render_jsonl
+}
+
+
+def render_expenses(expenses, output_format, stream=None):
+    """
+    Write expenses one line at a time as they are produced, without collecting them first.
+
+    Args:
+        expenses (iterable): Expense records or dicts.
+        output_format (str): "plain", "tsv" (with a header row) or "jsonl".
+        stream: Text stream to write to, defaults to the current sys.stdout.
+
+    Returns:
+        int: Number of expenses written.
+    """
+    if output_format not in RENDERERS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    count = 0
+    for _ in RENDERERS[output_format](expenses, stream or sys.stdout):
+        count += 1
+    return count
@@ -0,0 +1,84 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from src.database.database_dates import date_bounds
+from src.database.database_maker import BINARY_FILE_PATH, SQLITE_FILE_PATH, read_journal, apply_journal_record
+from src.database.database_serializer import loads
+from src.database.database_summary import GroupSummary, DEFAULT_PERCENTILES
+
+# Stores a report cannot read; it reads db.json files and the journal next to them.
+UNSUPPORTED_SUFFIXES = {SQLITE_FILE_PATH.suffix: "sqlite", BINARY_FILE_PATH.suffix: "binary", ".strings": "binary"}
+
+
+def load_expenses(file_path):
+    """
+    Return the expenses of a db.json file, with the mutations of its journal applied.
+
+    Raises:
+        ValueError: The file belongs to a sqlite or binary database.
+    """
+    file_path = Path(file_path)
+    storage_mode = UNSUPPORTED_SUFFIXES.get(file_path.suffix)
+    if storage_mode is not None:
+        raise ValueError(f"{file_path} is a {storage_mode} database, reports only read db.json files")
+    with open(file_path, mode='rb') as database_file:
+        database = loads(database_file.read())
+    try:
+        journal_file = open(file_path.with_suffix(".journal"), mode='rb')
+    except FileNotFoundError:
+        return database["expenses"]
+    with journal_file:
+        expenses = {expense["id"]: expense for expense in database["expenses"]}
+        for record in read_journal(journal_file):
+            apply_journal_record(record, expenses, database, dict)
+    return list(expenses.values())
+
+
+def summarize_file(file_path, group_by, percentiles, start=None, end=None):
+    """
+    Parse one database file and summarize its expenses; runs in a worker process.
+
+    The expenses stay plain dicts, the summary only reads them once.
+    """
+    expenses = load_expenses(file_path)
+    if start is not None or end is not None:
+        expenses = (
+            expense for expense in expenses
+            if (start is None or expense["created_at"] >= start) and (end is None or expense["created_at"] < end)
+        )
+    return GroupSummary(group_by, percentiles).add_all(expenses)
+
+
+def report(file_paths, group_by=(), percentiles=None, date_from=None, date_to=None, workers=None):
+    """
+    Summarize the expenses of many database files together.
+
+    Each file is parsed and summarized in its own worker process, then the
+    partial summaries are merged, so the wall-clock time divides by the number
+    of cores when there are at least as many files.
+
+    Args:
+        file_paths (list): db.json files, e.g. one per year or per household. The
+            journal next to a file is replayed on top of it.
+        group_by (list): GroupSummary fields; no fields gives a single overall row.
+        percentiles (list): Percentiles to report, 50 and 90 by default.
+        date_from (str), date_to (str): Only count expenses created in this inclusive ISO date range.
+        workers (int): Worker processes, the number of CPUs by default.
+
+    Returns:
+        GroupSummary: The statistics of all files.
+    """
+    start, end = date_bounds(date_from, date_to)
+    percentiles = DEFAULT_PERCENTILES if percentiles is None else tuple(percentiles)
+    summary = GroupSummary(group_by, percentiles)
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    if workers <= 1:
+        for file_path in file_paths:
+            summary.merge(summarize_file(file_path, group_by, percentiles, start, end))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize_file, file_path, group_by, percentiles, start, end) for file_path in file_paths]
+        for future in futures:
+            summary.merge(future.result())
+    return summary
@@ -0,0 +1,77 @@
+import json
+from src.expense.expense_core import Expense
+
+try:
+    import orjson
+except ImportError:  # orjson and ujson are optional, the json module covers the fallback
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def serialize_record(obj):
+    """Default hook turning Expense records into plain dicts."""
+    return obj.as_dict()
+
+
+def dumps(obj, pretty=False):
+    """
+    Serialize a database document or mutation record.
+
+    Args:
+        pretty (bool): Indent the output for humans. The default is the
+            compact layout without any whitespace.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+
+    Raises:
+        ValueError: The object holds NaN or an infinity, which JSON cannot represent.
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj, default=serialize_record, option=orjson.OPT_INDENT_2 if pretty else 0)
+        if b"null" in data:
+            reject_non_finite(obj)  # orjson writes them as null
+        return data
+    if ujson is not None:
+        data = ujson.dumps(obj, default=serialize_record, indent=4 if pretty else 0, ensure_ascii=False).encode("utf-8")
+        if b"NaN" in data or b"Infinity" in data:
+            reject_non_finite(obj)
+        return data
+    if pretty:
+        return json.dumps(obj, default=serialize_record, indent=4, ensure_ascii=False, allow_nan=False).encode("utf-8")
+    return json.dumps(obj, default=serialize_record, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def reject_non_finite(obj):
+    """
+    Raise ValueError if the object holds NaN or an infinity.
+
+    Only called when the fast encoders' output might hide one, e.g. behind a
+    real null, so the slower json module only runs on those documents.
+    """
+    json.dumps(obj, default=serialize_record, allow_nan=False)
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def loads_database(data):
+    """
+    Parse a database document, turning its expenses into Expense records.
+
+    The records are built from the parsed dicts in one pass: an object hook
+    would be called for every JSON object and is slower, even with the json module.
+    """
+    database = loads(data)
+    database["expenses"] = [Expense.from_dict(expense) for expense in database["expenses"]]
+    return database
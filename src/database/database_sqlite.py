@@ -0,0 +1,206 @@
+import sqlite3
+from src.database.database_backend import StorageBackend, EXPENSE_FIELDS
+from src.database.database_categories import fold_category
+from src.expense.expense_core import Expense
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS monthly_budgets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    budget NUMERIC NOT NULL
+);
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    category_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_month ON expenses (month, amount);
+CREATE INDEX IF NOT EXISTS idx_expenses_created_at ON expenses (created_at);
+CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses (amount);
+"""
+
+# Categories are compared on category_key, the name folded by fold_category():
+# COLLATE NOCASE only folds ASCII letters, so "Étel" and "étel" would differ.
+CATEGORY_KEY_INDEX = "CREATE INDEX IF NOT EXISTS idx_expenses_category_key ON expenses (category_key, amount)"
+# Files written before category_key existed get the column and lose the indexes it replaces.
+ADD_CATEGORY_KEY = """
+ALTER TABLE expenses ADD COLUMN category_key TEXT NOT NULL DEFAULT '';
+UPDATE expenses SET category_key = fold_category(category);
+DROP INDEX IF EXISTS idx_expenses_category;
+DROP INDEX IF EXISTS idx_expenses_category_nocase;
+"""
+
+SELECT_EXPENSES = f"SELECT {', '.join(EXPENSE_FIELDS)} FROM expenses"
+INSERT_EXPENSE = f"INSERT INTO expenses ({', '.join(EXPENSE_FIELDS)}, category_key) VALUES ({', '.join('?' * (len(EXPENSE_FIELDS) + 1))})"
+UPDATABLE_FIELDS = ("description", "amount", "category")
+
+
+def expense_row_factory(cursor, row):
+    return Expense.from_trusted(*row)
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Storage backend keeping expenses and monthly budgets in a SQLite file.
+
+    Filters and sums run as indexed queries, so nothing but the budgets has
+    to be loaded at startup. Mutations run in an open transaction that
+    commit() ends once the Database has finished a whole operation.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(str(file_path), check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        columns = [column[1] for column in self.connection.execute("PRAGMA table_info(expenses)")]
+        if "category_key" not in columns:
+            self.connection.create_function("fold_category", 1, fold_category)
+            self.connection.executescript(ADD_CATEGORY_KEY)
+        self.connection.execute(CATEGORY_KEY_INDEX)
+
+    def is_empty(self):
+        return self.connection.execute("SELECT COUNT(*) FROM monthly_budgets").fetchone()[0] == 0
+
+    def initialize(self, database):
+        """Seed a fresh SQLite file from a JSON database document."""
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('name', ?)", (database["name"],))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO monthly_budgets (id, name, budget) VALUES (?, ?, ?)",
+                [(month["id"], month["name"], month["budget"]) for month in database["monthly_budgets"]]
+            )
+            self.insert_many(database.get("expenses", []))
+            self.raise_last_id(database.get("last_id", 0))
+
+    def load_metadata(self):
+        """Load the database document without its expenses."""
+        name = self.connection.execute("SELECT value FROM metadata WHERE key = 'name'").fetchone()
+        budgets = self.connection.execute("SELECT id, name, budget FROM monthly_budgets ORDER BY id").fetchall()
+        return {
+            "name": name[0] if name else "",
+            "monthly_budgets": [{"id": id, "name": month, "budget": budget} for id, month, budget in budgets]
+        }
+
+    def query(self, sql, parameters=()):
+        cursor = self.connection.cursor()
+        cursor.row_factory = expense_row_factory
+        return cursor.execute(sql, parameters)
+
+    def get(self, id):
+        return self.query(f"{SELECT_EXPENSES} WHERE id = ?", (id,)).fetchone()
+
+    def insert(self, expense):
+        self.insert_many([expense])
+
+    def insert_many(self, expenses):
+        expenses = list(expenses)
+        self.connection.executemany(
+            INSERT_EXPENSE,
+            ([*(expense[field] for field in EXPENSE_FIELDS), fold_category(expense["category"])] for expense in expenses)
+        )
+        if expenses:
+            self.raise_last_id(max(expense["id"] for expense in expenses))
+
+    def raise_last_id(self, id):
+        """Record the highest id ever used in the metadata, so the id of a deleted last expense is not reused."""
+        row = self.connection.execute("SELECT CAST(value AS INTEGER) FROM metadata WHERE key = 'last_id'").fetchone()
+        if row is None or id > row[0]:
+            self.connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_id', ?)", (id,))
+
+    def remove(self, id):
+        expense = self.get(id)
+        if expense is not None:
+            self.connection.execute("DELETE FROM expenses WHERE id = ?", (id,))
+        return expense
+
+    def update(self, expense, field, value):
+        if field not in UPDATABLE_FIELDS:
+            raise ValueError(f"The field {field} cannot be updated")
+        if field == "category":
+            self.connection.execute("UPDATE expenses SET category = ?, category_key = ? WHERE id = ?", (value, fold_category(value), expense["id"]))
+        else:
+            self.connection.execute(f"UPDATE expenses SET {field} = ? WHERE id = ?", (value, expense["id"]))
+        expense[field] = value
+
+    def total(self, filter="all", value=None):
+        if filter == "all":
+            where, parameters = "", ()
+        elif filter == "month":
+            where, parameters = " WHERE month = ?", (value,)
+        elif filter == "category":
+            where, parameters = " WHERE category_key = ?", (fold_category(value),)
+        elif filter == "month_category":
+            where, parameters = " WHERE month = ? AND category_key = ?", (value[0], fold_category(value[1]))
+        else:
+            raise ValueError(f"Unknown total filter: {filter}")
+        sum_of_expenses, count = self.connection.execute(
+            f"SELECT COALESCE(SUM(amount), 0.0), COUNT(*) FROM expenses{where}", parameters
+        ).fetchone()
+        return sum_of_expenses, count
+
+    def category_summary(self):
+        # Next to MIN(id), SQLite reads the bare category column from the row with the lowest id.
+        rows = self.connection.execute(
+            "SELECT category, COUNT(*), SUM(amount), MIN(id) FROM expenses"
+            " GROUP BY category_key ORDER BY category_key"
+        ).fetchall()
+        return [(category, count, sum_of_expenses) for category, count, sum_of_expenses, _ in rows]
+
+    def scan(self, filter=None, value=None, after_id=None):
+        if filter is None:
+            conditions, parameters = [], []
+        elif filter == "category":
+            conditions, parameters = ["category_key = ?"], [fold_category(value)]
+        elif filter == "month":
+            conditions, parameters = ["month = ?"], [value]
+        else:
+            raise ValueError(f"Unknown scan filter: {filter}")
+        if after_id is not None:
+            conditions.append("id > ?")
+            parameters.append(after_id)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(f"{SELECT_EXPENSES}{where} ORDER BY id", parameters)
+
+    def scan_range(self, start=None, end=None):
+        conditions, parameters = [], []
+        if start is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(start)
+        if end is not None:
+            conditions.append("created_at < ?")
+            parameters.append(end)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(f"{SELECT_EXPENSES}{where} ORDER BY created_at, id", parameters)
+
+    def last_id(self):
+        # Files written before the metadata kept the last id only have their expenses to go by.
+        return self.connection.execute(
+            "SELECT MAX(COALESCE(MAX(id), 0), COALESCE((SELECT CAST(value AS INTEGER) FROM metadata WHERE key = 'last_id'), 0))"
+            " FROM expenses"
+        ).fetchone()[0]
+
+    def version(self):
+        """Changes whenever another connection, e.g. another process, commits to the file."""
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def commit(self, record):
+        """End the transaction of a Database operation described by the mutation record."""
+        self.commit_many([record])
+
+    def commit_many(self, records):
+        """End the transaction holding the Database operations described by the mutation records."""
+        for record in records:
+            if record["op"] == "budget":
+                self.connection.execute("UPDATE monthly_budgets SET budget = ? WHERE name = ?", (record["budget"], record["month"]))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,179 @@
+import calendar
+import datetime
+import functools
+import math
+from src.database.database_categories import fold_category
+
+DEFAULT_PERCENTILES = (50, 90)
+
+
+@functools.lru_cache(maxsize=4096)
+def weekday_of(day):
+    return datetime.date.fromisoformat(day).weekday()
+
+
+def category_key(expense):
+    return fold_category(expense["category"])
+
+
+def year_key(expense):
+    return int(expense["created_at"][:4])
+
+
+def month_key(expense):
+    return expense["month"]
+
+
+def weekday_key(expense):
+    return weekday_of(expense["created_at"][:10])
+
+
+def day_key(expense):
+    return expense["created_at"][:10]
+
+
+# Group values as they are compared and sorted; module functions so summaries can be pickled.
+GROUP_KEYS = {
+    "category": category_key,
+    "year": year_key,
+    "month": month_key,
+    "weekday": weekday_key,
+    "day": day_key
+}
+
+
+def format_group_value(field, value):
+    if field == "month":
+        return calendar.month_name[value]
+    if field == "weekday":
+        return calendar.day_name[value]
+    return value
+
+
+def percentile(values, rank):
+    """Percentile of sorted values, interpolating linearly between the closest ranks."""
+    position = (len(values) - 1) * rank / 100
+    low, high = math.floor(position), math.ceil(position)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class GroupStatistics:
+    """
+    Running statistics of the amounts of one group.
+
+    Sum, count, min and max are updated in place; amounts are only kept when
+    percentiles are asked for. Statistics of the same group computed over
+    different expenses, e.g. different files, combine with merge().
+    """
+
+    __slots__ = ("count", "sum", "min", "max", "amounts")
+
+    def __init__(self, keep_amounts=False):
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.amounts = [] if keep_amounts else None
+
+    def add(self, amount):
+        self.count += 1
+        self.sum += amount
+        if amount < self.min:
+            self.min = amount
+        if amount > self.max:
+            self.max = amount
+        if self.amounts is not None:
+            self.amounts.append(amount)
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self.amounts is not None:
+            self.amounts.extend(other.amounts)
+
+    def mean(self):
+        return self.sum / self.count
+
+    def percentiles(self, ranks):
+        values = sorted(self.amounts)
+        return [percentile(values, rank) for rank in ranks]
+
+
+class GroupSummary:
+    """
+    Statistics of expenses grouped by any combination of the GROUP_KEYS fields, built in one pass.
+
+    Categories are grouped ignoring case and reported under the first
+    spelling seen.
+    """
+
+    def __init__(self, group_by, percentiles=DEFAULT_PERCENTILES):
+        for field in group_by:
+            if field not in GROUP_KEYS:
+                raise ValueError(f"Unknown group-by field: {field}")
+        for rank in percentiles:
+            if not 0 <= rank <= 100:
+                raise ValueError(f"Percentiles must be between 0 and 100, got {rank}")
+        self.group_by = tuple(group_by)
+        self.keys = tuple(GROUP_KEYS[field] for field in group_by)
+        self.percentiles = tuple(percentiles)
+        self.groups = {}
+        self.category_names = {}
+
+    def add(self, expense):
+        self.add_all((expense,))
+
+    def add_all(self, expenses):
+        keys, groups = self.keys, self.groups
+        for expense in expenses:
+            key = tuple([group_key(expense) for group_key in keys])
+            statistics = groups.get(key)
+            if statistics is None:
+                statistics = groups[key] = GroupStatistics(bool(self.percentiles))
+                if "category" in self.group_by:
+                    self.category_names.setdefault(category_key(expense), expense["category"])
+            statistics.add(expense["amount"])
+        return self
+
+    def merge(self, other):
+        """Fold in a summary with the same grouping computed over other expenses."""
+        for key, statistics in other.groups.items():
+            if key in self.groups:
+                self.groups[key].merge(statistics)
+            else:
+                self.groups[key] = statistics
+        for key, name in other.category_names.items():
+            self.category_names.setdefault(key, name)
+        return self
+
+    def header(self):
+        return [*self.group_by, "count", "sum", "mean", "min", "max", *(f"p{rank:g}" for rank in self.percentiles)]
+
+    def rows(self):
+        """One row per group, ordered by the group values, in the columns of header()."""
+        for key in sorted(self.groups):
+            statistics = self.groups[key]
+            labels = [
+                self.category_names[value] if field == "category" else format_group_value(field, value)
+                for field, value in zip(self.group_by, key)
+            ]
+            values = [statistics.sum, statistics.mean(), statistics.min, statistics.max]
+            if self.percentiles:
+                values += statistics.percentiles(self.percentiles)
+            yield labels + [statistics.count] + [round(value, 2) for value in values]
+
+
+def print_summary(summary):
+    """Print a GroupSummary as a table."""
+    if not summary.groups:
+        print("No expenses available.")
+        return
+
+    from prettytable import PrettyTable
+    table = PrettyTable()
+    table.field_names = summary.header()
+    for row in summary.rows():
+        table.add_row(row)
+    print(table)
@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import Future
+
+
+class GroupCommitWriter:
+    """
+    Background writer coalescing the mutations of many threads into one commit.
+
+    submit() queues a mutation record and returns a Future. Once a record is
+    queued, the writer thread waits for the flush interval so mutations from
+    other threads can join the batch, then calls flush(), which takes the
+    whole batch with take() and persists it in a single write. The futures of
+    the batch resolve, or fail with the write error, once it is on disk.
+    """
+
+    def __init__(self, flush, interval):
+        self.flush = flush
+        self.interval = interval
+        self.pending = []
+        self.condition = threading.Condition()
+        self.thread = None
+        self.closed = False
+
+    def submit(self, record):
+        future = Future()
+        with self.condition:
+            if self.closed:
+                raise ValueError("The database writer has been closed")
+            self.pending.append((record, future))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="database-writer", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return future
+
+    def has_pending(self):
+        with self.condition:
+            return bool(self.pending)
+
+    def take(self):
+        """Remove and return the queued (record, future) pairs."""
+        with self.condition:
+            batch, self.pending = self.pending, []
+        return batch
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                # Let other threads join the batch; close() cuts the wait short and flushes itself.
+                self.condition.wait_for(lambda: self.closed, timeout=self.interval)
+                if self.closed:
+                    return
+            self.flush()
+
+    def close(self):
+        """Stop the writer thread and flush whatever is still queued."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.flush()
+
+
+def resolved():
+    """A future that is already complete, for mutations written before it is returned."""
+    future = Future()
+    future.set_result(None)
+    return future
+
+
+def resolve(batch, error=None):
+    """Complete the futures of a flushed batch."""
+    for _, future in batch:
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
@@ -1,21 +1,51 @@
-from dataclasses import dataclass, field
+import math
 from typing import Dict
 from datetime import datetime
 
-@dataclass
 class Expense:
-    id: int
-    description: str
-    amount: float
-    category: str
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    month: int = field(init=False)
-
-    def __post_init__(self):
-        if self.amount < 0:
-            raise ValueError("Amount must be non-negative")
+    """
+    Compact expense record stored by the database.
+
+    The record uses __slots__ instead of a per-instance dict and supports the
+    read/write subscript access (expense["amount"]) the database code shares
+    with plain expense dicts. It only becomes a dict through as_dict(), at
+    serialization boundaries.
+    """
+    __slots__ = ("id", "description", "amount", "category", "created_at", "month")
+
+    def __init__(self, id: int, description: str, amount: float, category: str, created_at: str = None):
+        self.validate_amount(amount)
+        self.id = id
+        self.description = description
+        self.amount = amount
+        self.category = category
+        self.created_at = created_at if created_at is not None else datetime.now().isoformat()
         self.month = datetime.fromisoformat(self.created_at).month
 
+    @staticmethod
+    def validate_amount(amount: float):
+        """Reject negative amounts, and NaN and infinities, which cannot be stored as JSON."""
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number")
+        if amount < 0:
+            raise ValueError("Amount must be non-negative")
+
+    @classmethod
+    def from_trusted(cls, id: int, description: str, amount: float, category: str, created_at: str, month: int):
+        """Build a record from already validated data, e.g. loaded from disk, without re-parsing created_at."""
+        expense = cls.__new__(cls)
+        expense.id = id
+        expense.description = description
+        expense.amount = amount
+        expense.category = category
+        expense.created_at = created_at
+        expense.month = month
+        return expense
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]) -> "Expense":
+        return cls.from_trusted(data["id"], data["description"], data["amount"], data["category"], data["created_at"], data["month"])
+
     def as_dict(self) -> Dict[str, any]:
         return {
             "id": self.id,
@@ -26,6 +56,31 @@ class Expense:
             "month": self.month
         }
 
+    def keys(self):
+        return self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Expense):
+            return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
     def __str__(self) -> str:
         return f"Expense(id={self.id}, description={self.description}, amount={self.amount}, " \
                f"category={self.category}, created_at={self.created_at}, month={self.month})"
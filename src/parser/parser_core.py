@@ -8,6 +8,8 @@ class Parser:
         action_group = self.parser.add_argument_group("Action arguments")
         list_group = self.parser.add_argument_group("List arguments")
         summary_group = self.parser.add_argument_group("Summary arguments")
+        range_group = self.parser.add_argument_group("Date range arguments")
+        export_group = self.parser.add_argument_group("Export arguments")
         
         # Action arguments
         action_group.add_argument(
@@ -46,6 +48,12 @@ class Parser:
             metavar="ID",
             help="Find an expense record by id"
         )
+        action_group.add_argument(
+            "--import",
+            dest="import_file",
+            metavar="FILE",
+            help="Import expense records from a CSV or JSON-lines file"
+        )
         
         # List arguments
         list_group.add_argument(
@@ -63,6 +71,46 @@ class Parser:
             metavar="MONTH",
             help="List all expenses by month of the current year"
         )
+        list_group.add_argument(
+            "--list-categories",
+            action="store_true",
+            help="List the categories in use with their number of expenses and total"
+        )
+        list_group.add_argument(
+            "--limit",
+            type=int,
+            metavar="N",
+            help="List at most N expenses"
+        )
+        list_group.add_argument(
+            "--offset",
+            type=int,
+            metavar="N",
+            help="Skip the first N expenses"
+        )
+        list_group.add_argument(
+            "--after-id",
+            type=int,
+            metavar="ID",
+            help="Only list expenses with an id greater than ID, to page through large lists"
+        )
+        list_group.add_argument(
+            "--sort",
+            choices=["id", "amount", "created_at", "category", "description"],
+            help="Sort the listed expenses by a field instead of by id"
+        )
+        list_group.add_argument(
+            "--desc",
+            dest="descending",
+            action="store_true",
+            help="Sort in descending order"
+        )
+        list_group.add_argument(
+            "--format",
+            dest="output_format",
+            choices=["table", "plain", "tsv", "jsonl"],
+            help="Output format; plain, tsv and jsonl are written row by row as expenses are read"
+        )
         
         # Summary arguments
         summary_group.add_argument(
@@ -81,22 +129,108 @@ class Parser:
             help="Summary of expenses by month of the current year"
         )
         
-        # Export argument
-        self.parser.add_argument(
+        summary_group.add_argument(
+            "--summary-group-by",
+            nargs="+",
+            choices=["category", "year", "month", "weekday", "day"],
+            metavar="FIELD",
+            help="Count, sum, mean, min, max and percentiles of the expenses grouped by "
+                 "one or more of category, year, month, weekday and day"
+        )
+        summary_group.add_argument(
+            "--percentiles",
+            nargs="+",
+            type=float,
+            metavar="P",
+            help="Percentiles reported by --summary-group-by (default: 50 90)"
+        )
+
+        summary_group.add_argument(
+            "--report",
+            dest="report_files",
+            nargs="+",
+            metavar="FILE",
+            help="Summarize the expenses of several database files together, grouped by "
+                 "--summary-group-by, parsing the files in parallel"
+        )
+        summary_group.add_argument(
+            "--workers",
+            type=int,
+            metavar="N",
+            help="Worker processes for --report (default: the number of CPUs)"
+        )
+
+        # Date range arguments
+        range_group.add_argument(
+            "--from",
+            dest="date_from",
+            metavar="DATE",
+            help="Only list or summarize expenses created on or after DATE (YYYY-MM-DD or an ISO datetime)"
+        )
+        range_group.add_argument(
+            "--to",
+            dest="date_to",
+            metavar="DATE",
+            help="Only list or summarize expenses created on or before DATE (YYYY-MM-DD or an ISO datetime)"
+        )
+
+        # Export arguments
+        export_group.add_argument(
             "--export-csv",
             action="store_true",
             help="Export the expenses to a CSV file"
         )
+        export_group.add_argument(
+            "--export-jsonl",
+            action="store_true",
+            help="Export the expenses as JSON lines, one object per expense"
+        )
+        export_group.add_argument(
+            "--since-revision",
+            type=int,
+            metavar="REVISION",
+            help="Only export the expenses changed after REVISION, with deletions; 0 exports all of them (needs EXPENSE_TRACKER_CHANGE_TRACKING=1)"
+        )
+        export_group.add_argument(
+            "--export-output",
+            metavar="PATH",
+            help="Write the export to PATH instead of the default file, '-' for stdout"
+        )
+        export_group.add_argument(
+            "--export-category",
+            metavar="CATEGORY",
+            help="Only export expenses of the given category"
+        )
+        export_group.add_argument(
+            "--export-month",
+            metavar="MONTH",
+            help="Only export expenses of the given month"
+        )
+        export_group.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Gzip-compress the export"
+        )
+
+        # Server argument
+        self.parser.add_argument(
+            "--serve",
+            action="store_true",
+            help="Keep the database loaded and answer commands sent by other invocations over a Unix socket"
+        )
     
-    def parse_args(self):
+    def parse_args(self, argv=None):
         """
         Parse command line arguments and handle errors gracefully.
 
+        Args:
+            argv (list): Arguments to parse, defaults to sys.argv[1:].
+
         Returns:
             argparse.Namespace: Parsed arguments.
         """
         try:
-            args = self.parser.parse_args()
+            args = self.parser.parse_args(argv)
             if args.add:
                 # Validate and convert amount to float
                 try:
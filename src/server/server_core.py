@@ -0,0 +1,126 @@
+import io
+import json
+import os
+import socket
+import socketserver
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from src.database.database_maker import DB_FILE_PATH, SOCKET_FILE_PATH, STORAGE_MODE
+
+
+def database_identity():
+    """The database a process works on; a server only runs the commands of clients working on the same one."""
+    return {"database": str(DB_FILE_PATH), "storage": STORAGE_MODE}
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """
+    Reads one JSON line {"argv": [...], "cwd": "...", "identity": {...}} and
+    answers with {"output": "...", "status": 0}, status being the exit status
+    of the command.
+
+    The output is null if the client works on another database than the server.
+    """
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return  # liveness probe from is_server_running
+        request = json.loads(line)
+        output, status = None, None
+        if request.get("identity") == self.server.identity:
+            output, status = self.server.run_command(request["argv"], request.get("cwd"))
+        self.wfile.write((json.dumps({"output": output, "status": status}) + "\n").encode("utf-8"))
+
+
+class Server(socketserver.UnixStreamServer):
+    """
+    Long-running process that keeps the database loaded between commands.
+
+    Commands are handled one at a time, so the stdout/stderr redirection used
+    to capture their output and the change to the client's working directory,
+    against which relative paths in the command line are resolved, never
+    overlap.
+    """
+
+    def __init__(self, socket_path, command_runner, identity=None):
+        """
+        Args:
+            socket_path (Path): Unix socket to listen on.
+            command_runner (callable): Runs a command given its argv list, prints
+                the result and returns its exit status, None meaning 0.
+            identity (dict): The database served, database_identity() by default.
+        """
+        self.socket_path = Path(socket_path)
+        self.command_runner = command_runner
+        self.identity = database_identity() if identity is None else identity
+        if self.socket_path.exists():
+            if is_server_running(self.socket_path):
+                raise ValueError(f"A server is already listening on {self.socket_path}")
+            os.remove(self.socket_path)
+        super().__init__(str(self.socket_path), CommandHandler)
+
+    def run_command(self, argv, cwd=None):
+        """
+        Run a command line from the working directory cwd.
+
+        Returns:
+            tuple: What the command printed and its exit status.
+        """
+        server_cwd = os.getcwd()
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+        except OSError as e:
+            return f"An error occurred while changing to the directory {cwd}: {e}\n", 1
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer), redirect_stderr(buffer):
+                status = self.command_runner(argv)
+        finally:
+            os.chdir(server_cwd)
+        return buffer.getvalue(), status or 0
+
+    def server_close(self):
+        super().server_close()
+        if self.socket_path.exists():
+            os.remove(self.socket_path)
+
+
+def connect(socket_path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError:
+        client.close()
+        raise
+    return client
+
+
+def is_server_running(socket_path):
+    try:
+        connect(socket_path).close()
+        return True
+    except OSError:
+        return False
+
+
+def send_command(socket_path, argv):
+    """
+    Run a command on the server listening on socket_path, from the current working directory.
+
+    Returns:
+        tuple: The command output and exit status, or None if no server
+            accepted the connection or the server works on another database.
+    """
+    try:
+        client = connect(socket_path)
+    except OSError:
+        return None
+    request = {"argv": list(argv), "cwd": os.getcwd(), "identity": database_identity()}
+    with client, client.makefile('rb') as reader:
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        response = json.loads(reader.readline())
+    if response["output"] is None:
+        return None
+    return response["output"], response["status"]
@@ -0,0 +1,39 @@
+import json
+from unittest.mock import patch
+from benchmarks.benchmark_core import generate_database, run_benchmarks, compare_reports
+from src.database.database_core import Database
+
+class TestBenchmarks:
+    def test_generate_database(self, tmp_path):
+        """Tests that the synthetic database has the requested size and a valid layout"""
+        generate_database(tmp_path / "db.json", 25)
+        database = json.loads((tmp_path / "db.json").read_text(encoding="utf-8"))
+        assert len(database["expenses"]) == 25
+        assert len(database["monthly_budgets"]) == 12
+        assert [expense["id"] for expense in database["expenses"]] == list(range(1, 26))
+
+    def test_run_benchmarks_report(self):
+        """Tests that every hot path is reported and the singleton is restored afterwards"""
+        db_file_path, changes_file_path = Database.db_file_path, Database.changes_file_path
+        changes_existed = changes_file_path.exists()
+        with patch('src.database.database_core.CHANGE_TRACKING', True):
+            report = run_benchmarks(sizes=[30], repeat=1, mutation_repeat=1)
+
+        operations = {row["operation"] for row in report["results"]}
+        assert {"init_database", "find_expense_by_id", "delete_an_expense", "add_an_expense",
+                "list_expenses", "summary_expenses", "export_expenses", "main --summary-all", "main --help"} <= operations
+        assert all(row["size"] == 30 and row["mean_seconds"] >= 0 and row["peak_memory_bytes"] > 0 for row in report["results"])
+        assert Database.db_file_path == db_file_path
+        assert Database.changes_file_path == changes_file_path
+        assert changes_file_path.exists() == changes_existed
+        assert report["import"]["mean_seconds"] > 0
+        json.dumps(report)
+
+    def test_compare_reports(self):
+        """Tests that reports are matched by operation and size"""
+        baseline = {"results": [{"operation": "find_expense_by_id", "size": 10, "mean_seconds": 2.0}]}
+        current = {"results": [
+            {"operation": "find_expense_by_id", "size": 10, "mean_seconds": 0.5},
+            {"operation": "find_expense_by_id", "size": 20, "mean_seconds": 0.5}
+        ]}
+        assert compare_reports(baseline, current) == [("find_expense_by_id", 10, 2.0, 0.5, 4.0)]
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from src.database.database_async import AsyncDatabase
+from src.database.database_core import Database
+
+class TestAsyncDatabase:
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Creates a Database without group commit in a temporary directory"""
+        Database.instance = None
+        with patch.object(Database, 'db_file_path', tmp_path / "db.json"), \
+                patch.object(Database, 'journal_file_path', tmp_path / "db.journal"), \
+                patch.object(Database, 'lock_file_path', tmp_path / "db.lock"), \
+                patch('src.database.database_core.STORAGE_MODE', "json"), \
+                patch('src.database.database_core.GROUP_COMMIT_INTERVAL_MS', 0):
+            db = Database()
+            yield db
+            db.file_lock.close()
+        Database.instance = None
+        Database.writer = None
+
+    def test_concurrent_adds_are_coalesced(self, db, capfd):
+        """Tests that adds from many coroutines share commits and are on disk once awaited"""
+        commit_many = db.database_maker.commit_many
+
+        async def add_all():
+            async with AsyncDatabase(db) as async_db:
+                return await asyncio.gather(*(async_db.add(f"Expense {number}", 1.0, "Food") for number in range(40)))
+
+        with patch.object(db.database_maker, 'commit_many', side_effect=commit_many) as mock_commit_many:
+            expenses = asyncio.run(add_all())
+
+        assert sorted(expense["id"] for expense in expenses) == list(range(1, 41))
+        assert mock_commit_many.call_count < 40
+        database = json.loads(db.db_file_path.read_text(encoding="utf-8"))
+        assert len(database["expenses"]) == 40
+        assert db.writer is None
+        assert not db.file_lock.locked
+
+    def test_add_many_waits_for_its_write(self, db, capfd):
+        """Tests that add_many returns once its batch is on disk, and that closing drops the writer's exit hook"""
+        async def scenario():
+            async_db = AsyncDatabase(db, group_commit_ms=20)
+            with patch.object(db, 'flush_pending', side_effect=db.flush_pending) as mock_flush_pending:
+                assert await async_db.add_many([{"description": "Lunch", "amount": 10.0, "category": "Food"}]) == 1
+                mock_flush_pending.assert_not_called()
+            database = json.loads(db.db_file_path.read_text(encoding="utf-8"))
+            assert [expense["description"] for expense in database["expenses"]] == ["Lunch"]
+            with patch('src.database.database_core.atexit.unregister') as mock_unregister:
+                await async_db.close()
+                mock_unregister.assert_called_once_with(db.close_writer)
+
+        asyncio.run(scenario())
+        assert db.writer is None
+
+    @pytest.mark.parametrize("options", [{}, {"filter": "category", "filter_value": "food"},
+                                         {"filter": "month", "filter_value": "January"}, {"date_from": "2024-01-01"}])
+    def test_deletes_between_batches(self, db, capfd, options):
+        """Tests that deleting expenses while a listing is suspended neither fails nor skips other expenses"""
+        async def scenario():
+            async with AsyncDatabase(db) as async_db:
+                await async_db.add_many([
+                    {"description": f"Expense {number}", "amount": 1.0, "category": "Food", "created_at": f"2024-01-0{number}T10:00:00"}
+                    for number in range(1, 10)
+                ])
+                listed = []
+                async for expense in async_db.list(batch_size=2, **options):
+                    listed.append(expense["id"])
+                    if expense["id"] == 2:
+                        await async_db.delete(1)
+                        await async_db.delete(5)
+                return listed
+
+        assert asyncio.run(scenario()) == [1, 2, 3, 4, 6, 7, 8, 9]
+
+    def test_update_delete_and_find(self, db, capfd):
+        """Tests mutations and lookups, and that unknown ids raise a ValueError"""
+        async def scenario():
+            async with AsyncDatabase(db) as async_db:
+                expense = await async_db.add("Lunch", 10.0, "Food")
+                await async_db.update(expense["id"], "amount", 12.5)
+                assert (await async_db.find(expense["id"]))["amount"] == 12.5
+                await async_db.delete(expense["id"])
+                with pytest.raises(ValueError, match="not found"):
+                    await async_db.find(expense["id"])
+                with pytest.raises(ValueError, match="not found"):
+                    await async_db.delete(expense["id"])
+                with pytest.raises(ValueError, match="cannot be updated"):
+                    await async_db.update(expense["id"], "id", 7)
+
+        asyncio.run(scenario())
+        assert capfd.readouterr().out == ""
+
+    def test_streaming_reads_and_summaries(self, db, capfd):
+        """Tests that listing streams every match in batches and summaries return their values"""
+        async def scenario():
+            async with AsyncDatabase(db) as async_db:
+                await async_db.add_many([
+                    {"description": f"Expense {number}", "amount": float(number), "category": "Food" if number % 2 else "Travel"}
+                    for number in range(1, 8)
+                ])
+                listed = [expense["id"] async for expense in async_db.list(filter="category", filter_value="food", batch_size=2)]
+                assert listed == [1, 3, 5, 7]
+                assert await async_db.summary("Travel", "category") == (12.0, 3)
+                summary = await async_db.group_summary(["category"], percentiles=[])
+                assert [row[:3] for row in summary.rows()] == [["Food", 4, 16.0], ["Travel", 3, 12.0]]
+
+        asyncio.run(scenario())
@@ -0,0 +1,181 @@
+import pytest
+from unittest.mock import patch
+from src.database import database_binary
+from src.database.database_binary import BinaryBackend
+from src.database.database_core import Database
+from src.database.database_maker import DATABASE_STRUCTURE
+
+@pytest.fixture(params=["numpy", "struct"])
+def record_reader(request):
+    """Runs a test with the NumPy view of the records and again with struct unpacking"""
+    if request.param == "struct":
+        with patch.object(database_binary, 'numpy', None):
+            yield request.param
+    else:
+        if database_binary.numpy is None:
+            pytest.skip("NumPy is not installed")
+        yield request.param
+
+class TestBinaryBackend:
+    @pytest.fixture
+    def sample_database_content(self):
+        """Provides sample database content for seeding the record file"""
+        return {
+            "name": "Expense Tracker Database",
+            "monthly_budgets": [
+                {"id": 1, "name": "January", "budget": 100},
+                {"id": 2, "name": "February", "budget": 100}
+            ],
+            "expenses": [
+                {"id": 1, "description": "Lunch", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1},
+                {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+                {"id": 3, "description": "Dîner", "amount": 20.0, "category": "Food", "created_at": "2024-02-01T10:00:00", "month": 2}
+            ]
+        }
+
+    @pytest.fixture
+    def backend(self, tmp_path, sample_database_content):
+        backend = BinaryBackend(tmp_path / "db.bin")
+        backend.initialize(sample_database_content)
+        yield backend
+        backend.close()
+
+    def test_initialize_and_load_metadata(self, tmp_path, sample_database_content):
+        """Tests that a fresh file is empty until seeded and keeps the budgets"""
+        backend = BinaryBackend(tmp_path / "db.bin")
+        assert backend.is_empty()
+
+        backend.initialize(sample_database_content)
+        assert not backend.is_empty()
+        assert backend.load_metadata() == {
+            "name": "Expense Tracker Database",
+            "monthly_budgets": sample_database_content["monthly_budgets"]
+        }
+        backend.close()
+
+    def test_get_and_last_id(self, backend, sample_database_content):
+        """Tests the binary search for single expenses and the highest id"""
+        assert backend.get(3) == sample_database_content["expenses"][2]
+        assert backend.get(99) is None
+        assert backend.last_id() == 3
+
+    def test_scan(self, backend, record_reader):
+        """Tests filtered scans in id order"""
+        assert [expense["id"] for expense in backend.scan()] == [1, 2, 3]
+        assert [expense["id"] for expense in backend.scan("category", "food")] == [1, 3]
+        assert [expense["id"] for expense in backend.scan("month", 1)] == [1, 2]
+        assert [expense["id"] for expense in backend.scan(after_id=1)] == [2, 3]
+        assert [expense["id"] for expense in backend.scan("category", "food", after_id=1)] == [3]
+        assert list(backend.scan(after_id=3)) == []
+
+    def test_scan_range(self, backend, record_reader):
+        """Tests date-range scans, following inserts and removes"""
+        assert [expense["id"] for expense in backend.scan_range("2024-01-02", "2024-03-01")] == [2, 3]
+        backend.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2023-12-31T10:00:00", "month": 12})
+        backend.remove(1)
+        backend.commit({"op": "delete", "id": 1})
+        assert [expense["id"] for expense in backend.scan_range(end="2024-01-31")] == [4, 2]
+
+    def test_total(self, backend, record_reader):
+        """Tests sums over the mapped records"""
+        assert backend.total() == (32.5, 3)
+        assert backend.total("month", 1) == (12.5, 2)
+        assert backend.total("category", "Food") == (30.0, 2)
+        assert backend.total("month_category", (2, "Food")) == (20.0, 1)
+        assert backend.total("month", 12) == (0.0, 0)
+
+    def test_categories_ignore_case(self, backend, record_reader):
+        """Tests that category totals and the category summary ignore case"""
+        backend.insert({"id": 4, "description": "Snack", "amount": 5.0, "category": "FOOD", "created_at": "2024-02-02T10:00:00", "month": 2})
+        backend.remove(2)
+        assert backend.total("category", "food") == (35.0, 3)
+        assert backend.category_summary() == [("Food", 3, 35.0)]
+
+    def test_mutations(self, backend, record_reader):
+        """Tests insert, in-place update and flagged remove"""
+        backend.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2})
+        expense = backend.get(1)
+        backend.update(expense, "amount", 11.0)
+        backend.update(expense, "category", "Groceries")
+        assert backend.get(1) == expense
+        assert backend.remove(2)["description"] == "Bus"
+        assert backend.remove(2) is None
+        backend.commit({"op": "delete", "id": 2})
+
+        assert [expense["id"] for expense in backend.scan()] == [1, 3, 4]
+        assert backend.total() == (46.0, 3)
+        assert backend.total("category", "Groceries") == (11.0, 1)
+
+    def test_insert_rejects_decreasing_ids(self, backend):
+        """Tests that records stay sorted by id"""
+        with pytest.raises(ValueError, match="Expense ids must be increasing"):
+            backend.insert({"id": 2, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2})
+
+    def test_other_instance_sees_appends(self, backend, tmp_path):
+        """Tests that a second mapping of the files, as in another process, sees new records and commits"""
+        other = BinaryBackend(tmp_path / "db.bin")
+        version = other.version()
+        backend.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2})
+        backend.commit({"op": "budget", "month": "January", "budget": 250})
+
+        assert other.version() != version
+        assert other.get(4)["description"] == "Taxi"
+        assert other.load_metadata()["monthly_budgets"][0]["budget"] == 250
+        other.close()
+
+    def test_other_instance_reads_appends(self, backend, tmp_path, record_reader):
+        """Tests that the totals of a second mapping cover records appended past its end, once the file grew"""
+        other = BinaryBackend(tmp_path / "db.bin")
+        assert other.total() == (32.5, 3)
+        backend.insert_many([{"id": id, "description": "Taxi", "amount": 1.0, "category": "Travel",
+                              "created_at": "2024-02-02T10:00:00", "month": 2} for id in range(4, 2004)])
+
+        assert other.total() == (2032.5, 2003)
+        assert other.total("category", "travel") == (2002.5, 2001)
+        other.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Tests that a file without the record header is refused"""
+        (tmp_path / "db.bin").write_bytes(b"not a record file".ljust(64, b"\0"))
+        with pytest.raises(ValueError, match="is not an expense record file"):
+            BinaryBackend(tmp_path / "db.bin")
+
+
+class TestDatabaseWithBinaryBackend:
+    @pytest.fixture(autouse=True)
+    def binary_database(self, tmp_path):
+        """Runs the Database singleton in binary mode inside a temporary directory"""
+        Database.instance = None
+        with patch('src.database.database_core.STORAGE_MODE', "binary"), \
+             patch.object(Database, 'binary_file_path', tmp_path / "db.bin"), \
+             patch.object(Database, 'lock_file_path', tmp_path / "db.lock"), \
+             patch('src.database.database_maker.DatabaseMaker.is_db_file_exists', return_value=False):
+            yield
+        if Database.instance is not None and Database.instance.backend is not None:
+            Database.instance.backend.close()
+        Database.instance = None
+
+    def test_operations_round_trip(self):
+        """Tests that the Database API behaves the same on top of the record file"""
+        db = Database()
+        assert db.database["monthly_budgets"] == DATABASE_STRUCTURE["monthly_budgets"]
+        with patch('builtins.print') as mock_print:
+            db.add_an_expense("Lunch", 20.0, "Food")
+            db.add_an_expense("Bus", 3.0, "Travel")
+            db.update_an_expense_amount(2, 4.0)
+            db.delete_an_expense(1)
+
+            assert db.find_expense_by_id(2)["amount"] == 4.0
+            with pytest.raises(ValueError, match="Expense with ID:1 not found"):
+                db.find_expense_by_id(1)
+
+            db.summary_expenses("Travel", "category")
+            mock_print.assert_called_with("The sum of expenses for the given filter: category is 4.0$")
+
+        db.set_budget_for_a_month("March", 300)
+        Database.instance.backend.close()
+        Database.instance = None
+
+        reopened = Database()
+        assert reopened.get_last_id() == 2
+        assert reopened.database["monthly_budgets"][2]["budget"] == 300
@@ -0,0 +1,26 @@
+from src.database.database_categories import CategoryRegistry
+
+class TestCategoryRegistry:
+    def test_interning_ignores_case(self):
+        """Tests that spellings differing in case share a code and keep the first spelling"""
+        registry = CategoryRegistry()
+        assert registry.code("Food") == registry.code("FOOD") == 0
+        assert registry.code("Travel") == 1
+        assert registry.lookup("food") == 0
+        assert registry.lookup("Rent") is None
+        assert registry.names == ["Food", "Travel"]
+        assert len(registry) == 2
+
+    def test_posting_lists(self):
+        """Tests that posting lists are built sorted and stay sorted through adds and discards"""
+        registry = CategoryRegistry()
+        registry.build_postings([{"id": 3, "category": "food"}, {"id": 1, "category": "Food"}])
+        for id, category in [(2, "Travel"), (5, "FOOD"), (4, "Food")]:
+            registry.add({"id": id, "category": category})
+        assert registry.ids("Food") == [1, 3, 4, 5]
+        assert registry.ids("food", after_id=3) == [4, 5]
+
+        registry.discard({"id": 3, "category": "Food"})
+        registry.discard({"id": 9, "category": "Rent"})
+        assert registry.ids("FOOD") == [1, 4, 5]
+        assert registry.ids("Rent") == []
@@ -0,0 +1,128 @@
+import csv
+import json
+import pytest
+from unittest.mock import patch
+from src.database.database_changes import ChangeLog, changed_ids
+from src.database.database_core import Database
+
+class TestChangeLog:
+    @pytest.fixture
+    def change_log(self, tmp_path):
+        return ChangeLog(tmp_path / "db.changes", sync=False)
+
+    def test_changed_ids(self):
+        """Tests the id ranges of the mutation records, and that budget changes have none"""
+        assert changed_ids({"op": "add", "expense": {"id": 4}}) == (4, 4)
+        assert changed_ids({"op": "add_many", "expenses": [{"id": 5}, {"id": 6}, {"id": 7}]}) == (5, 7)
+        assert changed_ids({"op": "update", "id": 2, "field": "amount", "value": 1.0}) == (2, 2)
+        assert changed_ids({"op": "delete", "id": 3}) == (3, 3)
+        assert changed_ids({"op": "budget", "month": "March", "budget": 300}) is None
+
+    def test_revisions_grow_per_mutation(self, change_log):
+        """Tests that every expense mutation gets the next revision, across appends"""
+        assert change_log.last_revision() == 0
+        assert change_log.append([{"op": "add", "expense": {"id": 1}}, {"op": "budget", "month": "May", "budget": 1}]) == 1
+        assert change_log.append([{"op": "update", "id": 1, "field": "amount", "value": 2.0}, {"op": "delete", "id": 1}]) == 3
+        assert change_log.last_revision() == 3
+
+    def test_since_returns_the_last_revision_of_each_id(self, change_log):
+        """Tests that the changes after any revision are found, in the order of their last change"""
+        for id in range(1, 301):
+            change_log.append([{"op": "add", "expense": {"id": id}}])
+        change_log.append([{"op": "update", "id": 5, "field": "amount", "value": 2.0}])
+
+        assert change_log.since(0) == {**{id: id for id in range(1, 301) if id != 5}, 5: 301}
+        assert list(change_log.since(297).items()) == [(298, 298), (299, 299), (300, 300), (5, 301)]
+        assert change_log.since(301) == {}
+        assert change_log.since(1000) == {}
+
+    def test_missing_log_has_no_changes(self, change_log):
+        """Tests that a log that was never written is at revision 0"""
+        assert change_log.since(0) == {}
+        assert change_log.tail() == (0, True)
+
+    def test_torn_line_is_skipped(self, change_log):
+        """Tests that a line cut short by a crash is terminated and ignored"""
+        change_log.append([{"op": "add", "expense": {"id": 1}}])
+        with open(change_log.file_path, mode='ab') as log_file:
+            log_file.write(b'{"revision": 2, "id')
+
+        assert change_log.tail() == (1, False)
+        assert change_log.append([{"op": "add", "expense": {"id": 2}}]) == 2
+        assert change_log.since(0) == {1: 1, 2: 2}
+
+
+class TestChangeExport:
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Opens a database with change tracking in a temporary directory"""
+        with patch('src.database.database_core.STORAGE_MODE', "json"), \
+                patch('src.database.database_core.GROUP_COMMIT_INTERVAL_MS', 0), \
+                patch('src.database.database_core.CHANGE_TRACKING', True), \
+                patch('builtins.print'):
+            with Database(path=tmp_path / "db.json") as db:
+                db.add_expenses([{"description": "Lunch", "amount": 10.0, "category": "Food"},
+                                 {"description": "Bus", "amount": 2.5, "category": "Travel"}])
+                db.add_an_expense("Taxi", 20.0, "Travel")
+                yield db
+
+    def test_snapshot_then_delta(self, db, tmp_path):
+        """Tests that a delta holds only what changed since the snapshot, with tombstones for deletions"""
+        assert db.export_expenses("csv", output=str(tmp_path / "snapshot.csv"), since_revision=0) == 2
+        rows = list(csv.reader((tmp_path / "snapshot.csv").read_text().splitlines()))
+        assert rows[0] == ["id", "description", "amount", "category", "created_at", "month", "revision", "deleted"]
+        assert [(row[0], row[6], row[7]) for row in rows[1:]] == [("1", "1", "False"), ("2", "1", "False"), ("3", "2", "False")]
+
+        db.update_an_expense_amount(1, 12.0)
+        db.delete_an_expense(2)
+        db.set_budget_for_a_month("March", 300)
+        assert db.export_expenses("csv", output=str(tmp_path / "delta.csv"), since_revision=2) == 4
+
+        rows = list(csv.reader((tmp_path / "delta.csv").read_text().splitlines()))
+        assert rows[1][:3] == ["1", "Lunch", "12.0"] and rows[1][6:] == ["3", "False"]
+        assert rows[2] == ["2", "", "", "", "", "", "4", "True"]
+        assert len(rows) == 3
+
+    def test_jsonl_delta(self, db, capsys):
+        """Tests the JSON lines format of a delta written to stdout"""
+        db.delete_an_expense(3)
+        capsys.readouterr()
+        db.export_expenses("jsonl", output="-", since_revision=2)
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert lines == [{"id": 3, "description": None, "amount": None, "category": None, "created_at": None,
+                          "month": None, "revision": 3, "deleted": True}]
+
+    def test_group_commits_are_tracked(self, db):
+        """Tests that mutations written together by the group-commit writer get one revision each"""
+        db.enable_group_commit(60_000)
+        db.update_an_expense_category(1, "Groceries")
+        db.delete_an_expense(3)
+        db.flush_pending()
+
+        assert db.change_log.since(2) == {1: 3, 3: 4}
+
+    def test_tracking_is_kept_by_the_database(self, db, tmp_path):
+        """Tests that writers started without change tracking still log their changes once the database tracks them"""
+        assert (tmp_path / "db.changes").exists()
+        with patch('src.database.database_core.CHANGE_TRACKING', False), patch('builtins.print'):
+            db.close()
+            with Database(path=tmp_path / "db.json") as reopened:
+                reopened.add_an_expense("Train", 30.0, "Travel")
+                assert reopened.change_log.since(2) == {4: 3}
+
+            with Database(path=tmp_path / "later.json") as later:
+                assert later.change_log is None
+                (tmp_path / "later.changes").touch()  # Tracking turned on by another process
+                later.add_an_expense("Train", 30.0, "Travel")
+                assert later.change_log.since(0) == {1: 1}
+
+    def test_change_export_errors(self, db, tmp_path):
+        """Tests that change exports cannot be filtered and need change tracking"""
+        with patch('builtins.print') as mock_print:
+            db.export_expenses("csv", "category", "Food", output=str(tmp_path / "food.csv"), since_revision=0)
+            assert mock_print.call_args[0][0].startswith("An error occurred while exporting to CSV: A change export")
+
+            db.change_log = None
+            db.export_expenses("jsonl", output=str(tmp_path / "changes.jsonl"), since_revision=0)
+            assert mock_print.call_args[0][0] == "An error occurred while exporting to JSON lines: Change tracking is off, set EXPENSE_TRACKER_CHANGE_TRACKING=1"
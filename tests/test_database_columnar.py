@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import patch
+from src.database.database_columnar import ColumnarStore
+from src.database.database_index import ExpenseIndex
+
+class TestColumnarStore:
+    @pytest.fixture
+    def expenses(self):
+        """Provides a small expenses list in id order"""
+        return [
+            {"id": 1, "description": "Lunch", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1},
+            {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+            {"id": 3, "description": "Dinner", "amount": 20.0, "category": "food", "created_at": "2024-02-01T10:00:00", "month": 2}
+        ]
+
+    @pytest.fixture(params=["numpy", "array"])
+    def numpy_mode(self, request):
+        """Runs a test with and without the optional NumPy fast path"""
+        if request.param == "numpy":
+            pytest.importorskip("numpy")
+            yield
+        else:
+            with patch('src.database.database_columnar.numpy', None):
+                yield
+
+    def test_dictionary_encoded_categories(self, expenses):
+        """Tests that each distinct category name is stored once"""
+        store = ColumnarStore.from_expenses(expenses)
+        assert len(store) == 3
+        assert store.category_names == ["Food", "Travel", "food"]
+        assert list(store.categories) == [0, 1, 2]
+
+    def test_positions_and_totals(self, expenses, numpy_mode):
+        """Tests filtering and summing over the columns"""
+        store = ColumnarStore.from_expenses(expenses)
+        assert store.positions("month", 1) == [0, 1]
+        assert store.positions("category", "FOOD") == [0, 2]
+        assert store.total() == (32.5, 3)
+        assert store.total("category", "food") == (30.0, 2)
+        assert store.total("month", 12) == (0.0, 0)
+
+    def test_unknown_filter(self, expenses):
+        """Tests that unsupported filters raise a ValueError"""
+        with pytest.raises(ValueError, match="Unknown columnar filter"):
+            ColumnarStore.from_expenses(expenses).positions("weekday", 1)
+
+    def test_index_keeps_columns_aligned(self, expenses, numpy_mode):
+        """Tests that the columns follow inserts, swap-removes and updates of the index"""
+        index = ExpenseIndex(expenses, columnar=True)
+        index.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2})
+        index.remove(1)
+        index.update(index.get(2), "amount", 3.0)
+        index.update(index.get(3), "category", "Travel")
+
+        assert list(index.columnar.ids) == [expense["id"] for expense in expenses]
+        assert list(index.columnar.amounts) == [expense["amount"] for expense in expenses]
+        assert [expense["id"] for expense in index.scan("category", "travel")] == [2, 3, 4]
+        assert [expense["id"] for expense in index.scan("month", 2)] == [3, 4]
@@ -229,18 +229,556 @@ class TestDatabase:
         db = Database()
         db.database = sample_database_content
         
-        with patch('src.database.database_core.PrettyTable') as MockPrettyTable:  # Ensure this path is correct
+        with patch('prettytable.PrettyTable') as MockPrettyTable:  # Ensure this path is correct
             mock_table = MockPrettyTable.return_value
             db.list_expenses(filter="category", filter_value="Food")
             assert mock_table.add_row.called
 
+    def test_list_expenses_paging_and_sorting(self, sample_database_content, capsys):
+        """Tests limit, offset, cursor and sorted listing with streamed output"""
+        db = Database()
+        sample_database_content["expenses"] += [
+            {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+            {"id": 3, "description": "Dinner", "amount": 20.0, "category": "Food", "created_at": "2024-02-01T10:00:00", "month": 2}
+        ]
+        db.database = sample_database_content
+
+        def listed_ids(**options):
+            db.list_expenses(output_format="tsv", **options)
+            return [int(line.split("\t")[0]) for line in capsys.readouterr().out.splitlines()[1:]]
+
+        assert listed_ids(limit=2) == [1, 2]
+        assert listed_ids(offset=1, limit=1) == [2]
+        assert listed_ids(after_id=1) == [2, 3]
+        assert listed_ids(sort="amount") == [2, 3, 1]
+        assert listed_ids(sort="amount", descending=True, limit=2) == [1, 3]
+        assert listed_ids(sort="amount", offset=1, limit=1) == [3]
+
+        db.list_expenses("category", "Nothing", output_format="plain")
+        assert "No expenses found" in capsys.readouterr().out
+        with pytest.raises(ValueError, match="must not be negative"):
+            db.list_expenses(limit=-1)
+
+    def test_date_range_spans_years(self, sample_database_content, capsys):
+        """Tests that date-range listing and summaries tell the same month of different years apart"""
+        db = Database()
+        sample_database_content["expenses"] += [
+            {"id": 2, "description": "Old lunch", "amount": 7.0, "category": "Food", "created_at": "2023-01-05T12:00:00", "month": 1},
+            {"id": 3, "description": "Party", "amount": 30.0, "category": "Fun", "created_at": "2023-12-31T22:00:00", "month": 12}
+        ]
+        db.database = sample_database_content
+
+        db.list_expenses(output_format="tsv", date_from="2023-12-01", date_to="2024-01-31")
+        assert [line.split("\t")[0] for line in capsys.readouterr().out.splitlines()[1:]] == ["3", "1"]
+
+        db.list_expenses("month", "January", output_format="tsv", date_from="2024-01-01")
+        assert [line.split("\t")[0] for line in capsys.readouterr().out.splitlines()[1:]] == ["1"]
+
+        db.summary_expenses("Food", "category", date_to="2023-12-31")
+        assert "is 7.0$" in capsys.readouterr().out
+
+    def test_list_categories(self, sample_database_content, capsys):
+        """Tests that categories are listed once whatever their case, with counts and totals"""
+        db = Database()
+        sample_database_content["expenses"].append(
+            {"id": 2, "description": "Snack", "amount": 5.25, "category": "FOOD", "created_at": "2024-01-02T10:00:00", "month": 1}
+        )
+        db.database = sample_database_content
+
+        with patch('prettytable.PrettyTable') as MockPrettyTable:
+            db.list_categories()
+            MockPrettyTable.return_value.add_row.assert_called_once_with(["Food", 2, 55.25])
+
+        db.summary_expenses("food", "category")
+        assert "is 55.25$" in capsys.readouterr().out
+
+    def test_summary_by_groups(self, sample_database_content, capsys):
+        """Tests a grouped summary over a date range"""
+        db = Database()
+        sample_database_content["expenses"] += [
+            {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+            {"id": 3, "description": "Snack", "amount": 5.0, "category": "Food", "created_at": "2024-02-02T10:00:00", "month": 2}
+        ]
+        db.database = sample_database_content
+
+        with patch('prettytable.PrettyTable') as MockPrettyTable:
+            mock_table = MockPrettyTable.return_value
+            db.summary_by_groups(["month", "category"], [50], date_to="2024-01-31")
+            assert mock_table.field_names == ["month", "category", "count", "sum", "mean", "min", "max", "p50"]
+            assert mock_table.add_row.call_args_list == [
+                call(["January", "Food", 1, 50.0, 50.0, 50.0, 50.0, 50.0]),
+                call(["January", "Travel", 1, 2.5, 2.5, 2.5, 2.5, 2.5])
+            ]
+
+        db.summary_by_groups(["day"], date_from="2030-01-01")
+        assert "No expenses available." in capsys.readouterr().out
+
     def test_tablify(self, sample_database_content):
         """Tests table creation functionality"""
         db = Database()
         db.database = sample_database_content
         
-        with patch('src.database.database_core.PrettyTable') as MockPrettyTable:  # Correct the path
+        with patch('prettytable.PrettyTable') as MockPrettyTable:  # Correct the path
             mock_table = MockPrettyTable.return_value
             db.tablify(sample_database_content["expenses"])
             assert mock_table.field_names == ["id", "description", "amount", "category", "created_at"]
             mock_table.add_row.assert_called()
+
+    def test_replay_journal(self, sample_database_content, tmp_path):
+        """Tests that journal records are applied on top of the snapshot"""
+        added = {
+            "id": 2,
+            "description": "Journaled",
+            "amount": 10.0,
+            "category": "Travel",
+            "created_at": "2024-02-01T10:00:00",
+            "month": 2
+        }
+        records = [
+            {"op": "add", "expense": added},
+            {"op": "update", "id": 2, "field": "amount", "value": 12.5},
+            {"op": "delete", "id": 1},
+            {"op": "budget", "month": "February", "budget": 300},
+        ]
+        journal = tmp_path / "db.journal"
+        journal.write_text("".join(json.dumps(r) + "\n" for r in records) + '{"op": "ad', encoding="utf-8")
+
+        db = Database()
+        db.database = sample_database_content
+
+        assert db.replay_journal(journal) == 4
+        assert db.database["expenses"] == [dict(added, amount=12.5)]
+        assert db.database["monthly_budgets"][1]["budget"] == 300
+
+    def test_replay_journal_is_idempotent(self, sample_database_content, tmp_path):
+        """Tests that replaying records already in the snapshot does not duplicate them"""
+        journal = tmp_path / "db.journal"
+        journal.write_text(json.dumps({"op": "add", "expense": sample_database_content["expenses"][0]}) + "\n", encoding="utf-8")
+
+        db = Database()
+        db.database = sample_database_content
+        db.replay_journal(journal)
+
+        assert len(db.database["expenses"]) == 1
+
+    def test_index_follows_replaced_expenses(self, sample_database_content):
+        """Tests that the id index is rebuilt when the database document is replaced"""
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+
+        assert db.find_expense_by_id(1)["description"] == "Test Expense"
+        db.delete_an_expense(1)
+        with pytest.raises(ValueError, match="Expense with ID:1 not found"):
+            db.find_expense_by_id(1)
+
+    @patch('builtins.print')
+    def test_summary_expenses_by_month_name(self, mock_print, sample_database_content):
+        """Tests that month summaries accept the month name used on the command line"""
+        db = Database()
+        db.database = sample_database_content
+
+        db.summary_expenses("January", "month")
+        mock_print.assert_called_with("The sum of expenses for the given filter: month is 50.0$")
+
+    @patch('datetime.datetime')
+    def test_add_an_expense_budget_warning(self, mock_datetime, sample_database_content):
+        """Tests that the budget warning uses the running month total"""
+        mock_datetime.now.return_value.isoformat.return_value = "2024-01-01T10:00:00"
+        mock_datetime.now.return_value.month = 1
+
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+
+        with patch('builtins.print') as mock_print:
+            db.add_an_expense("Test", 75.0, "Food")
+            mock_print.assert_called_with("The current budget: 125.0 exceeds the monthly budget: 100 for this month: January")
+
+    def test_add_expenses_persists_once(self, sample_database_content):
+        """Tests that a batch of expenses gets consecutive ids and a single write"""
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+        db.id = 1
+
+        count, durable = db.add_expenses([
+            {"description": "Bus", "amount": "2.5", "category": "Travel", "created_at": "2024-02-01"},
+            {"description": "Taxi", "amount": 15, "category": "Travel"}
+        ])
+
+        assert count == 2
+        assert durable.done()
+        assert db.id == 3
+        assert [expense["id"] for expense in db.database["expenses"]] == [1, 2, 3]
+        assert db.find_expense_by_id(2)["month"] == 2
+        db.database_maker.commit.assert_called_once()
+        assert db.database_maker.commit.call_args[0][1]["op"] == "add_many"
+
+    def test_non_finite_amounts_are_rejected(self, sample_database_content, capsys):
+        """Tests that NaN never reaches the database through an add, an update or an import"""
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+
+        with pytest.raises(ValueError, match="Invalid expense record 1: Amount must be a finite number"):
+            db.add_expenses([{"description": "Bus", "amount": "nan", "category": "Travel"}])
+        db.update_an_expense_amount(1, float("nan"))
+        assert capsys.readouterr().out == "Amount must be a finite number\n"
+        assert db.find_expense_by_id(1)["amount"] == 50.0
+        db.database_maker.commit.assert_not_called()
+
+    def test_add_expenses_rejects_invalid_record(self, sample_database_content):
+        """Tests that an invalid record aborts the whole batch"""
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+
+        with pytest.raises(ValueError, match="Invalid expense record 2: Amount must be non-negative"):
+            db.add_expenses([
+                {"description": "Bus", "amount": 2.5, "category": "Travel"},
+                {"description": "Refund", "amount": -5, "category": "Travel"}
+            ])
+        assert len(db.database["expenses"]) == 1
+        db.database_maker.commit.assert_not_called()
+
+    @pytest.mark.parametrize("content, error", [
+        ('{"description": "Bus", "amount": 2.5, "category": "Travel"}\n{"description": "Taxi", "amount": 15, "category": 5}\n',
+         "Invalid expense record 2: the category must be a string"),
+        ('{"description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "yesterday"}\n', "Invalid expense record 1"),
+        ('{"description": "Bus", "amount": 2.5, "category": "Travel"}\n[1, 2]\n', "Record 2 is not an object"),
+        ('{"description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-10T12:00:00+05:00"}\n',
+         "Invalid expense record 1: created_at 2024-01-10T12:00:00+05:00 has a UTC offset"),
+    ])
+    def test_import_invalid_jsonl_leaves_database_untouched(self, content, error, sample_database_content, tmp_path):
+        """Tests that a badly typed or malformed JSON-lines record is rejected before anything is stored"""
+        import_file = tmp_path / "bank.jsonl"
+        import_file.write_text(content, encoding="utf-8")
+
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+        db.id = 1
+
+        with patch('builtins.print') as mock_print:
+            db.import_expenses(import_file)
+            assert mock_print.call_args[0][0].startswith(f"An error occurred while importing expenses: {error}")
+        assert db.get_store().total() == (50.0, 1)
+        assert db.id == 1
+        db.database_maker.commit.assert_not_called()
+
+    @pytest.mark.parametrize("file_name, content", [
+        ("bank.csv", "date,description,amount,category,created_at\n1,Bus,2.5,Travel,2024-02-01T08:00:00\n2,Taxi,15,Travel,\n"),
+        ("bank.jsonl", '{"description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-02-01T08:00:00"}\n\n'
+                       '{"description": "Taxi", "amount": 15, "category": "Travel"}\n'),
+    ])
+    def test_import_expenses(self, file_name, content, sample_database_content, tmp_path):
+        """Tests importing CSV and JSON-lines files"""
+        import_file = tmp_path / file_name
+        import_file.write_text(content, encoding="utf-8")
+
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+        db.id = 1
+
+        with patch('builtins.print') as mock_print:
+            db.import_expenses(import_file)
+            mock_print.assert_called_with(f"2 expenses have been imported from {import_file}")
+        assert db.find_expense_by_id(2)["created_at"] == "2024-02-01T08:00:00"
+        assert db.find_expense_by_id(3)["amount"] == 15.0
+
+    def test_imported_dates_are_normalized(self, sample_database_content, tmp_path, capsys):
+        """Tests that other ISO spellings of created_at are stored canonically, so date ranges find them"""
+        import_file = tmp_path / "bank.csv"
+        import_file.write_text("description,amount,category,created_at\nBus,2.5,Travel,2024-01-10 12:00\n"
+                               "Taxi,15,Travel,2024-01-08T10:00\nTrain,30,Travel,2024-02-01\n", encoding="utf-8")
+        db = Database()
+        db.database = sample_database_content
+        db.database_maker = Mock()
+        db.id = 1
+
+        db.import_expenses(import_file)
+        assert [db.find_expense_by_id(id)["created_at"] for id in (2, 3, 4)] == [
+            "2024-01-10T12:00:00", "2024-01-08T10:00:00", "2024-02-01T00:00:00"
+        ]
+        assert [expense["id"] for expense in db.select_expenses(date_from="2024-01-01", date_to="2024-01-31")] == [1, 3, 2]
+
+    @patch('builtins.print')
+    def test_import_expenses_missing_file(self, mock_print, tmp_path):
+        """Tests that a missing import file is reported"""
+        db = Database()
+        db.import_expenses(tmp_path / "missing.csv")
+        assert mock_print.call_args[0][0].startswith("An error occurred while importing expenses:")
+
+    def test_export_expenses_filtered_to_path(self, sample_database_content, tmp_path):
+        """Tests that a filtered export is written from memory to the given path"""
+        db = Database()
+        db.database = sample_database_content
+        db.database["expenses"].append(dict(sample_database_content["expenses"][0], id=2, category="Travel", month=2))
+        output = tmp_path / "food.csv"
+
+        with patch('json.load') as mock_json_load:
+            db.export_expenses("csv", "category", "food", output=str(output))
+            mock_json_load.assert_not_called()
+
+        rows = list(csv.reader(output.read_text().splitlines()))
+        assert rows[0] == ["id", "description", "amount", "category", "created_at", "month"]
+        assert [row[0] for row in rows[1:]] == ["1"]
+
+    def test_export_expenses_gzip(self, sample_database_content, tmp_path):
+        """Tests that compressed exports get a .gz suffix and valid gzip content"""
+        import gzip
+        db = Database()
+        db.database = sample_database_content
+
+        with patch('builtins.print') as mock_print:
+            db.export_expenses("csv", "month", "January", output=str(tmp_path / "january.csv"), compress=True)
+            mock_print.assert_called_with(f"The expense database has been exported to a CSV to {tmp_path / 'january.csv.gz'}")
+
+        with gzip.open(tmp_path / "january.csv.gz", 'rt') as data_file:
+            assert len(list(csv.reader(data_file))) == 2
+
+    def test_export_expenses_stdout(self, sample_database_content, capsys):
+        """Tests exporting to stdout"""
+        db = Database()
+        db.database = sample_database_content
+
+        db.export_expenses("csv", output="-")
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == ["id,description,amount,category,created_at,month", "1,Test Expense,50.0,Food,2024-01-01T10:00:00,1"]
+
+
+class TestDatabasePaths:
+    @pytest.fixture(autouse=True)
+    def json_storage(self):
+        """Opens databases by path in json mode without group commit, and closes them afterwards"""
+        with patch('src.database.database_core.STORAGE_MODE', "json"), \
+                patch('src.database.database_core.GROUP_COMMIT_INTERVAL_MS', 0):
+            yield
+            for database in list(Database.open_databases.values()):
+                database.close()
+
+    def test_databases_are_separate_from_the_default(self, tmp_path):
+        """Tests that every path gets its own database with its files next to it, and the default stays shared"""
+        with patch('builtins.print'):
+            first = Database(path=tmp_path / "first.json")
+            second = Database(path=str(tmp_path / "second.json"))
+            first.add_an_expense("Lunch", 10.0, "Food")
+
+        assert first is not second and first is not Database.instance
+        assert first.lock_file_path == tmp_path / "first.lock"
+        assert first.find_expense_by_id(1)["description"] == "Lunch"
+        with pytest.raises(ValueError, match="not found"):
+            second.find_expense_by_id(1)
+        assert len(json.loads((tmp_path / "first.json").read_text())["expenses"]) == 1
+
+    @pytest.mark.parametrize("storage_mode", ["json", "sqlite", "binary"])
+    def test_categories_fold_beyond_ascii(self, storage_mode, tmp_path):
+        """Tests that every backend folds the case of non-ASCII letters in categories"""
+        with patch('src.database.database_core.STORAGE_MODE', storage_mode), patch('builtins.print'):
+            db = Database(path=tmp_path / "db.json")
+            db.add_an_expense("Lunch", 20.0, "Étel")
+            db.add_an_expense("Snack", 1.0, "étel")
+
+            assert db.total_expenses("ÉTEL", "category") == (21.0, 2)
+            assert [expense["id"] for expense in db.select_expenses("category", "étel")] == [1, 2]
+            with patch('prettytable.PrettyTable') as MockPrettyTable:
+                db.list_categories()
+                MockPrettyTable.return_value.add_row.assert_called_once_with(["Étel", 2, 21.0])
+
+    @pytest.mark.parametrize("storage_mode", ["json", "sqlite", "binary"])
+    def test_category_named_after_its_lowest_id(self, storage_mode, tmp_path):
+        """Tests that every backend lists a category under the spelling of its expense with the lowest id"""
+        with patch('src.database.database_core.STORAGE_MODE', storage_mode), patch('builtins.print'):
+            db = Database(path=tmp_path / "db.json")
+            for category in ["food", "Food", "FOOD"]:
+                db.add_an_expense("Lunch", 10.0, category)
+            db.update_an_expense_category(1, "fOOD")
+            db.delete_an_expense(3)
+
+            with patch('prettytable.PrettyTable') as MockPrettyTable:
+                db.list_categories()
+                MockPrettyTable.return_value.add_row.assert_called_once_with(["fOOD", 2, 20.0])
+
+    def test_snapshot_stays_in_id_order(self, tmp_path):
+        """Tests that deletes do not reorder the expenses written to db.json"""
+        db = Database(path=tmp_path / "db.json")
+        db.add_expenses([{"description": f"Expense {number}", "amount": 1.0, "category": "Food"} for number in range(4)])
+        db.remove_expense(1)
+
+        content = json.loads((tmp_path / "db.json").read_text())
+        assert [expense["id"] for expense in content["expenses"]] == [2, 3, 4]
+
+    def test_open_databases_are_cached(self, tmp_path):
+        """Tests that opening a path again reuses the loaded database"""
+        db = Database(path=tmp_path / "db.json")
+        with patch.object(Database, 'load_db_from_file') as mock_load:
+            assert Database(path=tmp_path / "." / "db.json") is db
+            mock_load.assert_not_called()
+        assert list(Database.open_databases) == [tmp_path / "db.json"]
+
+    def test_cached_database_reloads_when_the_file_changes(self, tmp_path):
+        """Tests that a cached database picks up what another process wrote to its file"""
+        db = Database(path=tmp_path / "db.json")
+        content = json.loads((tmp_path / "db.json").read_text())
+        content["expenses"].append({"id": 1, "description": "Taxi", "amount": 20.0, "category": "Travel", "created_at": "2024-01-01T10:00:00", "month": 1})
+        (tmp_path / "db.json").write_text(json.dumps(content))
+
+        assert Database(path=tmp_path / "db.json") is db
+        assert db.find_expense_by_id(1)["description"] == "Taxi"
+        assert db.id == 1
+
+    def test_least_recently_used_database_is_closed(self, tmp_path):
+        """Tests that the cache is bounded and closes the database it drops"""
+        with patch('src.database.database_core.OPEN_DATABASES_LIMIT', 2):
+            first = Database(path=tmp_path / "first.json")
+            second = Database(path=tmp_path / "second.json")
+            Database(path=tmp_path / "first.json")
+            Database(path=tmp_path / "third.json")
+
+        assert list(Database.open_databases.values())[0] is first
+        assert second not in Database.open_databases.values()
+        assert second.state == States.INACTIVE
+        assert second.file_lock.fd is None
+
+    @pytest.mark.parametrize("storage_mode", ["json", "sqlite"])
+    def test_evicted_database_refuses_to_work(self, storage_mode, tmp_path):
+        """Tests that a database evicted from the cache fails clearly, without locking its files, until opened again"""
+        with patch('src.database.database_core.STORAGE_MODE', storage_mode), \
+                patch('src.database.database_core.OPEN_DATABASES_LIMIT', 1), \
+                patch('builtins.print'):
+            evicted = Database(path=tmp_path / "first.json")
+            Database(path=tmp_path / "second.json")
+
+            with pytest.raises(ValueError, match="has been closed"):
+                evicted.add_an_expense("Lunch", 10.0, "Food")
+            with pytest.raises(ValueError, match="has been closed"):
+                evicted.find_expense_by_id(1)
+            assert not evicted.file_lock.locked
+
+            reopened = Database(path=tmp_path / "first.json")
+            assert reopened is not evicted
+            assert reopened.create_expense("Lunch", 10.0, "Food")[0]["id"] == 1
+
+    def test_close_and_context_manager(self, tmp_path):
+        """Tests that closing writes pending mutations and that the next open loads the file again"""
+        with Database(path=tmp_path / "db.json") as db:
+            db.enable_group_commit(60_000)
+            with patch('builtins.print'):
+                db.add_an_expense("Lunch", 10.0, "Food")
+
+        assert db.state == States.INACTIVE
+        assert db.writer is None
+        assert not Database.open_databases
+        reopened = Database(path=tmp_path / "db.json")
+        assert reopened is not db
+        assert reopened.find_expense_by_id(1)["description"] == "Lunch"
+
+    @pytest.mark.parametrize("storage_mode", ["json", "journal", "sqlite", "binary"])
+    def test_ids_of_deleted_expenses_are_not_reused(self, storage_mode, tmp_path):
+        """Tests that an expense added after deleting the last one gets a new id, also once the files are reloaded"""
+        with patch('src.database.database_core.STORAGE_MODE', storage_mode), \
+                patch('src.database.database_maker.STORAGE_MODE', storage_mode), \
+                patch('builtins.print'):
+            db = Database(path=tmp_path / "db.json")
+            db.add_expenses([{"description": "Lunch", "amount": 10.0, "category": "Food"},
+                             {"description": "Bus", "amount": 2.5, "category": "Travel"}])
+            db.delete_an_expense(2)
+            db.add_an_expense("Taxi", 20.0, "Travel")
+            db.delete_an_expense(3)
+            db.close()
+
+            with Database(path=tmp_path / "db.json") as reopened:
+                expense, _ = reopened.create_expense("Dinner", 30.0, "Food")
+                assert expense["id"] == 4
+                reopened.delete_an_expense(4)
+                if storage_mode == "journal":
+                    reopened.database_maker.compact(reopened.database)
+            with Database(path=tmp_path / "db.json") as reopened:
+                assert reopened.create_expense("Snack", 5.0, "Food")[0]["id"] == 5
+
+    def test_failed_reload_releases_the_lock(self, tmp_path):
+        """Tests that a mutation whose reload fails leaves the lock file free for the next writer"""
+        with patch('builtins.print'):
+            db = Database(path=tmp_path / "db.json")
+            with patch.object(db, 'refresh', side_effect=ValueError("Corrupt database")):
+                with pytest.raises(ValueError, match="Corrupt database"):
+                    db.create_expense("Lunch", 10.0, "Food")
+            assert not db.file_lock.locked
+
+            db.close()
+            with Database(path=tmp_path / "db.json") as reopened:
+                assert reopened.create_expense("Lunch", 10.0, "Food")[0]["id"] == 1
+
+    def test_closing_the_default_database(self, tmp_path):
+        """Tests that Database() loads a new default database once the old one is closed"""
+        Database.instance = None
+        with patch.object(Database, 'db_file_path', tmp_path / "db.json"), \
+                patch.object(Database, 'journal_file_path', tmp_path / "db.journal"), \
+                patch.object(Database, 'lock_file_path', tmp_path / "db.lock"):
+            db = Database()
+            db.close()
+            assert Database.instance is None
+            assert Database() is not db
+            Database.instance.close()
+
+
+class TestDatabaseReload:
+    @pytest.fixture
+    def databases(self, tmp_path):
+        """Opens the same journaled files as the default database and by path, standing in for two processes"""
+        Database.instance = None
+        with patch('src.database.database_core.STORAGE_MODE', "journal"), \
+                patch('src.database.database_maker.STORAGE_MODE', "journal"), \
+                patch('src.database.database_core.GROUP_COMMIT_INTERVAL_MS', 0), \
+                patch.object(Database, 'db_file_path', tmp_path / "db.json"), \
+                patch.object(Database, 'journal_file_path', tmp_path / "db.journal"), \
+                patch.object(Database, 'lock_file_path', tmp_path / "db.lock"), \
+                patch('builtins.print'):
+            writer = Database()
+            reader = Database(path=tmp_path / "db.json")
+            yield writer, reader
+            reader.close()
+            writer.close()
+
+    def test_unchanged_files_are_not_reloaded(self, databases):
+        """Tests that reads and the process's own writes do not reload anything"""
+        writer, reader = databases
+        writer.add_an_expense("Lunch", 10.0, "Food")
+        with patch.object(Database, 'refresh') as mock_refresh:
+            writer.find_expense_by_id(1)
+            writer.summary_expenses()
+            mock_refresh.assert_not_called()
+
+    def test_reads_apply_the_journal_tail(self, databases):
+        """Tests that a long-lived database applies what another process appended, without reading db.json again"""
+        writer, reader = databases
+        writer.add_an_expense("Lunch", 10.0, "Food")
+        reader.find_expense_by_id(1)
+        writer.add_expenses([{"description": "Bus", "amount": 2.5, "category": "Travel"}])
+        writer.update_an_expense_category(1, "Groceries")
+        writer.set_budget_for_a_month("March", 300)
+        writer.delete_an_expense(2)
+        writer.add_an_expense("Taxi", 20.0, "Travel")
+
+        with patch.object(Database, 'load_db_from_file') as mock_load:
+            assert reader.find_expense_by_id(1)["category"] == "Groceries"
+            mock_load.assert_not_called()
+        with pytest.raises(ValueError, match="not found"):
+            reader.find_expense_by_id(2)
+        assert reader.total_expenses("Travel", "category") == (20.0, 1)
+        assert reader.database["monthly_budgets"][2]["budget"] == 300
+        assert reader.id == 3
+        assert reader.database_maker.journal_entries == 6
+
+    def test_compaction_reloads_everything(self, databases):
+        """Tests that a rewritten db.json is loaded from scratch"""
+        writer, reader = databases
+        writer.add_an_expense("Lunch", 10.0, "Food")
+        writer.database_maker.compact(writer.database)
+        writer.disk_version = writer.get_disk_version()
+        writer.add_an_expense("Bus", 2.5, "Travel")
+
+        assert reader.total_expenses() == (12.5, 2)
+        assert reader.find_expense_by_id(2)["description"] == "Bus"
@@ -0,0 +1,51 @@
+import pytest
+from src.database.database_dates import CreatedAtIndex, date_bounds
+
+class TestDateBounds:
+    def test_dates_cover_whole_days(self):
+        """Tests that a date-only upper bound includes the whole day"""
+        assert date_bounds("2023-12-01", "2024-01-31") == ("2023-12-01", "2024-02-01")
+
+    def test_datetimes(self):
+        """Tests that a datetime upper bound includes that instant"""
+        start, end = date_bounds("2024-01-01T08:00:00", "2024-01-01T10:00:00")
+        assert start == "2024-01-01T08:00:00"
+        assert "2024-01-01T10:00:00" < end < "2024-01-01T10:00:01"
+
+    def test_open_ranges(self):
+        """Tests that either side of the range can be left open"""
+        assert date_bounds() == (None, None)
+        assert date_bounds(date_to="2024-12-31") == (None, "2025-01-01")
+
+    def test_invalid_ranges(self):
+        """Tests that malformed dates and reversed ranges raise a ValueError"""
+        with pytest.raises(ValueError, match="Invalid date"):
+            date_bounds("31/01/2024")
+        with pytest.raises(ValueError, match="is empty"):
+            date_bounds("2024-02-01", "2024-01-01")
+
+class TestCreatedAtIndex:
+    @pytest.fixture
+    def index(self):
+        """Provides an index over expenses spanning two years, out of id order"""
+        return CreatedAtIndex.from_expenses([
+            {"id": 1, "created_at": "2024-01-15T10:00:00"},
+            {"id": 2, "created_at": "2023-01-20T10:00:00"},
+            {"id": 3, "created_at": "2023-12-31T23:59:59"},
+            {"id": 4, "created_at": "2024-01-15T10:00:00"}
+        ])
+
+    def test_range(self, index):
+        """Tests that ranges respect the year and come back in created_at order"""
+        assert index.between("2024-01-01", "2024-02-01") == [1, 4]
+        assert index.between("2023-12-01", "2024-02-01") == [3, 1, 4]
+        assert index.between(end="2023-12-31") == [2]
+        assert index.between() == [2, 3, 1, 4]
+
+    def test_insert_and_remove(self, index):
+        """Tests that the keys stay sorted through mutations"""
+        index.insert({"id": 5, "created_at": "2023-06-01T00:00:00"})
+        index.remove({"id": 1, "created_at": "2024-01-15T10:00:00"})
+        index.remove({"id": 99, "created_at": "2024-01-15T10:00:00"})
+        assert index.between() == [2, 5, 3, 4]
+        assert len(index) == 4
@@ -0,0 +1,120 @@
+import pytest
+from src.database.database_index import ExpenseIndex
+
+class TestExpenseIndex:
+    @pytest.fixture
+    def expenses(self):
+        """Provides a small expenses list in id order"""
+        return [
+            {"id": 1, "description": "Lunch", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1},
+            {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+            {"id": 3, "description": "Dinner", "amount": 20.0, "category": "Food", "created_at": "2024-02-01T10:00:00", "month": 2}
+        ]
+
+    @pytest.fixture
+    def index(self, expenses):
+        return ExpenseIndex(expenses)
+
+    def test_build(self, index, expenses):
+        """Tests that the index maps every id to its record and position"""
+        assert index.is_built_for(expenses)
+        assert index.get(2) is expenses[1]
+        assert index.ids == [1, 2, 3]
+        assert index.position(2) == 1
+        assert index.get(99) is None
+
+    def test_insert(self, index, expenses):
+        """Tests that inserted expenses are appended and indexed"""
+        expense = {"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2}
+        index.insert(expense)
+        assert expenses[-1] is expense
+        assert index.get(4) is expense
+        assert index.position(4) == 3
+
+    def test_remove_from_middle(self, index, expenses):
+        """Tests that removing a record keeps the others in id order"""
+        removed = index.remove(1)
+        assert removed["id"] == 1
+        assert [expense["id"] for expense in expenses] == [2, 3]
+        assert index.ids == [2, 3]
+        assert index.get(1) is None
+
+    def test_remove_last(self, index, expenses):
+        """Tests that removing the last record simply pops it"""
+        index.remove(3)
+        assert [expense["id"] for expense in expenses] == [1, 2]
+        assert index.ids == [1, 2]
+
+    def test_remove_unknown_id(self, index, expenses):
+        """Tests that removing an unknown id leaves the list untouched"""
+        assert index.remove(99) is None
+        assert len(expenses) == 3
+
+    def test_totals_after_build(self, index):
+        """Tests that running totals are computed per month, category and both"""
+        assert index.total() == (32.5, 3)
+        assert index.total("month", 1) == (12.5, 2)
+        assert index.total("category", "Food") == (30.0, 2)
+        assert index.total("month_category", (2, "Food")) == (20.0, 1)
+        assert index.total("category", "Unknown") == (0.0, 0)
+
+    def test_totals_follow_mutations(self, index):
+        """Tests that insert, remove and update adjust the running totals"""
+        index.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2})
+        assert index.total("month", 2) == (35.0, 2)
+
+        index.remove(2)
+        assert index.total("category", "Travel") == (15.0, 1)
+        assert index.total("month", 1) == (10.0, 1)
+
+        index.update(index.get(1), "category", "Travel")
+        assert index.total("category", "Food") == (20.0, 1)
+        assert index.total("month_category", (1, "Travel")) == (10.0, 1)
+
+        index.update(index.get(3), "amount", 5.0)
+        assert index.total() == (30.0, 3)
+
+    def test_unknown_total_filter(self, index):
+        """Tests that an unsupported filter raises a ValueError"""
+        with pytest.raises(ValueError, match="Unknown total filter"):
+            index.total("weekday", 1)
+
+    def test_list_stays_in_id_order(self, index, expenses):
+        """Tests that out-of-order inserts keep the list in id order, and that build() sorts a list loaded out of order"""
+        index.remove(1)
+        index.insert({"id": 1, "description": "Lunch", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1})
+        assert [expense["id"] for expense in expenses] == [1, 2, 3]
+        assert [expense["id"] for expense in index.scan("category", "FOOD")] == [1, 3]
+
+        unordered = [expenses[2], expenses[0], expenses[1]]
+        rebuilt = ExpenseIndex(unordered)
+        assert [expense["id"] for expense in unordered] == [1, 2, 3]
+        assert rebuilt.ids == [1, 2, 3]
+
+    def test_scan_after_id(self, index):
+        """Tests that cursor scans only return expenses with a greater id"""
+        assert [expense["id"] for expense in index.scan(after_id=1)] == [2, 3]
+        assert [expense["id"] for expense in index.scan("category", "Food", after_id=1)] == [3]
+        index.remove(1)
+        assert [expense["id"] for expense in index.scan(after_id=2)] == [3]
+
+    def test_scan_range(self, index):
+        """Tests date-range scans in created_at order, following mutations"""
+        assert [expense["id"] for expense in index.scan_range("2024-01-01", "2024-01-31")] == [1, 2]
+        index.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2023-12-31T10:00:00", "month": 12})
+        index.remove(2)
+        assert [expense["id"] for expense in index.scan_range(end="2024-01-31")] == [4, 1]
+        assert [expense["id"] for expense in index.scan_range("2024-02-01")] == [3]
+
+    def test_categories_ignore_case(self, index):
+        """Tests that category totals, scans and the summary agree on case folding"""
+        index.insert({"id": 4, "description": "Snack", "amount": 5.0, "category": "FOOD", "created_at": "2024-02-02T10:00:00", "month": 2})
+        assert index.total("category", "food") == (35.0, 3)
+        assert index.total("month_category", (2, "Food")) == (25.0, 2)
+        assert [expense["id"] for expense in index.scan("category", "fOOd")] == [1, 3, 4]
+        assert index.category_summary() == [("Food", 3, 35.0), ("Travel", 1, 2.5)]
+
+        index.update(index.get(2), "category", "food")
+        index.remove(1)
+        assert [expense["id"] for expense in index.scan("category", "Food")] == [2, 3, 4]
+        assert index.category_summary() == [("food", 3, 27.5)]
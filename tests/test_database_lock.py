@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from src.database.database_lock import FileLock, file_signature
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+ADD_EXPENSES = """
+import sys
+from pathlib import Path
+from src.database.database_core import Database
+
+directory = Path(sys.argv[1])
+Database.db_file_path = directory / "db.json"
+Database.journal_file_path = directory / "db.journal"
+Database.lock_file_path = directory / "db.lock"
+db = Database()
+for number in range(int(sys.argv[2])):
+    db.add_an_expense(f"Expense {number}", 1.0, "Food")
+"""
+
+class TestFileLock:
+    def test_file_signature(self, tmp_path):
+        """Tests that the signature tracks size changes and missing files"""
+        file_path = tmp_path / "db.json"
+        assert file_signature(file_path) is None
+
+        file_path.write_text("{}", encoding="utf-8")
+        signature = file_signature(file_path)
+        file_path.write_text("{} ", encoding="utf-8")
+        assert file_signature(file_path) != signature
+
+    def test_lock_is_reusable(self, tmp_path):
+        """Tests that the lock file is created once and can be locked repeatedly"""
+        lock = FileLock(tmp_path / "db.lock")
+        with lock:
+            assert (tmp_path / "db.lock").is_file()
+        with lock:
+            pass
+        lock.close()
+        assert lock.fd is None
+
+    def test_concurrent_processes_do_not_lose_expenses(self, tmp_path):
+        """
+        Tests that processes adding expenses at the same time each see the
+        others' writes, so no record is lost and no id is handed out twice.
+        """
+        workers = [
+            subprocess.Popen([sys.executable, "-c", ADD_EXPENSES, str(tmp_path), "15"],
+                             cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL)
+            for _ in range(4)
+        ]
+        assert all(worker.wait() == 0 for worker in workers)
+
+        database = json.loads((tmp_path / "db.json").read_text(encoding="utf-8"))
+        ids = [expense["id"] for expense in database["expenses"]]
+        assert sorted(ids) == list(range(1, 61))
@@ -1,5 +1,6 @@
 import pytest
 import json
+import time
 from unittest.mock import mock_open, patch, MagicMock
 from pathlib import Path
 from src.database.database_maker import DatabaseMaker, DATABASE_STRUCTURE, DB_FILE_PATH
@@ -112,4 +113,164 @@ class TestDatabaseMaker:
 
         # Verify expenses list exists and is empty
         assert isinstance(DATABASE_STRUCTURE['expenses'], list)
-        assert len(DATABASE_STRUCTURE['expenses']) == 0
\ No newline at end of file
+        assert len(DATABASE_STRUCTURE['expenses']) == 0
+
+class TestDatabaseMakerJournal:
+    @pytest.fixture
+    def journaled_maker(self, tmp_path):
+        """Creates a journaled DatabaseMaker writing into a temporary directory"""
+        return DatabaseMaker(
+            db_file_path=tmp_path / "db.json",
+            journal_file_path=tmp_path / "db.journal",
+            journaled=True
+        )
+
+    def test_commit_appends_to_journal(self, journaled_maker):
+        """
+        Tests that a journaled commit only appends the mutation record
+        and leaves the snapshot untouched.
+        """
+        record = {"op": "delete", "id": 1}
+        journaled_maker.commit({"expenses": []}, record)
+        journaled_maker.commit({"expenses": []}, record)
+
+        lines = journaled_maker.journal_file_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [record, record]
+        assert journaled_maker.journal_entries == 2
+        assert not journaled_maker.is_db_file_exists()
+
+    def test_commit_many_appends_batch_with_one_sync(self, journaled_maker):
+        """
+        Tests that a batch of mutation records is appended in order
+        and synced to the disk once.
+        """
+        records = [{"op": "delete", "id": id} for id in range(3)]
+        with patch('src.database.database_maker.os.fsync') as mock_fsync:
+            journaled_maker.commit_many({"expenses": []}, records)
+
+        lines = journaled_maker.journal_file_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == records
+        assert journaled_maker.journal_entries == 3
+        assert mock_fsync.call_count == 1
+
+    def test_commit_compacts_at_threshold(self, journaled_maker):
+        """
+        Tests that reaching the compaction threshold writes a fresh snapshot
+        and removes the journal.
+        """
+        database = {"expenses": [{"id": 1}]}
+        with patch('src.database.database_maker.JOURNAL_COMPACT_THRESHOLD', 2):
+            journaled_maker.commit(database, {"op": "delete", "id": 2})
+            journaled_maker.commit(database, {"op": "delete", "id": 3})
+
+        assert json.loads(journaled_maker.db_file_path.read_text(encoding="utf-8")) == database
+        assert not journaled_maker.is_journal_file_exists()
+        assert journaled_maker.journal_entries == 0
+
+    def test_commit_without_journal_rewrites_and_clears_journal(self, journaled_maker):
+        """
+        Tests that a non-journaled commit rewrites the snapshot and drops
+        a journal left behind by a previous journaled run.
+        """
+        journaled_maker.append_to_journal({"op": "delete", "id": 1})
+        journaled_maker.journaled = False
+
+        database = {"expenses": []}
+        journaled_maker.commit(database, {"op": "delete", "id": 2})
+
+        assert json.loads(journaled_maker.db_file_path.read_text(encoding="utf-8")) == database
+        assert not journaled_maker.is_journal_file_exists()
+
+class TestDatabaseMakerDurability:
+    @pytest.fixture
+    def make_maker(self, tmp_path):
+        """Creates journaled DatabaseMakers with a given durability policy in a temporary directory"""
+        makers = []
+        def make(durability):
+            maker = DatabaseMaker(
+                db_file_path=tmp_path / "db.json",
+                journal_file_path=tmp_path / "db.journal",
+                journaled=True,
+                durability=durability
+            )
+            makers.append(maker)
+            return maker
+        yield make
+        for maker in makers:
+            maker.close_journal()
+
+    def test_failed_write_keeps_previous_database(self, make_maker):
+        """
+        Tests that a write failing halfway through leaves the previous
+        database intact instead of a truncated file.
+        """
+        maker = make_maker("always")
+        maker.update_an_existing_db({"expenses": [1]})
+
+        with patch('src.database.database_maker.os.fsync', side_effect=OSError("Disk full")):
+            assert maker.update_an_existing_db({"expenses": [2]}) is False
+
+        assert json.loads(maker.db_file_path.read_text(encoding="utf-8")) == {"expenses": [1]}
+
+    def test_write_replaces_database_through_temporary_file(self, make_maker):
+        """
+        Tests that the snapshot is fsynced before it replaces db.json
+        and that no temporary file is left behind.
+        """
+        maker = make_maker("always")
+        with patch('src.database.database_maker.os.fsync') as mock_fsync:
+            maker.update_an_existing_db({"expenses": []})
+
+        assert mock_fsync.called
+        assert json.loads(maker.db_file_path.read_text(encoding="utf-8")) == {"expenses": []}
+        assert [path.name for path in maker.db_file_path.parent.iterdir()] == ["db.json"]
+
+    def test_always_fsyncs_every_append(self, make_maker):
+        """
+        Tests that the "always" policy fsyncs the journal after each append.
+        """
+        maker = make_maker("always")
+        with patch('src.database.database_maker.os.fsync') as mock_fsync:
+            maker.append_to_journal({"op": "delete", "id": 1})
+            maker.append_to_journal({"op": "delete", "id": 2})
+
+        assert mock_fsync.call_count == 2
+
+    def test_exit_fsyncs_only_on_close(self, make_maker):
+        """
+        Tests that the "exit" policy leaves appends in the page cache
+        and fsyncs them once when the maker is closed.
+        """
+        maker = make_maker("exit")
+        with patch('src.database.database_maker.os.fsync') as mock_fsync:
+            maker.append_to_journal({"op": "delete", "id": 1})
+            maker.append_to_journal({"op": "delete", "id": 2})
+            assert mock_fsync.call_count == 0
+            maker.close()
+
+        assert mock_fsync.call_count == 1
+        assert len(maker.journal_file_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_interval_batches_appends_into_one_fsync(self, make_maker):
+        """
+        Tests that appends within the interval share a single scheduled fsync.
+        """
+        maker = make_maker("interval")
+        with patch('src.database.database_maker.DURABILITY_INTERVAL_MS', 200), \
+                patch('src.database.database_maker.os.fsync') as mock_fsync:
+            maker.last_sync = time.monotonic()
+            maker.append_to_journal({"op": "delete", "id": 1})
+            maker.append_to_journal({"op": "delete", "id": 2})
+            timer = maker.sync_timer
+            assert mock_fsync.call_count == 0
+            timer.join()
+
+        assert mock_fsync.call_count == 1
+        assert maker.sync_timer is None
+
+    def test_unknown_policy_is_rejected(self, tmp_path):
+        """
+        Tests that an unknown durability policy raises a ValueError.
+        """
+        with pytest.raises(ValueError, match="Unknown durability policy"):
+            DatabaseMaker(db_file_path=tmp_path / "db.json", durability="sometimes")
@@ -0,0 +1,53 @@
+import io
+import json
+import pytest
+from src.database.database_render import render_expenses
+
+class TestRenderExpenses:
+    @pytest.fixture
+    def expenses(self):
+        """Provides expenses in id order"""
+        return [
+            {"id": 1, "description": "Lunch\tout", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1},
+            {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1}
+        ]
+
+    def test_tsv(self, expenses):
+        """Tests the header row and that tabs inside fields are replaced"""
+        stream = io.StringIO()
+        assert render_expenses(expenses, "tsv", stream) == 2
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "id\tdescription\tamount\tcategory\tcreated_at"
+        assert lines[1] == "1\tLunch out\t10.0\tFood\t2024-01-01T10:00:00"
+
+    def test_jsonl(self, expenses):
+        """Tests one JSON document per expense"""
+        stream = io.StringIO()
+        render_expenses(expenses, "jsonl", stream)
+        assert [json.loads(line) for line in stream.getvalue().splitlines()] == expenses
+
+    def test_plain(self, expenses):
+        """Tests aligned plain text lines"""
+        stream = io.StringIO()
+        render_expenses(expenses, "plain", stream)
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 2
+        assert lines[1].split() == ["2", "2024-01-02T10:00:00", "2.50", "Travel", "Bus"]
+
+    def test_streams_lazily(self, expenses):
+        """Tests that each row is written before the next expense is read"""
+        stream = io.StringIO()
+        written = []
+
+        def produce():
+            for expense in expenses:
+                written.append(stream.getvalue().count("\n"))
+                yield expense
+
+        render_expenses(produce(), "jsonl", stream)
+        assert written == [0, 1]
+
+    def test_unknown_format(self, expenses):
+        """Tests that an unsupported format raises a ValueError"""
+        with pytest.raises(ValueError, match="Unknown output format"):
+            render_expenses(expenses, "xml")
@@ -0,0 +1,64 @@
+import json
+import pytest
+from src.database.database_report import report
+
+class TestReport:
+    @pytest.fixture
+    def database_files(self, tmp_path):
+        """Writes one database file per year"""
+        files = []
+        for year, amounts in ((2023, [1.0, 2.0, 3.0]), (2024, [4.0, 5.0])):
+            database = {
+                "name": "Expense Tracker Database",
+                "monthly_budgets": [],
+                "expenses": [
+                    {"id": number, "description": f"Expense {number}", "amount": amount, "category": "Food" if number % 2 else "Rent",
+                     "created_at": f"{year}-0{number}-01T10:00:00", "month": number}
+                    for number, amount in enumerate(amounts, 1)
+                ]
+            }
+            file_path = tmp_path / f"{year}.json"
+            file_path.write_text(json.dumps(database), encoding="utf-8")
+            files.append(file_path)
+        return files
+
+    def test_merges_files(self, database_files):
+        """Tests that the partial summaries of every file are merged"""
+        summary = report(database_files, ["year", "category"], percentiles=[])
+        assert [row[:4] for row in summary.rows()] == [
+            [2023, "Food", 2, 4.0], [2023, "Rent", 1, 2.0], [2024, "Food", 1, 4.0], [2024, "Rent", 1, 5.0]
+        ]
+
+    def test_worker_processes_match_inline_run(self, database_files):
+        """Tests that parsing the files in worker processes gives the same result as in-process"""
+        inline = report(database_files, ["category"], workers=1)
+        parallel = report(database_files, ["category"], workers=2)
+        assert list(parallel.rows()) == list(inline.rows())
+        assert list(inline.rows())[0] == ["Food", 3, 8.0, 2.67, 1.0, 4.0, 3.0, 3.8]
+
+    def test_overall_totals_and_date_range(self, database_files):
+        """Tests a report without grouping, restricted to a date range spanning both files"""
+        summary = report(database_files, date_from="2023-02-01", date_to="2024-01-31", workers=1)
+        assert summary.header()[:2] == ["count", "sum"]
+        assert [row[:2] for row in summary.rows()] == [[3, 9.0]]
+
+    def test_journal_is_replayed(self, database_files):
+        """Tests that the mutations journaled next to a file are part of its report"""
+        records = [
+            {"op": "add", "expense": {"id": 4, "description": "Rent", "amount": 10.0, "category": "Rent",
+                                      "created_at": "2023-04-01T10:00:00", "month": 4}},
+            {"op": "update", "id": 1, "field": "amount", "value": 6.0},
+            {"op": "delete", "id": 3}
+        ]
+        database_files[0].with_suffix(".journal").write_text(
+            "".join(json.dumps(record) + "\n" for record in records) + '{"op": "add", "exp', encoding="utf-8"
+        )
+        summary = report(database_files[:1], ["category"], percentiles=[], workers=1)
+        assert [row[:3] for row in summary.rows()] == [["Food", 1, 6.0], ["Rent", 2, 12.0]]
+
+    @pytest.mark.parametrize("file_name", ["db.sqlite3", "db.bin"])
+    def test_rejects_other_stores(self, tmp_path, file_name):
+        """Tests that sqlite and binary database files are refused instead of misread"""
+        (tmp_path / file_name).write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError, match="reports only read db.json files"):
+            report([tmp_path / file_name], workers=1)
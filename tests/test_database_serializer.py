@@ -0,0 +1,57 @@
+import json
+import pytest
+from unittest.mock import patch
+from src.database import database_serializer
+from src.database.database_serializer import dumps, loads, loads_database
+from src.expense.expense_core import Expense
+
+@pytest.fixture(params=["installed", "stdlib"])
+def serializer_backend(request):
+    """Runs a test with the fastest installed JSON library and again with the json module fallback"""
+    if request.param == "stdlib":
+        with patch.object(database_serializer, 'orjson', None), patch.object(database_serializer, 'ujson', None):
+            yield request.param
+    else:
+        yield request.param
+
+class TestDatabaseSerializer:
+    @pytest.fixture
+    def sample_database_content(self):
+        """Provides a database document holding Expense records"""
+        return {
+            "name": "Expense Tracker Database",
+            "monthly_budgets": [{"id": 1, "name": "January", "budget": 100}],
+            "expenses": [Expense.from_trusted(1, "Café", 50.0, "Food", "2024-01-01T10:00:00", 1)]
+        }
+
+    def test_compact_roundtrip(self, serializer_backend, sample_database_content):
+        """Tests that the compact layout has no whitespace and decodes to Expense records"""
+        data = dumps(sample_database_content)
+        assert isinstance(data, bytes)
+        assert b"\n" not in data and b", " not in data
+
+        database = loads_database(data)
+        assert database["monthly_budgets"] == sample_database_content["monthly_budgets"]
+        assert all(isinstance(expense, Expense) for expense in database["expenses"])
+        assert database["expenses"] == sample_database_content["expenses"]
+
+    def test_pretty_output(self, serializer_backend, sample_database_content):
+        """Tests that pretty-printing is only used on request and stays valid JSON"""
+        data = dumps(sample_database_content, pretty=True)
+        assert b"\n" in data
+        assert json.loads(data)["expenses"][0]["description"] == "Café"
+
+    def test_non_finite_floats_are_refused(self, serializer_backend, sample_database_content):
+        """Tests that NaN is never written, e.g. as null, while real nulls and "null" texts still are"""
+        assert loads(dumps({"value": None, "text": "null"})) == {"value": None, "text": "null"}
+        sample_database_content["expenses"][0]["amount"] = float("nan")
+        with pytest.raises(ValueError):
+            dumps(sample_database_content)
+        with pytest.raises(ValueError):
+            dumps({"op": "update", "id": 1, "field": "amount", "value": float("inf")})
+
+    def test_loads_accepts_text_and_rejects_torn_lines(self, serializer_backend):
+        """Tests decoding str input and that a torn record raises a ValueError"""
+        assert loads('{"op":"delete","id":1}') == {"op": "delete", "id": 1}
+        with pytest.raises(ValueError):
+            loads(b'{"op":"delete","i')
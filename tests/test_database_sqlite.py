@@ -0,0 +1,161 @@
+import sqlite3
+import pytest
+from unittest.mock import patch
+from src.database.database_core import Database
+from src.database.database_maker import DATABASE_STRUCTURE
+from src.database.database_sqlite import SqliteBackend
+
+class TestSqliteBackend:
+    @pytest.fixture
+    def sample_database_content(self):
+        """Provides sample database content for seeding the SQLite file"""
+        return {
+            "name": "Expense Tracker Database",
+            "monthly_budgets": [
+                {"id": 1, "name": "January", "budget": 100},
+                {"id": 2, "name": "February", "budget": 100}
+            ],
+            "expenses": [
+                {"id": 1, "description": "Lunch", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1},
+                {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+                {"id": 3, "description": "Dinner", "amount": 20.0, "category": "Food", "created_at": "2024-02-01T10:00:00", "month": 2}
+            ]
+        }
+
+    @pytest.fixture
+    def backend(self, tmp_path, sample_database_content):
+        backend = SqliteBackend(tmp_path / "db.sqlite3")
+        backend.initialize(sample_database_content)
+        yield backend
+        backend.close()
+
+    def test_initialize_and_load_metadata(self, tmp_path, sample_database_content):
+        """Tests that a fresh file is empty until seeded and keeps the budgets"""
+        backend = SqliteBackend(tmp_path / "db.sqlite3")
+        assert backend.is_empty()
+
+        backend.initialize(sample_database_content)
+        assert not backend.is_empty()
+        assert backend.load_metadata() == {
+            "name": "Expense Tracker Database",
+            "monthly_budgets": sample_database_content["monthly_budgets"]
+        }
+        backend.close()
+
+    def test_get_and_last_id(self, backend, sample_database_content):
+        """Tests fetching a single expense and the highest id"""
+        assert backend.get(2) == sample_database_content["expenses"][1]
+        assert backend.get(99) is None
+        assert backend.last_id() == 3
+
+    def test_scan(self, backend):
+        """Tests filtered scans in id order"""
+        assert [expense["id"] for expense in backend.scan()] == [1, 2, 3]
+        assert [expense["id"] for expense in backend.scan("category", "food")] == [1, 3]
+        assert [expense["id"] for expense in backend.scan("month", 1)] == [1, 2]
+        assert [expense["id"] for expense in backend.scan(after_id=1)] == [2, 3]
+        assert [expense["id"] for expense in backend.scan("category", "food", after_id=1)] == [3]
+
+    def test_scan_range(self, backend):
+        """Tests date-range scans on the created_at index"""
+        assert [expense["id"] for expense in backend.scan_range("2024-01-02", "2024-03-01")] == [2, 3]
+        assert [expense["id"] for expense in backend.scan_range(end="2024-01-02")] == [1]
+
+    def test_total(self, backend):
+        """Tests that sums run against the expenses table"""
+        assert backend.total() == (32.5, 3)
+        assert backend.total("month", 1) == (12.5, 2)
+        assert backend.total("category", "Food") == (30.0, 2)
+        assert backend.total("month_category", (2, "Food")) == (20.0, 1)
+        assert backend.total("month", 12) == (0.0, 0)
+
+    def test_categories_ignore_case(self, backend):
+        """Tests that category totals and the category summary ignore case"""
+        backend.insert({"id": 4, "description": "Snack", "amount": 5.0, "category": "FOOD", "created_at": "2024-02-02T10:00:00", "month": 2})
+        assert backend.total("category", "food") == (35.0, 3)
+        assert [(name.lower(), count, total) for name, count, total in backend.category_summary()] == [("food", 3, 35.0), ("travel", 1, 2.5)]
+
+    def test_file_without_category_keys_is_upgraded(self, tmp_path):
+        """Tests that a file written before the folded category column gets it on opening"""
+        connection = sqlite3.connect(str(tmp_path / "db.sqlite3"))
+        connection.executescript(
+            "CREATE TABLE expenses (id INTEGER PRIMARY KEY, description TEXT NOT NULL, amount REAL NOT NULL,"
+            " category TEXT NOT NULL, created_at TEXT NOT NULL, month INTEGER NOT NULL);"
+            "CREATE INDEX idx_expenses_category_nocase ON expenses (category COLLATE NOCASE);"
+            "INSERT INTO expenses VALUES (1, 'Lunch', 20.0, 'Étel', '2024-01-01T10:00:00', 1);"
+        )
+        connection.close()
+
+        backend = SqliteBackend(tmp_path / "db.sqlite3")
+        backend.insert({"id": 2, "description": "Snack", "amount": 1.0, "category": "étel", "created_at": "2024-01-02T10:00:00", "month": 1})
+        assert backend.total("category", "ÉTEL") == (21.0, 2)
+        assert backend.category_summary() == [("Étel", 2, 21.0)]
+        backend.close()
+
+    def test_mutations(self, backend):
+        """Tests insert, update and remove"""
+        backend.insert({"id": 4, "description": "Taxi", "amount": 15.0, "category": "Travel", "created_at": "2024-02-02T10:00:00", "month": 2})
+        expense = backend.get(1)
+        backend.update(expense, "amount", 11.0)
+        assert expense["amount"] == 11.0
+        assert backend.remove(2)["description"] == "Bus"
+        assert backend.remove(2) is None
+        backend.commit({"op": "delete", "id": 2})
+
+        assert [expense["id"] for expense in backend.scan()] == [1, 3, 4]
+        assert backend.total() == (46.0, 3)
+
+    def test_update_rejects_unknown_field(self, backend):
+        """Tests that only expense fields users can change are written"""
+        with pytest.raises(ValueError, match="The field id cannot be updated"):
+            backend.update(backend.get(1), "id", 5)
+
+    def test_commit_budget_record(self, backend):
+        """Tests that budget records update the budgets table"""
+        backend.commit({"op": "budget", "month": "January", "budget": 250})
+        assert backend.load_metadata()["monthly_budgets"][0]["budget"] == 250
+
+
+class TestDatabaseWithSqliteBackend:
+    @pytest.fixture(autouse=True)
+    def sqlite_database(self, tmp_path):
+        """Runs the Database singleton in sqlite mode inside a temporary directory"""
+        Database.instance = None
+        with patch('src.database.database_core.STORAGE_MODE', "sqlite"), \
+             patch.object(Database, 'sqlite_file_path', tmp_path / "db.sqlite3"), \
+             patch('src.database.database_maker.DatabaseMaker.is_db_file_exists', return_value=False):
+            yield
+        if Database.instance is not None and Database.instance.backend is not None:
+            Database.instance.backend.close()
+        Database.instance = None
+
+    def test_fresh_database_uses_default_structure(self):
+        """Tests that a new SQLite file is seeded with the default budgets"""
+        db = Database()
+        assert db.backend is not None
+        assert db.database["monthly_budgets"] == DATABASE_STRUCTURE["monthly_budgets"]
+        assert db.get_last_id() == 0
+
+    def test_operations_round_trip(self):
+        """Tests that the Database API behaves the same on top of SQLite"""
+        db = Database()
+        with patch('builtins.print') as mock_print:
+            db.add_an_expense("Lunch", 20.0, "Food")
+            db.add_an_expense("Bus", 3.0, "Travel")
+            db.update_an_expense_amount(2, 4.0)
+            db.delete_an_expense(1)
+
+            assert db.find_expense_by_id(2)["amount"] == 4.0
+            with pytest.raises(ValueError, match="Expense with ID:1 not found"):
+                db.find_expense_by_id(1)
+
+            db.summary_expenses("Travel", "category")
+            mock_print.assert_called_with("The sum of expenses for the given filter: category is 4.0$")
+
+        db.set_budget_for_a_month("March", 300)
+        Database.instance.backend.close()
+        Database.instance = None
+
+        reopened = Database()
+        assert reopened.get_last_id() == 2
+        assert reopened.database["monthly_budgets"][2]["budget"] == 300
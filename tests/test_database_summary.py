@@ -0,0 +1,54 @@
+import pickle
+import pytest
+from src.database.database_summary import GroupSummary, percentile
+
+class TestGroupSummary:
+    @pytest.fixture
+    def expenses(self):
+        """Provides expenses over two years with categories differing in case"""
+        return [
+            {"id": 1, "description": "Lunch", "amount": 10.0, "category": "Food", "created_at": "2024-01-01T10:00:00", "month": 1},
+            {"id": 2, "description": "Bus", "amount": 2.5, "category": "Travel", "created_at": "2024-01-02T10:00:00", "month": 1},
+            {"id": 3, "description": "Dinner", "amount": 20.0, "category": "FOOD", "created_at": "2024-01-06T19:00:00", "month": 1},
+            {"id": 4, "description": "Snack", "amount": 3.0, "category": "food", "created_at": "2023-01-02T10:00:00", "month": 1}
+        ]
+
+    def test_group_by_category(self, expenses):
+        """Tests sum, count, mean, min, max and percentiles per case-insensitive category"""
+        summary = GroupSummary(["category"]).add_all(expenses)
+        assert summary.header() == ["category", "count", "sum", "mean", "min", "max", "p50", "p90"]
+        assert list(summary.rows()) == [
+            ["Food", 3, 33.0, 11.0, 3.0, 20.0, 10.0, 18.0],
+            ["Travel", 1, 2.5, 2.5, 2.5, 2.5, 2.5, 2.5]
+        ]
+
+    def test_group_by_several_fields(self, expenses):
+        """Tests that year and month keep the same month of different years apart"""
+        summary = GroupSummary(["year", "month"], percentiles=()).add_all(expenses)
+        assert summary.header() == ["year", "month", "count", "sum", "mean", "min", "max"]
+        assert [row[:4] for row in summary.rows()] == [[2023, "January", 1, 3.0], [2024, "January", 3, 32.5]]
+
+    def test_group_by_weekday_and_day(self, expenses):
+        """Tests weekday names in weekday order and ISO days"""
+        assert [row[0] for row in GroupSummary(["weekday"], ()).add_all(expenses).rows()] == ["Monday", "Tuesday", "Saturday"]
+        assert [row[0] for row in GroupSummary(["day"], ()).add_all(expenses).rows()][0] == "2023-01-02"
+
+    def test_merge(self, expenses):
+        """Tests that summaries of separate parts merge into the summary of the whole"""
+        whole = GroupSummary(["category"]).add_all(expenses)
+        first = GroupSummary(["category"]).add_all(expenses[:2])
+        second = pickle.loads(pickle.dumps(GroupSummary(["category"]).add_all(expenses[2:])))
+        assert list(first.merge(second).rows()) == list(whole.rows())
+
+    def test_invalid_arguments(self):
+        """Tests that unknown fields and out of range percentiles raise a ValueError"""
+        with pytest.raises(ValueError, match="Unknown group-by field"):
+            GroupSummary(["hour"])
+        with pytest.raises(ValueError, match="between 0 and 100"):
+            GroupSummary(["day"], [150])
+
+    def test_percentile(self):
+        """Tests linear interpolation between ranks"""
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+        assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+        assert percentile([7.0], 90) == 7.0
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+from src.database.database_core import Database
+from src.database.database_writer import GroupCommitWriter
+
+class TestGroupCommitWriter:
+    def test_batches_records_and_resolves_futures(self):
+        """Tests that records submitted within one interval are flushed together"""
+        batches = []
+        writer = None
+
+        def flush():
+            batch = writer.take()
+            if batch:
+                batches.append([record for record, _ in batch])
+                for _, future in batch:
+                    future.set_result(None)
+
+        writer = GroupCommitWriter(flush, 0.05)
+        futures = [writer.submit({"op": "delete", "id": id}) for id in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+        writer.close()
+
+        assert batches == [[{"op": "delete", "id": id} for id in range(5)]]
+
+    def test_close_flushes_and_rejects_new_records(self):
+        """Tests that closing flushes what is queued and refuses later submissions"""
+        flush = Mock()
+        writer = GroupCommitWriter(flush, 60)
+        writer.submit({"op": "delete", "id": 1})
+        writer.close()
+
+        flush.assert_called_once()
+        with pytest.raises(ValueError):
+            writer.submit({"op": "delete", "id": 2})
+
+    def test_close_interrupts_the_flush_interval(self):
+        """Tests that closing does not wait for the interval the writer thread is sleeping through"""
+        flush = Mock()
+        writer = GroupCommitWriter(flush, 60)
+        writer.submit({"op": "delete", "id": 1})
+        time.sleep(0.05)  # The writer thread is now waiting out the interval
+        started = time.monotonic()
+        writer.close()
+
+        assert time.monotonic() - started < 5
+        flush.assert_called_once()
+
+class TestDatabaseGroupCommit:
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Creates a Database with group commit enabled in a temporary directory"""
+        Database.instance = None
+        with patch.object(Database, 'db_file_path', tmp_path / "db.json"), \
+                patch.object(Database, 'journal_file_path', tmp_path / "db.journal"), \
+                patch.object(Database, 'lock_file_path', tmp_path / "db.lock"), \
+                patch('src.database.database_core.STORAGE_MODE', "json"), \
+                patch('src.database.database_core.GROUP_COMMIT_INTERVAL_MS', 50):
+            db = Database()
+            yield db
+            db.close_writer()
+            db.file_lock.close()
+        Database.instance = None
+        Database.writer = None
+
+    def test_threads_share_commits(self, db, capfd):
+        """
+        Tests that expenses added from many threads are written in far fewer
+        commits than mutations, and are all on disk once their futures resolve.
+        """
+        futures = []
+        commit_many = db.database_maker.commit_many
+
+        def add_expenses():
+            for number in range(10):
+                futures.append(db.add_an_expense(f"Expense {number}", 1.0, "Food"))
+
+        with patch.object(db.database_maker, 'commit_many', side_effect=commit_many) as mock_commit_many:
+            threads = [threading.Thread(target=add_expenses) for _ in range(8)]
+            [t.start() for t in threads]
+            [t.join() for t in threads]
+            for future in futures:
+                future.result(timeout=5)
+
+        assert mock_commit_many.call_count < 80
+        database = json.loads(db.db_file_path.read_text(encoding="utf-8"))
+        assert sorted(expense["id"] for expense in database["expenses"]) == list(range(1, 81))
+        assert not db.file_lock.locked
+
+    def test_failed_write_fails_the_futures(self, db, capfd):
+        """Tests that the futures of a batch fail with the write error, and that the unsaved mutations are dropped"""
+        with patch('src.database.database_maker.os.replace', side_effect=OSError("Disk full")):
+            future = db.add_an_expense("Lunch", 10.0, "Food")
+            assert isinstance(future.exception(timeout=5), OSError)
+
+        with pytest.raises(ValueError, match="not found"):
+            db.find_expense_by_id(1)
+        assert db.add_an_expense("Lunch", 10.0, "Food").result(timeout=5) is None
+        assert db.find_expense_by_id(1)["description"] == "Lunch"
+
+    def test_failed_write_without_group_commit(self, db, capfd):
+        """Tests that a failed direct write is reported instead of the expense being added"""
+        db.close_writer()
+        with patch('src.database.database_maker.os.replace', side_effect=OSError("Disk full")):
+            assert db.add_an_expense("Lunch", 10.0, "Food") is None
+
+        assert capfd.readouterr().out == "An error occurred while updating the database: Disk full\n"
+        with pytest.raises(ValueError, match="not found"):
+            db.find_expense_by_id(1)
+
+    def test_last_batch_is_synced_at_exit(self, db, capfd):
+        """Tests that the journal is synced and closed after the writer's last batch, whatever order atexit runs in"""
+        db.database_maker.journaled = True
+        db.database_maker.durability = "exit"
+        db.add_an_expense("Lunch", 10.0, "Food").result(timeout=5)
+        db.add_an_expense("Bus", 2.5, "Travel")
+
+        # The journal's own exit hook was registered after the writer's, so it runs first.
+        db.database_maker.close()
+        with patch('src.database.database_maker.os.fsync') as mock_fsync:
+            db.close_writer()
+            mock_fsync.assert_called()
+
+        assert db.database_maker.journal_file is None
+        assert len(db.journal_file_path.read_text(encoding="utf-8").splitlines()) == 2
@@ -34,6 +34,13 @@ class TestExpense:
         with pytest.raises(ValueError, match="Amount must be non-negative"):
             Expense(**valid_expense_data)
 
+    @pytest.mark.parametrize("amount", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_amount_raises_error(self, valid_expense_data, amount):
+        """Test that NaN and infinities are rejected, as JSON cannot store them"""
+        valid_expense_data["amount"] = amount
+        with pytest.raises(ValueError, match="Amount must be a finite number"):
+            Expense(**valid_expense_data)
+
     @freeze_time("2024-03-15T14:30:00")
     def test_default_created_at(self):
         """Test that created_at defaults to current time when not provided"""
@@ -95,4 +102,33 @@ class TestExpense:
             amount=0.0,
             category="Free"
         )
-        assert expense.amount == 0.0
\ No newline at end of file
+        assert expense.amount == 0.0
+
+    def test_record_has_no_instance_dict(self, expense):
+        """Test that the record is slotted and cannot grow new attributes"""
+        assert not hasattr(expense, "__dict__")
+        with pytest.raises(AttributeError):
+            expense.note = "not a field"
+
+    def test_subscript_access(self, expense):
+        """Test that fields can be read and written like dict keys"""
+        assert expense["amount"] == 100.0
+        expense["amount"] = 42.0
+        assert expense.amount == 42.0
+        assert expense.get("month") == 1
+        assert expense.get("unknown", "default") == "default"
+        with pytest.raises(KeyError):
+            expense["unknown"]
+
+    def test_from_trusted_skips_validation(self):
+        """Test that trusted data is stored as given without re-parsing created_at"""
+        expense = Expense.from_trusted(7, "Loaded", 5.0, "Food", "not-a-date", 4)
+        assert expense.created_at == "not-a-date"
+        assert expense.month == 4
+
+    def test_from_dict_round_trip(self, expense):
+        """Test that as_dict and from_dict are inverse and records compare equal to their dicts"""
+        restored = Expense.from_dict(expense.as_dict())
+        assert restored == expense
+        assert restored == expense.as_dict()
+        assert dict(restored) == expense.as_dict()
@@ -1,9 +1,17 @@
 import pytest
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import Mock, patch, call
 from src.__main__ import main, ListMode, SummaryMode
 from src.database.database_core import Database
 from src.parser.parser_core import Parser
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Modules only some commands need, which must not be loaded at startup.
+LAZY_MODULES = ("prettytable", "csv", "gzip", "sqlite3", "numpy", "orjson", "ujson", "concurrent.futures",
+                "socket", "socketserver", "src.server.server_core")
+
 class TestmainModule:
     @pytest.fixture
     def mock_database(self):
@@ -138,6 +146,9 @@ class TestmainModule:
         args.list_all = True
         args.list_by_category = args.list_by_month = args.summary_all = None
         args.summary_by_category = args.summary_by_month = args.export_csv = None
+        args.limit = args.offset = args.after_id = args.sort = args.output_format = None
+        args.date_from = args.date_to = None
+        args.descending = False
         mock_parser.parse_args.return_value = args
 
         with patch('src.__main__.Database', return_value=mock_database), \
@@ -156,6 +167,17 @@ class TestmainModule:
 
         mock_database.list_expenses.assert_called_once_with("category", "Food")
 
+        # Test paging and streaming options
+        mock_database.reset_mock()
+        args.limit, args.sort, args.descending, args.output_format = 10, "amount", True, "tsv"
+        with patch('src.__main__.Database', return_value=mock_database), \
+             patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
+        mock_database.list_expenses.assert_called_once_with(
+            "category", "Food", limit=10, sort="amount", descending=True, output_format="tsv"
+        )
+
     def test_summary_operations(self, mock_database, mock_parser):
         """
         Tests various summary operations through the main function.
@@ -168,6 +190,7 @@ class TestmainModule:
         args.list_all = args.list_by_category = args.list_by_month = None
         args.summary_all = True
         args.summary_by_category = args.summary_by_month = args.export_csv = None
+        args.date_from = args.date_to = None
         mock_parser.parse_args.return_value = args
 
         with patch('src.__main__.Database', return_value=mock_database), \
@@ -186,6 +209,28 @@ class TestmainModule:
 
         mock_database.summary_expenses.assert_called_once_with("Food", "category")
 
+        # Test summary over a date range
+        mock_database.reset_mock()
+        args.date_from, args.date_to = "2023-12-01", "2024-01-31"
+        with patch('src.__main__.Database', return_value=mock_database), \
+             patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
+        mock_database.summary_expenses.assert_called_once_with(
+            "Food", "category", date_from="2023-12-01", date_to="2024-01-31"
+        )
+
+        # Test grouped summary
+        mock_database.reset_mock()
+        args.summary_by_category = args.import_file = args.list_categories = args.report_files = None
+        args.date_from = args.date_to = None
+        args.summary_group_by, args.percentiles = ["year", "category"], None
+        with patch('src.__main__.Database', return_value=mock_database), \
+             patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
+        mock_database.summary_by_groups.assert_called_once_with(["year", "category"], None)
+
     def test_export_csv(self, mock_database, mock_parser):
         """
         Tests the CSV export functionality through the main function.
@@ -197,18 +242,54 @@ class TestmainModule:
         args.list_all = args.list_by_category = args.list_by_month = None
         args.summary_all = args.summary_by_category = args.summary_by_month = None
         args.export_csv = True
+        args.export_category = args.export_month = args.export_output = args.since_revision = None
+        args.gzip = False
         mock_parser.parse_args.return_value = args
 
         with patch('src.__main__.Database', return_value=mock_database), \
              patch('src.__main__.Parser', return_value=mock_parser):
             main()
 
-        mock_database.export_expenses.assert_called_once_with("csv")
+        mock_database.export_expenses.assert_called_once_with("csv", None, None, output=None, compress=False)
 
-    def test_no_arguments_prints_help(self, mock_database, mock_parser):
+        # Test a filtered, compressed export to stdout
+        mock_database.reset_mock()
+        args.export_month = "January"
+        args.export_output = "-"
+        args.gzip = True
+        with patch('src.__main__.Database', return_value=mock_database), \
+             patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
+        mock_database.export_expenses.assert_called_once_with("csv", "month", "January", output="-", compress=True)
+
+    def test_export_jsonl_changes(self, mock_database, mock_parser):
         """
-        Tests that the help message is printed when no arguments are provided.
-        Verifies proper handling of the default case.
+        Tests that a JSON lines export passes the revision to export changes since.
+        """
+        args = Mock()
+        args.add = args.delete = args.update_description = None
+        args.update_amount = args.update_category = args.find = None
+        args.list_all = args.list_by_category = args.list_by_month = args.list_categories = None
+        args.summary_all = args.summary_by_category = args.summary_by_month = args.summary_group_by = None
+        args.export_csv = args.import_file = args.report_files = None
+        args.export_jsonl = True
+        args.export_category = args.export_month = None
+        args.export_output = "changes.jsonl"
+        args.since_revision = 0
+        args.gzip = False
+        mock_parser.parse_args.return_value = args
+
+        with patch('src.__main__.Database', return_value=mock_database), \
+             patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
+        mock_database.export_expenses.assert_called_once_with("jsonl", None, None, output="changes.jsonl", compress=False, since_revision=0)
+
+    def test_import_expenses(self, mock_database, mock_parser):
+        """
+        Tests the bulk import through the main function.
+        Verifies that the file path is handed to import_expenses.
         """
         args = Mock()
         args.add = args.delete = args.update_description = None
@@ -216,13 +297,106 @@ class TestmainModule:
         args.list_all = args.list_by_category = args.list_by_month = None
         args.summary_all = args.summary_by_category = args.summary_by_month = None
         args.export_csv = None
+        args.import_file = "transactions.csv"
         mock_parser.parse_args.return_value = args
 
         with patch('src.__main__.Database', return_value=mock_database), \
              patch('src.__main__.Parser', return_value=mock_parser):
             main()
 
+        mock_database.import_expenses.assert_called_once_with("transactions.csv")
+
+    def test_no_arguments_prints_help(self, mock_database, mock_parser):
+        """
+        Tests that the help message is printed when no arguments are provided.
+        Verifies proper handling of the default case.
+        """
+        args = Mock()
+        args.add = args.delete = args.update_description = None
+        args.update_amount = args.update_category = args.find = None
+        args.list_all = args.list_by_category = args.list_by_month = args.list_categories = None
+        args.summary_all = args.summary_by_category = args.summary_by_month = args.summary_group_by = None
+        args.export_csv = args.export_jsonl = args.import_file = args.report_files = args.serve = None
+        mock_parser.parse_args.return_value = args
+
+        with patch('src.__main__.Database', return_value=mock_database) as MockDatabase, \
+             patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
         mock_parser.parser.print_help.assert_called_once()
+        MockDatabase.assert_not_called()
+
+    def test_report_does_not_load_database(self, mock_parser):
+        """
+        Tests that --report reads the given files without loading the tracker's own database.
+        """
+        args = Mock()
+        args.add = args.delete = args.update_description = None
+        args.update_amount = args.update_category = args.find = None
+        args.list_all = args.list_by_category = args.list_by_month = args.list_categories = None
+        args.summary_all = args.summary_by_category = args.summary_by_month = None
+        args.export_csv = args.export_jsonl = args.import_file = args.serve = None
+        args.report_files = ["2023.json", "2024.json"]
+        args.summary_group_by = ["year"]
+        args.percentiles = args.date_from = args.date_to = args.workers = None
+        mock_parser.parse_args.return_value = args
+
+        with patch('src.__main__.Database') as MockDatabase, \
+             patch('src.__main__.Parser', return_value=mock_parser), \
+             patch('src.database.database_report.report') as mock_report, \
+             patch('src.database.database_summary.print_summary') as mock_print_summary:
+            main()
+
+        MockDatabase.assert_not_called()
+        mock_report.assert_called_once_with(["2023.json", "2024.json"], ["year"], None, None, None, None)
+        mock_print_summary.assert_called_once_with(mock_report.return_value)
+
+    def test_report_missing_file(self, mock_parser, tmp_path, capsys):
+        """
+        Tests that a report file that cannot be read is reported as an error, not an unexpected one.
+        """
+        args = Mock()
+        args.add = args.delete = args.update_description = None
+        args.update_amount = args.update_category = args.find = None
+        args.list_all = args.list_by_category = args.list_by_month = args.list_categories = None
+        args.summary_all = args.summary_by_category = args.summary_by_month = None
+        args.export_csv = args.export_jsonl = args.import_file = args.serve = None
+        args.report_files = [str(tmp_path / "missing.json")]
+        args.summary_group_by = args.percentiles = args.date_from = args.date_to = args.workers = None
+        mock_parser.parse_args.return_value = args
+
+        with patch('src.__main__.Parser', return_value=mock_parser):
+            main()
+
+        output = capsys.readouterr().out
+        assert output.startswith("An error occurred while reading the report files: [Errno 2] No such file or directory")
+        assert "unexpected" not in output
+
+    def test_usage_error_does_not_load_database(self, mock_parser):
+        """
+        Tests that invalid arguments exit before the database is loaded.
+        """
+        mock_parser.parse_args.side_effect = SystemExit(2)
+
+        with patch('src.__main__.Database') as MockDatabase, \
+             patch('src.__main__.Parser', return_value=mock_parser), \
+             pytest.raises(SystemExit):
+            main()
+
+        MockDatabase.assert_not_called()
+
+    def test_import_is_lazy(self):
+        """
+        Tests that starting the CLI does not import what only some commands use.
+        How long importing it takes is in the benchmark report.
+        """
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, src.__main__; print(' '.join(sorted(set(sys.modules) & set(sys.argv[1:]))))",
+             *LAZY_MODULES],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == []
 
     def test_unexpected_error_handling(self, mock_database, mock_parser):
         """
@@ -180,6 +180,83 @@ class TestParser:
             args = parser.parse_args()
             assert args.export_csv is True
 
+        with patch('sys.argv', ['script.py', '--export-csv', '--export-category', 'Food', '--export-output', '-', '--gzip']):
+            args = parser.parse_args()
+            assert args.export_category == 'Food'
+            assert args.export_output == '-'
+            assert args.gzip is True
+
+    def test_parse_import_argument(self, parser):
+        """
+        Tests parsing the import argument.
+        Verifies that the file path is stored under import_file.
+        """
+        with patch('sys.argv', ['script.py', '--import', 'transactions.csv']):
+            args = parser.parse_args()
+            assert args.import_file == 'transactions.csv'
+
+    def test_parse_list_paging_options(self, parser):
+        """
+        Tests parsing of the paging, sorting and output format options of list commands.
+        """
+        with patch('sys.argv', ['script.py', '--list-all', '--limit', '20', '--after-id', '100',
+                                '--sort', 'amount', '--desc', '--format', 'jsonl']):
+            args = parser.parse_args()
+            assert args.limit == 20
+            assert args.after_id == 100
+            assert args.offset is None
+            assert args.sort == 'amount'
+            assert args.descending
+            assert args.output_format == 'jsonl'
+
+        with patch('sys.argv', ['script.py', '--list-all', '--format', 'xml']):
+            with pytest.raises(SystemExit):
+                parser.parse_args()
+
+    def test_parse_date_range(self, parser):
+        """
+        Tests that --from and --to are stored as date_from and date_to.
+        """
+        with patch('sys.argv', ['script.py', '--summary-all', '--from', '2023-12-01', '--to', '2024-01-31']):
+            args = parser.parse_args()
+            assert args.date_from == '2023-12-01'
+            assert args.date_to == '2024-01-31'
+
+    def test_parse_list_categories(self, parser):
+        """
+        Tests parsing of the --list-categories flag.
+        """
+        with patch('sys.argv', ['script.py', '--list-categories']):
+            args = parser.parse_args()
+            assert args.list_categories
+
+    def test_parse_summary_group_by(self, parser):
+        """
+        Tests parsing of the group-by fields and percentiles.
+        """
+        with patch('sys.argv', ['script.py', '--summary-group-by', 'year', 'category', '--percentiles', '50', '99.5']):
+            args = parser.parse_args()
+            assert args.summary_group_by == ['year', 'category']
+            assert args.percentiles == [50.0, 99.5]
+
+        with patch('sys.argv', ['script.py', '--report', '2023.json', '2024.json', '--workers', '2']):
+            args = parser.parse_args()
+            assert args.report_files == ['2023.json', '2024.json']
+            assert args.workers == 2
+
+        with patch('sys.argv', ['script.py', '--summary-group-by', 'hour']):
+            with pytest.raises(SystemExit):
+                parser.parse_args()
+
+    def test_parse_change_export(self, parser):
+        """
+        Tests parsing of the JSON lines export and the revision to export changes since.
+        """
+        with patch('sys.argv', ['script.py', '--export-jsonl', '--since-revision', '42']):
+            args = parser.parse_args()
+            assert args.export_jsonl
+            assert args.since_revision == 42
+
     def test_parse_invalid_argument_combination(self, parser):
         """
         Tests parser behavior with invalid argument combinations.
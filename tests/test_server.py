@@ -0,0 +1,125 @@
+import pytest
+import threading
+from unittest.mock import Mock, patch
+from src.__main__ import run_command, forward_to_server
+import os
+from src.server.server_core import Server, SOCKET_FILE_PATH, send_command, is_server_running
+from src.database.database_maker import DB_FILE_PATH
+
+class TestServer:
+    @pytest.fixture
+    def socket_path(self, tmp_path):
+        return tmp_path / "expense-tracker.sock"
+
+    @pytest.fixture
+    def running_server(self, socket_path):
+        """Starts a server echoing its argv in a background thread"""
+        server = Server(socket_path, lambda argv: print("ran", *argv))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    def test_send_command_returns_output(self, running_server, socket_path):
+        """Tests that a command runs on the server and its output comes back"""
+        assert send_command(socket_path, ["--list-all"]) == ("ran --list-all\n", 0)
+        assert send_command(socket_path, ["--find", "1"]) == ("ran --find 1\n", 0)
+
+    def test_socket_is_named_after_the_database(self):
+        """Tests that databases in the same directory get different sockets"""
+        if "EXPENSE_TRACKER_SOCKET" not in os.environ:
+            assert SOCKET_FILE_PATH == DB_FILE_PATH.with_suffix(".sock")
+
+    def test_commands_run_in_the_client_directory(self, socket_path, tmp_path, monkeypatch):
+        """Tests that relative paths of a command are resolved from the client's working directory"""
+        server = Server(socket_path, lambda argv: open(argv[0], "w").close())
+        client_directory, server_directory = tmp_path / "client", tmp_path / "server"
+        client_directory.mkdir()
+        server_directory.mkdir()
+        monkeypatch.chdir(server_directory)
+        try:
+            assert server.run_command(["out.csv"], str(client_directory)) == ("", 0)
+            output, status = server.run_command(["out.csv"], str(tmp_path / "missing"))
+            assert output.startswith("An error occurred while changing to the directory") and status == 1
+        finally:
+            server.server_close()
+
+        assert (client_directory / "out.csv").is_file()
+        assert not (server_directory / "out.csv").exists()
+        assert os.getcwd() == str(server_directory)
+
+    def test_refuses_clients_of_another_database(self, socket_path):
+        """Tests that a server does not run commands meant for another database file or storage mode"""
+        runner = Mock()
+        server = Server(socket_path, runner, identity={"database": "/data/other.json", "storage": "json"})
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert send_command(socket_path, ["--list-all"]) is None
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        runner.assert_not_called()
+
+    def test_send_command_without_server(self, socket_path):
+        """Tests that the client reports a missing server with None"""
+        assert send_command(socket_path, ["--list-all"]) is None
+        assert not is_server_running(socket_path)
+
+    def test_stale_socket_is_replaced(self, socket_path):
+        """Tests that a socket file left by a dead server does not block a new one"""
+        socket_path.write_text("")
+        server = Server(socket_path, print)
+        server.server_close()
+        assert not socket_path.exists()
+
+    def test_refuses_second_server(self, running_server, socket_path):
+        """Tests that two servers cannot share a socket"""
+        with pytest.raises(ValueError, match="A server is already listening"):
+            Server(socket_path, print)
+
+
+class TestServerCommands:
+    def test_run_command_dispatches_to_database(self):
+        """Tests that server commands are parsed and executed against the loaded database"""
+        db = Mock()
+        run_command(db, ["--delete", "3"])
+        db.delete_an_expense.assert_called_once_with(3)
+
+    def test_run_command_reports_errors(self, capsys):
+        """Tests that parse errors and invalid values do not stop the server"""
+        db = Mock()
+        assert run_command(db, ["--delete", "not_a_number"]) == 2
+        db.add_an_expense.side_effect = ValueError("Amount must be non-negative")
+        assert run_command(db, ["--add", "Lunch", "5", "Food"]) == 0
+        assert run_command(db, ["--serve"]) == 0
+        db.add_an_expense.side_effect = RuntimeError("Disk gone")
+        assert run_command(db, ["--add", "Lunch", "5", "Food"]) == 1
+
+        captured = capsys.readouterr()
+        assert "invalid int value" in captured.err
+        assert "Error: Amount must be non-negative" in captured.out
+        assert "Error: The server is already running." in captured.out
+
+    def test_forward_to_server(self, tmp_path, capsys):
+        """Tests that the client only forwards when a server answers, and gets the command's exit status"""
+        socket_path = tmp_path / "expense-tracker.sock"
+        with patch('src.__main__.SOCKET_FILE_PATH', socket_path):
+            assert forward_to_server(["--list-all"]) is None
+
+            server = Server(socket_path, lambda argv: print("served") if argv == ["--list-all"] else 2)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                assert forward_to_server(["--list-all"]) == 0
+                assert forward_to_server(["--bogus"]) == 2
+                assert forward_to_server(["--serve"]) is None
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+
+        assert capsys.readouterr().out == "served\n"